@@ -8,9 +8,15 @@ from app.routes.orders.routes import orders_bp
 from app.routes.payments import bp_payments
 from app.routes.reviews import bp_reviews
 from app.routes.analytics import bp_analytics
+from app.routes.cache import bp_cache
+from app.routes.export import bp_export
+from app.routes.dashboard import bp_dashboard
+from app.db.pool import PoolTimeout
+from app.json_provider import make_provider
 
 def create_app():
     app = Flask(__name__)
+    app.json = make_provider(app)
     
     # Enable CORS for all routes
     CORS(app)
@@ -22,14 +28,22 @@ def create_app():
     app.register_blueprint(bp_payments)
     app.register_blueprint(bp_reviews)
     app.register_blueprint(bp_analytics)
+    app.register_blueprint(bp_cache)
+    app.register_blueprint(bp_export)
+    app.register_blueprint(bp_dashboard)
+
+    @app.errorhandler(PoolTimeout)
+    def pool_exhausted(e):
+        """All pooled DB connections are busy: ask clients to back off."""
+        return {"error": "Database busy, please retry", "code": "DB_POOL_TIMEOUT"}, 503, {"Retry-After": "1"}
 
     @app.get("/health")
     def health():
         """
-        Enhanced health check endpoint with database status.
-        Returns API status, database connection state, and table counts.
+        Liveness check: API status plus a single SELECT 1 over a pooled
+        connection. Never scans tables, so it is safe to poll frequently.
         """
-        from app.db.db import get_conn
+        from app.db import db
         from app.config import DB_CFG
         
         response = {
@@ -39,39 +53,19 @@ def create_app():
             "db_port": DB_CFG.get("port"),
             "db_name": DB_CFG.get("dbname"),
             "db_connected": False,
-            "table_counts": {},
             "errors": []
         }
         
-        # Try to connect to database and get table counts
         try:
-            conn = get_conn()
+            with db.get_conn() as conn:
+                cur = conn.cursor()
+                try:
+                    cur.execute("SELECT 1")
+                    cur.fetchone()
+                finally:
+                    cur.close()
             response["db_connected"] = True
-            
-            # Query table counts
-            tables = ["customers", "orders", "order_items", "products", "payments", "reviews"]
-            
-            if DB_CFG.get("vendor") == "mysql":
-                cursor = conn.cursor()
-                for table in tables:
-                    try:
-                        cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                        count = cursor.fetchone()[0]
-                        response["table_counts"][table] = count
-                    except Exception as e:
-                        response["table_counts"][table] = f"error: {str(e)}"
-                cursor.close()
-            else:  # postgres
-                with conn.cursor() as cur:
-                    for table in tables:
-                        try:
-                            cur.execute(f"SELECT COUNT(*) FROM {table}")
-                            count = cur.fetchone()[0]
-                            response["table_counts"][table] = count
-                        except Exception as e:
-                            response["table_counts"][table] = f"error: {str(e)}"
-            
-            conn.close()
+            response["pool"] = db.pool_status()
             return response, 200
             
         except ImportError as e:
@@ -83,6 +77,48 @@ def create_app():
         except Exception as e:
             response["errors"].append(f"Unexpected error: {type(e).__name__}: {str(e)}")
             return response, 503
+
+    @app.get("/health/ready")
+    def health_ready():
+        """
+        Readiness/stats check: estimated row counts per table from the catalog
+        (pg_class / information_schema), cached for HEALTH_STATS_TTL seconds.
+        
+        Query params:
+            exact: 1 to run COUNT(*) per table instead (expensive, also cached)
+        
+        Returns 503 if the database is unreachable or a table is missing.
+        """
+        from flask import request
+        from app.db import db
+        from app.db.table_stats import TABLES, get_row_counts
+        from app.config import DB_CFG
+        
+        exact = request.args.get("exact", "0").lower() in ("1", "true", "yes")
+        response = {
+            "api_status": "ok",
+            "db_vendor": DB_CFG.get("vendor"),
+            "db_connected": False,
+            "ready": False,
+            "count_mode": "exact" if exact else "estimated",
+            "table_counts": {},
+            "errors": []
+        }
+        
+        try:
+            counts, age = get_row_counts(db.get_conn, exact=exact)
+        except Exception as e:
+            response["errors"].append(f"Database connection failed: {type(e).__name__}: {str(e)}")
+            return response, 503
+        
+        response["db_connected"] = True
+        response["cache_age_seconds"] = age
+        response["table_counts"] = counts
+        missing = [t for t in TABLES if t not in counts]
+        if missing:
+            response["errors"].append(f"Missing tables: {', '.join(missing)}")
+        response["ready"] = not missing
+        return response, 200 if response["ready"] else 503
     
     @app.get("/demo")
     def demo():
@@ -0,0 +1,308 @@
+"""
+ASGI Entry Point (async serving mode)
+
+    uvicorn app.asgi:app --host 127.0.0.1 --port 5000
+
+The hot read routes below run as coroutines on a psycopg
+AsyncConnectionPool. While a query waits on PostgreSQL the event loop
+serves other requests, so one process keeps hundreds of requests in flight
+without a thread per request:
+
+- GET /dashboard/summary                 (its 4 queries run concurrently)
+- GET /analytics/revenue-by-category
+- GET /analytics/top-sellers
+- GET /orders/by-customer/<customer_id>
+
+They reuse the SQL and response shaping of the Flask views, and their JSON
+is encoded by the Flask app's JSON provider, so responses are the same in
+both modes. They also follow the Flask view's @conditional / @cached
+decorators: same ETag / 304 handling (app/data_version.py) and the same
+response cache entries (app/cache.py), so a body computed in either mode
+is served from cache in both. Every other route goes to the regular Flask
+app from create_app() through a2wsgi's WSGIMiddleware, on a small thread
+pool (ASYNC_POOL_CFG["wsgi_threads"]). With DB_VENDOR=mysql (no async
+driver) all routes go to Flask.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from urllib.parse import parse_qs, parse_qsl
+
+from werkzeug.http import parse_date, parse_etags
+
+from app import data_version
+from app.app import create_app
+from app.cache import cache_key, response_cache
+from app.cache_backends import Entry
+from app.config import ASYNC_POOL_CFG, DB_CFG, HTTP_CACHE_CFG, RESPONSE_CACHE_CFG
+from app.routes import analytics, dashboard
+from app.routes.orders.service import ORDERS_BY_CUSTOMER_SQL
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDB:
+    """Lazily opened psycopg AsyncConnectionPool."""
+
+    def __init__(self, cfg=ASYNC_POOL_CFG):
+        self.cfg = cfg
+        self.pool = None
+
+    async def open(self):
+        try:
+            from psycopg.conninfo import make_conninfo
+            from psycopg_pool import AsyncConnectionPool
+        except ImportError as e:
+            raise ImportError("psycopg-pool not installed. Run: pip install psycopg-pool") from e
+
+        conninfo = make_conninfo(
+            host=DB_CFG["host"], port=DB_CFG["port"], dbname=DB_CFG["dbname"],
+            user=DB_CFG["user"], password=DB_CFG["password"],
+        )
+        self.pool = AsyncConnectionPool(
+            conninfo,
+            min_size=self.cfg["min_size"],
+            max_size=self.cfg["max_size"],
+            timeout=self.cfg["wait_timeout"],
+            open=False,
+        )
+        await self.pool.open()
+        logger.info(f"Async pool open: min={self.cfg['min_size']} max={self.cfg['max_size']}")
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    async def fetchall(self, sql, params=None, row_factory=None):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=row_factory) as cur:
+                await cur.execute(sql, params)
+                return await cur.fetchall()
+
+    async def query_all(self, sql, params=None):
+        """Rows as dicts, like analytics._query_all()."""
+        from psycopg.rows import dict_row
+        return await self.fetchall(sql, params, row_factory=dict_row)
+
+
+def _int_arg(query, name, default):
+    values = query.get(name)
+    try:
+        return int(values[0]) if values else default
+    except ValueError:
+        return None
+
+
+# --- async-native routes: (status, payload) -----------------------------------
+
+async def dashboard_summary(db, query):
+    sections = list(dashboard.SECTIONS.items())
+    try:
+        rows = await asyncio.gather(*(db.fetchall(build_sql()) for _, (build_sql, _) in sections))
+    except Exception as e:
+        logger.error(f"Error fetching dashboard summary: {e}")
+        return 503, {"error": "Failed to fetch dashboard summary"}
+    return 200, {name: shape(r) for (name, (_, shape)), r in zip(sections, rows)}
+
+
+async def _analytics_top_n(db, query, build_sql, name):
+    limit = _int_arg(query, "limit", 10)
+    if limit is None or limit < 1 or limit > 100:
+        return 400, {"ok": False, "error": "limit must be between 1 and 100"}
+    rollup_sql, live_sql = build_sql()
+    try:
+        try:
+            results, source = await db.query_all(rollup_sql, (limit,)), "rollup"
+        except Exception as e:
+            logger.warning(f"Rollup table unavailable ({e}); using live aggregate")
+            results = None
+        if not results:
+            results, source = await db.query_all(live_sql, (limit,)), "live"
+    except Exception as e:
+        logger.error(f"Error in {name}: {e}")
+        return 503, {"ok": False, "error": str(e)}
+    return 200, {"ok": True, "params": {"limit": limit}, "source": source, "data": results}
+
+
+async def revenue_by_category(db, query):
+    return await _analytics_top_n(db, query, analytics.revenue_by_category_sql, "revenue-by-category")
+
+
+async def top_sellers(db, query):
+    return await _analytics_top_n(db, query, analytics.top_sellers_sql, "top-sellers")
+
+
+async def orders_by_customer(db, query, customer_id):
+    limit = _int_arg(query, "limit", 10)
+    if limit is None:
+        return 422, {"error": "limit must be a valid integer"}
+    if not (1 <= limit <= 50):
+        return 422, {"error": "limit must be between 1 and 50"}
+    try:
+        return 200, await db.query_all(ORDERS_BY_CUSTOMER_SQL, (customer_id, limit))
+    except Exception as e:
+        logger.error(f"get_orders_by_customer db error: {e}")
+        return 503, {
+            "error": "Database service unavailable. Please try again later.",
+            "code": "DB_CONNECTION_ERROR",
+        }
+
+
+# (path pattern, Flask endpoint whose @conditional / @cached settings apply, handler)
+ROUTES = [
+    (re.compile(r"^/dashboard/summary$"), "dashboard.dashboard_summary", dashboard_summary),
+    (re.compile(r"^/analytics/revenue-by-category$"), "analytics.revenue_by_category", revenue_by_category),
+    (re.compile(r"^/analytics/top-sellers$"), "analytics.top_sellers", top_sellers),
+    (re.compile(r"^/orders/by-customer/(?P<customer_id>[^/]+)$"), "orders.list_orders_by_customer",
+     orders_by_customer),
+]
+
+
+class AsyncApp:
+    """ASGI callable: async-native routes first, the Flask app for the rest."""
+
+    def __init__(self, flask_app=None, db=None, wsgi_threads=None):
+        try:
+            from a2wsgi import WSGIMiddleware
+        except ImportError as e:
+            raise ImportError("a2wsgi not installed. Run: pip install a2wsgi") from e
+
+        self.flask_app = flask_app or create_app()
+        self.db = db or AsyncDB()
+        self.native = DB_CFG.get("vendor") == "postgres"
+        self.wsgi = WSGIMiddleware(
+            self.flask_app, workers=wsgi_threads or ASYNC_POOL_CFG["wsgi_threads"]
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            endpoint, handler, params = self._match(scope)
+            if handler is None:
+                await self.wsgi(scope, receive, send)
+            else:
+                await self._native(endpoint, handler, params, scope, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    if self.native:
+                        await self.db.open()
+                except Exception as e:
+                    # Keep serving: every route falls back to the Flask app.
+                    logger.error(f"Async pool unavailable ({e}); serving all routes through Flask")
+                    self.native = False
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.db.close()
+                self.wsgi.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _match(self, scope):
+        if not self.native or scope["method"] != "GET" or self.db.pool is None:
+            return None, None, None
+        for pattern, endpoint, handler in ROUTES:
+            match = pattern.match(scope["path"])
+            if match:
+                return endpoint, handler, match.groupdict()
+        return None, None, None
+
+    async def _native(self, endpoint, handler, params, scope, send):
+        query_string = scope.get("query_string", b"").decode("latin-1")
+        view = self.flask_app.view_functions.get(endpoint)
+        validators, variant = [], None
+
+        # @conditional: validators from the same data_version snapshot as Flask
+        version_tables = getattr(view, "version_tables", None)
+        if version_tables is not None and HTTP_CACHE_CFG["enabled"]:
+            versions = await asyncio.to_thread(data_version.get_versions)
+            if versions is not None:
+                etag, last_modified = data_version.validators(endpoint, version_tables, versions)
+                validators = _encode_headers(data_version.validator_headers(etag, last_modified))
+                request_headers = {k.lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+                if data_version.not_modified(etag, last_modified,
+                                             parse_etags(request_headers.get(b"if-none-match")),
+                                             parse_date(request_headers.get(b"if-modified-since"))):
+                    await _send(send, 304, validators)
+                    return
+                variant = etag
+
+        async def respond():
+            return await self._respond(handler, parse_qs(query_string), params)
+
+        # @cached: same key and entries as the Flask view
+        if getattr(view, "cache_tables", None) is not None and RESPONSE_CACHE_CFG["enabled"]:
+            key = cache_key(endpoint, params, parse_qsl(query_string, keep_blank_values=True), variant)
+            status, body, headers = await _cached(view, key, endpoint, respond)
+        else:
+            status, body, headers = await respond()
+        await _send(send, status, headers + (validators if status == 200 else []), body)
+
+    async def _respond(self, handler, query, params):
+        """(status, JSON body bytes, extra headers) of a native handler."""
+        try:
+            status, payload = await handler(self.db, query, **params)
+            headers = []
+        except Exception as e:
+            if type(e).__name__ != "PoolTimeout":
+                raise
+            status, headers = 503, [(b"retry-after", b"1")]
+            payload = {"error": "Database busy, please retry", "code": "DB_POOL_TIMEOUT"}
+        provider = self.flask_app.json
+        if hasattr(provider, "dumps_bytes"):  # orjson: no str round trip
+            body = provider.dumps_bytes(payload) + b"\n"
+        else:
+            body = (provider.dumps(payload) + "\n").encode("utf-8")
+        return status, body, headers
+
+
+async def _cached(view, key, endpoint, respond):
+    """app.cache.cached() for a native route: hit, coalesced miss or computed and stored."""
+    async def backend(fn, *args):
+        # Shared backends (sqlite, redis) block: keep them off the event loop.
+        if response_cache.backend.shared:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    entry = await backend(response_cache.get, key, endpoint)
+    if entry is not None:
+        return entry.status, entry.body, []
+
+    is_leader, event = response_cache.begin(key, endpoint)
+    if not is_leader:
+        await asyncio.to_thread(event.wait, RESPONSE_CACHE_CFG["coalesce_timeout"])
+        entry = await backend(response_cache.get, key, endpoint)
+        if entry is not None:
+            return entry.status, entry.body, []
+        return await respond()
+    try:
+        status, body, headers = await respond()
+        if status == 200:
+            await backend(response_cache.set, key, endpoint, Entry(
+                body, status, "application/json", time.time() + view.cache_ttl, view.cache_tables,
+            ))
+        return status, body, headers
+    finally:
+        response_cache.end(key)
+
+
+def _encode_headers(headers):
+    return [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+
+
+async def _send(send, status, headers, body=b""):
+    if status != 304:
+        headers = [(b"content-type", b"application/json"),
+                   (b"content-length", str(len(body)).encode())] + headers
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+app = AsyncApp()
@@ -0,0 +1,258 @@
+"""
+Response Cache Module
+
+TTL cache for read-only JSON endpoints, stored in a pluggable backend
+(app/cache_backends.py: per-process memory, shared SQLite file or Redis).
+
+Usage:
+    @bp.get("/stats")
+    @cached(ttl=300, tables=("order_payments",))
+    def get_payment_stats(): ...
+
+- Key: endpoint name + view args + normalized (sorted) query parameters,
+  plus the data versions of the route's tables when app/data_version.py's
+  conditional() runs first (g.cache_variant), so a version bump is a miss
+  even before invalidate() reaches this worker
+- Only 200 responses are stored (body bytes, status, content type)
+- Memory backend: bounded by RESPONSE_CACHE_CFG["max_entries"], least
+  recently used evicted. Shared backends (RESPONSE_CACHE_BACKEND=sqlite or
+  redis) let every worker process serve what any of them computed
+- Concurrent misses for the same key are coalesced: one request runs the
+  view, the others wait for its result instead of hitting the database.
+  With a shared backend this also holds across workers (a short lock per key)
+- invalidate(tables=...) drops entries that depend on the given tables;
+  ETL loaders reach it through POST /cache/invalidate (app/routes/cache.py)
+- on_invalidate(callback) lets other in-process structures built from the
+  database (e.g. app/geo_index.py) follow the same invalidations
+- Backend errors (e.g. Redis unreachable) are logged and treated as misses
+"""
+
+import functools
+import logging
+import threading
+import time
+from urllib.parse import urlencode
+
+from flask import current_app, g, request
+
+from app.cache_backends import Entry, make_backend
+from app.config import RESPONSE_CACHE_CFG
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Backend storage plus per-process counters and miss coalescing."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._inflight = {}  # key -> threading.Event set when the leader finishes
+        self._lock = threading.Lock()
+        self.stats = {}      # endpoint -> {"hits", "misses", "coalesced", "evictions", "errors"}
+
+    def _count(self, endpoint, field):
+        with self._lock:
+            counters = self.stats.setdefault(
+                endpoint, {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "errors": 0}
+            )
+            counters[field] += 1
+
+    def _backend_error(self, endpoint, action, error):
+        self._count(endpoint, "errors")
+        logger.warning(f"Response cache {action} failed ({type(self.backend).__name__}): {error}")
+
+    def get(self, key, endpoint):
+        """Return a live entry or None."""
+        try:
+            entry = self.backend.get(key)
+        except Exception as e:
+            self._backend_error(endpoint, "get", e)
+            return None
+        if entry is not None:
+            self._count(endpoint, "hits")
+        return entry
+
+    def set(self, key, endpoint, entry):
+        entry.endpoint = endpoint
+        try:
+            evicted = self.backend.set(key, entry)
+        except Exception as e:
+            self._backend_error(endpoint, "set", e)
+            return
+        for old_endpoint in evicted:
+            self._count(old_endpoint, "evictions")
+
+    def begin(self, key, endpoint):
+        """
+        Register a miss. Returns (is_leader, event): the leader must compute the
+        value and call end(); followers wait on the event and then retry get().
+        """
+        with self._lock:
+            event = self._inflight.get(key)
+            if event is None:
+                event = threading.Event()
+                self._inflight[key] = event
+                is_leader = True
+            else:
+                is_leader = False
+        self._count(endpoint, "misses" if is_leader else "coalesced")
+        return is_leader, event
+
+    def end(self, key):
+        with self._lock:
+            event = self._inflight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def lock(self, key, endpoint, ttl):
+        """Cross-worker leader election for a miss; True if this worker should compute."""
+        try:
+            return self.backend.acquire(key, ttl)
+        except Exception as e:
+            self._backend_error(endpoint, "lock", e)
+            return True
+
+    def unlock(self, key):
+        try:
+            self.backend.release(key)
+        except Exception as e:
+            logger.warning(f"Response cache unlock failed: {e}")
+
+    def wait_for(self, key, endpoint, timeout, interval=0.05):
+        """Poll the backend until another worker stores ``key`` or ``timeout`` passes."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(interval)
+            entry = self.get(key, endpoint)
+            if entry is not None:
+                return entry
+        return None
+
+    def invalidate(self, tables=None, endpoint=None):
+        """
+        Drop entries depending on any of ``tables`` and/or belonging to
+        ``endpoint``. With no arguments the whole cache is cleared.
+        Returns the number of entries removed.
+        """
+        try:
+            return self.backend.invalidate(tables=tables, endpoint=endpoint)
+        except Exception as e:
+            self._backend_error(endpoint, "invalidate", e)
+            return 0
+
+    def snapshot(self):
+        """Counters per endpoint plus current size."""
+        try:
+            entries = self.backend.size()
+        except Exception as e:
+            logger.warning(f"Response cache size failed: {e}")
+            entries = None
+        with self._lock:
+            endpoints = {name: dict(c) for name, c in self.stats.items()}
+        return {
+            "backend": RESPONSE_CACHE_CFG["backend"],
+            "entries": entries,
+            "max_entries": RESPONSE_CACHE_CFG["max_entries"],
+            "endpoints": endpoints,
+        }
+
+
+response_cache = ResponseCache(make_backend(RESPONSE_CACHE_CFG))
+
+
+def cache_key(endpoint, view_args, args, variant=None):
+    """Key for ``endpoint`` with view args and query (name, value) pairs, sorted by name."""
+    key = f"{endpoint}:{urlencode(sorted(view_args.items()))}?{urlencode(sorted(args, key=lambda kv: kv[0]))}"
+    return f"{key}#{variant}" if variant else key
+
+
+def _cache_key():
+    return cache_key(request.endpoint, request.view_args or {},
+                     request.args.items(multi=True), g.get("cache_variant"))
+
+
+def _response_from(entry):
+    return current_app.response_class(entry.body, status=entry.status, content_type=entry.content_type)
+
+
+def cached(ttl=None, tables=()):
+    """
+    Cache a view's successful responses for ``ttl`` seconds.
+
+    Args:
+        ttl: Seconds to keep a response (default RESPONSE_CACHE_CFG["default_ttl"])
+        tables: Tables the response is derived from, used by invalidate()
+    """
+    ttl = RESPONSE_CACHE_CFG["default_ttl"] if ttl is None else ttl
+    tables = frozenset(tables)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not RESPONSE_CACHE_CFG["enabled"] or request.method != "GET":
+                return view(*args, **kwargs)
+
+            key = _cache_key()
+            endpoint = request.endpoint
+            entry = response_cache.get(key, endpoint)
+            if entry is not None:
+                return _response_from(entry)
+
+            is_leader, event = response_cache.begin(key, endpoint)
+            if not is_leader:
+                event.wait(RESPONSE_CACHE_CFG["coalesce_timeout"])
+                entry = response_cache.get(key, endpoint)
+                if entry is not None:
+                    return _response_from(entry)
+                # Leader failed or timed out: compute independently.
+                return view(*args, **kwargs)
+
+            try:
+                timeout = RESPONSE_CACHE_CFG["coalesce_timeout"]
+                locked = response_cache.backend.shared and response_cache.lock(key, endpoint, timeout)
+                if response_cache.backend.shared and not locked:
+                    # Another worker is computing this key: wait for its result.
+                    entry = response_cache.wait_for(key, endpoint, timeout)
+                    if entry is not None:
+                        return _response_from(entry)
+                try:
+                    response = current_app.make_response(view(*args, **kwargs))
+                    if response.status_code == 200 and not response.direct_passthrough:
+                        response_cache.set(key, endpoint, Entry(
+                            response.get_data(),
+                            response.status_code,
+                            response.content_type,
+                            time.time() + ttl,
+                            tables,
+                        ))
+                    return response
+                finally:
+                    if locked:
+                        response_cache.unlock(key)
+            finally:
+                response_cache.end(key)
+
+        wrapper.cache_tables = tables
+        wrapper.cache_ttl = ttl
+        return wrapper
+
+    return decorator
+
+
+_invalidation_listeners = []
+
+
+def on_invalidate(callback):
+    """Register ``callback(tables)`` to run on every invalidate(); tables is None for a full clear."""
+    _invalidation_listeners.append(callback)
+    return callback
+
+
+def invalidate(tables=None, endpoint=None):
+    """Invalidation hook: drop cached responses (see ResponseCache.invalidate)."""
+    removed = response_cache.invalidate(tables=tables, endpoint=endpoint)
+    logger.info(f"Response cache invalidated: tables={tables}, endpoint={endpoint}, removed={removed}")
+    if endpoint is None:
+        for callback in _invalidation_listeners:
+            callback(tables)
+    return removed
@@ -0,0 +1,319 @@
+"""
+Response Cache Backends
+
+Storage behind app/cache.py's ResponseCache, chosen with
+RESPONSE_CACHE_BACKEND:
+
+- memory: per-process LRU dict (default). Fastest, but every worker has its
+  own copy and starts cold
+- sqlite: one on-disk file (RESPONSE_CACHE_SQLITE_PATH) shared by all
+  workers on the host, WAL mode
+- redis:  any Redis-protocol server (Redis, Valkey, KeyDB, Dragonfly) at
+  RESPONSE_CACHE_REDIS_URL, shared by all workers and hosts.
+  Requires the optional redis package
+
+Every backend implements the same small interface:
+    get(key) -> Entry | None
+    set(key, entry) -> [endpoint of each evicted entry]
+    invalidate(tables=None, endpoint=None) -> number of entries removed
+    size() -> number of stored entries
+    acquire(key, ttl) -> bool / release(key)   cross-worker miss coalescing
+
+Shared backends store an entry as a 5-byte header (flags, status, content
+type length), the content type and the response body, which is already
+compact JSON; bodies of RESPONSE_CACHE_COMPRESS_MIN bytes or more are
+zlib-compressed. Entries are tagged with their endpoint and source tables,
+so invalidate(tables=...) removes exactly the dependent entries for every
+worker at once.
+"""
+
+import logging
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class Entry:
+    __slots__ = ("body", "status", "content_type", "expires_at", "tables", "endpoint")
+
+    def __init__(self, body, status, content_type, expires_at, tables=frozenset(), endpoint=None):
+        self.body = body
+        self.status = status
+        self.content_type = content_type
+        self.expires_at = expires_at  # time.time() based: comparable across processes
+        self.tables = tables
+        self.endpoint = endpoint
+
+
+_HEADER = struct.Struct("!BHH")  # flags, status, len(content_type)
+_ZLIB = 1
+
+
+def encode_entry(entry, compress_min=1024):
+    """Entry -> bytes for shared backends."""
+    body, flags = entry.body, 0
+    if compress_min and len(body) >= compress_min:
+        body, flags = zlib.compress(body, 1), _ZLIB
+    content_type = entry.content_type.encode("latin-1")
+    return _HEADER.pack(flags, entry.status, len(content_type)) + content_type + body
+
+
+def decode_entry(data, expires_at=0.0):
+    flags, status, ct_len = _HEADER.unpack_from(data)
+    start = _HEADER.size
+    content_type = data[start:start + ct_len].decode("latin-1")
+    body = data[start + ct_len:]
+    if flags & _ZLIB:
+        body = zlib.decompress(body)
+    return Entry(bytes(body), status, content_type, expires_at)
+
+
+class MemoryBackend:
+    """Thread-safe LRU map of key -> Entry with per-entry expiry."""
+
+    shared = False
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        evicted = []
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _, old = self._entries.popitem(last=False)
+                evicted.append(old.endpoint)
+        return evicted
+
+    def invalidate(self, tables=None, endpoint=None):
+        tables = set(tables or ())
+        with self._lock:
+            if not tables and endpoint is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            doomed = [
+                key for key, entry in self._entries.items()
+                if (endpoint is not None and entry.endpoint == endpoint)
+                or (tables and tables & entry.tables)
+            ]
+            for key in doomed:
+                del self._entries[key]
+            return len(doomed)
+
+    def size(self):
+        with self._lock:
+            return len(self._entries)
+
+    def acquire(self, key, ttl):
+        return True  # ResponseCache already coalesces within the process
+
+    def release(self, key):
+        pass
+
+
+class SqliteBackend:
+    """Entries in one SQLite file shared by the worker processes of a host."""
+
+    shared = True
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS response_cache (
+        key TEXT PRIMARY KEY,
+        endpoint TEXT NOT NULL,
+        tables TEXT NOT NULL,          -- '|orders|order_items|'
+        expires_at REAL NOT NULL,
+        payload BLOB NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS response_cache__expires_at ON response_cache (expires_at);
+    CREATE INDEX IF NOT EXISTS response_cache__endpoint ON response_cache (endpoint);
+    CREATE TABLE IF NOT EXISTS response_cache_locks (
+        key TEXT PRIMARY KEY,
+        expires_at REAL NOT NULL
+    );
+    """
+
+    def __init__(self, path, max_entries=512, compress_min=1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.compress_min = compress_min
+        self._local = threading.local()
+        # Connections are opened per thread on first use, never before a fork.
+        conn = sqlite3.connect(path, timeout=5)
+        try:
+            conn.executescript(self.SCHEMA)
+        finally:
+            conn.close()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit; every statement is its own short transaction.
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT payload, expires_at FROM response_cache WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        return None if row is None else decode_entry(row[0], row[1])
+
+    def set(self, key, entry):
+        conn = self._conn()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO response_cache (key, endpoint, tables, expires_at, payload) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, entry.endpoint, "|" + "|".join(sorted(entry.tables)) + "|", entry.expires_at,
+             encode_entry(entry, self.compress_min)),
+        )
+        conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+        # Over capacity: drop the entries closest to expiry.
+        evicted = conn.execute(
+            "SELECT key, endpoint FROM response_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?",
+            (self.max_entries,),
+        ).fetchall()
+        if evicted:
+            conn.executemany("DELETE FROM response_cache WHERE key = ?", [(k,) for k, _ in evicted])
+        return [endpoint for _, endpoint in evicted]
+
+    def invalidate(self, tables=None, endpoint=None):
+        conn = self._conn()
+        if not tables and endpoint is None:
+            return conn.execute("DELETE FROM response_cache").rowcount
+        removed = 0
+        if endpoint is not None:
+            removed += conn.execute("DELETE FROM response_cache WHERE endpoint = ?", (endpoint,)).rowcount
+        for table in set(tables or ()):
+            removed += conn.execute(
+                "DELETE FROM response_cache WHERE instr(tables, ?) > 0", (f"|{table}|",)
+            ).rowcount
+        return removed
+
+    def size(self):
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM response_cache WHERE expires_at > ?", (time.time(),)
+        ).fetchone()[0]
+
+    def acquire(self, key, ttl):
+        conn = self._conn()
+        now = time.time()
+        conn.execute("DELETE FROM response_cache_locks WHERE key = ? AND expires_at <= ?", (key, now))
+        return conn.execute(
+            "INSERT OR IGNORE INTO response_cache_locks (key, expires_at) VALUES (?, ?)", (key, now + ttl)
+        ).rowcount == 1
+
+    def release(self, key):
+        self._conn().execute("DELETE FROM response_cache_locks WHERE key = ?", (key,))
+
+
+class RedisBackend:
+    """
+    Entries on a Redis-protocol server:
+        {ns}:e:{key}          encoded entry, expires with the entry (PX)
+        {ns}:t:{table}        set of entry keys derived from the table
+        {ns}:p:{endpoint}     set of entry keys of the endpoint
+        {ns}:l:{key}          miss lock (SET NX PX)
+    Tag sets are deleted when invalidated; members whose entry already
+    expired are harmless.
+    """
+
+    shared = True
+
+    def __init__(self, url, namespace="olist", compress_min=1024, client=None):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError("redis not installed. Run: pip install redis") from e
+            client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self.client = client
+        self.ns = namespace
+        self.compress_min = compress_min
+
+    def _entry_key(self, key):
+        return f"{self.ns}:e:{key}"
+
+    def get(self, key):
+        data = self.client.get(self._entry_key(key))
+        return None if data is None else decode_entry(data)
+
+    def set(self, key, entry):
+        ttl_ms = int((entry.expires_at - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return []
+        entry_key = self._entry_key(key)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(entry_key, encode_entry(entry, self.compress_min), px=ttl_ms)
+        pipe.sadd(f"{self.ns}:p:{entry.endpoint}", entry_key)
+        for table in entry.tables:
+            pipe.sadd(f"{self.ns}:t:{table}", entry_key)
+        pipe.execute()
+        return []  # the server evicts by its own maxmemory policy
+
+    def _drop_tag(self, tag):
+        members = self.client.smembers(tag)
+        removed = self.client.delete(*members) if members else 0
+        self.client.delete(tag)
+        return removed
+
+    def invalidate(self, tables=None, endpoint=None):
+        if not tables and endpoint is None:
+            keys = list(self.client.scan_iter(match=f"{self.ns}:*", count=500))
+            removed = sum(1 for k in keys if (k.decode() if isinstance(k, bytes) else k).startswith(f"{self.ns}:e:"))
+            if keys:
+                self.client.delete(*keys)
+            return removed
+        removed = 0
+        if endpoint is not None:
+            removed += self._drop_tag(f"{self.ns}:p:{endpoint}")
+        for table in set(tables or ()):
+            removed += self._drop_tag(f"{self.ns}:t:{table}")
+        return removed
+
+    def size(self):
+        return sum(1 for _ in self.client.scan_iter(match=f"{self.ns}:e:*", count=500))
+
+    def acquire(self, key, ttl):
+        return bool(self.client.set(f"{self.ns}:l:{key}", b"1", nx=True, px=max(1, int(ttl * 1000))))
+
+    def release(self, key):
+        self.client.delete(f"{self.ns}:l:{key}")
+
+
+def make_backend(cfg):
+    """Backend named by cfg["backend"] (memory, sqlite, redis)."""
+    name = cfg.get("backend", "memory")
+    if name == "memory":
+        return MemoryBackend(max_entries=cfg["max_entries"])
+    if name == "sqlite":
+        os.makedirs(os.path.dirname(os.path.abspath(cfg["sqlite_path"])), exist_ok=True)
+        return SqliteBackend(cfg["sqlite_path"], max_entries=cfg["max_entries"],
+                             compress_min=cfg["compress_min"])
+    if name == "redis":
+        return RedisBackend(cfg["redis_url"], namespace=cfg["namespace"], compress_min=cfg["compress_min"])
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {name!r} (expected memory, sqlite or redis)")
@@ -20,9 +20,79 @@ DB_CFG = {
     "dbname": os.getenv("DB_NAME", "olist"),
     "user": os.getenv("DB_USER", "postgres" if DB_VENDOR == "postgres" else "root"),
     "password": os.getenv("DB_PASS", ""),
-    "vendor": DB_VENDOR
+    "vendor": DB_VENDOR,
+    # MySQL only: let the client send files for LOAD DATA LOCAL INFILE (ETL bulk path).
+    # The server must also have local_infile=ON.
+    "local_infile": os.getenv("MYSQL_LOCAL_INFILE", "0").strip().lower() in ("1", "true", "yes", "on"),
 }
 
+# Per-process connection pool used by db.get_conn() (app/db/__init__.py).
+# Set DB_POOL_ENABLED=0 to open a fresh connection for every request.
+POOL_CFG = {
+    "enabled": os.getenv("DB_POOL_ENABLED", "1").strip().lower() in ("1", "true", "yes", "on"),
+    "min_size": int(os.getenv("DB_POOL_MIN", "1")),
+    "max_size": int(os.getenv("DB_POOL_MAX", "10")),
+    "idle_timeout": float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300")),
+    "wait_timeout": float(os.getenv("DB_POOL_WAIT_TIMEOUT", "5")),
+    "check_interval": float(os.getenv("DB_POOL_CHECK_INTERVAL", "5")),
+}
+
+# HTTP conditional caching (app/data_version.py): ETag / Last-Modified from the
+# data_version table; version snapshot reloaded at most every version_ttl seconds
+HTTP_CACHE_CFG = {
+    "enabled": os.getenv("HTTP_CACHE_ENABLED", "1").strip().lower() in ("1", "true", "yes", "on"),
+    "version_ttl": float(os.getenv("DATA_VERSION_TTL", "5")),
+    "max_age": int(os.getenv("HTTP_CACHE_MAX_AGE", "0")),
+}
+
+# Query fan-out (app/db/fanout.py): independent queries of one request run on
+# separate pooled connections. Keep max_workers below DB_POOL_MAX.
+FANOUT_CFG = {
+    "enabled": os.getenv("QUERY_FANOUT_ENABLED", "1").strip().lower() in ("1", "true", "yes", "on"),
+    "max_workers": int(os.getenv("QUERY_FANOUT_WORKERS", "4")),
+}
+
+# Async serving mode (app/asgi.py, PostgreSQL only): psycopg AsyncConnectionPool
+# for the async-native routes, plus the threads that run all other Flask routes.
+ASYNC_POOL_CFG = {
+    "min_size": int(os.getenv("ASYNC_POOL_MIN", "2")),
+    "max_size": int(os.getenv("ASYNC_POOL_MAX", "20")),
+    "wait_timeout": float(os.getenv("ASYNC_POOL_WAIT_TIMEOUT", os.getenv("DB_POOL_WAIT_TIMEOUT", "5"))),
+    "wsgi_threads": int(os.getenv("ASYNC_WSGI_THREADS", "16")),
+}
+
+# In-process response cache for read-only endpoints (app/cache.py)
+RESPONSE_CACHE_CFG = {
+    "enabled": os.getenv("RESPONSE_CACHE_ENABLED", "1").strip().lower() in ("1", "true", "yes", "on"),
+    "max_entries": int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512")),
+    "default_ttl": float(os.getenv("RESPONSE_CACHE_TTL", "300")),
+    # Seconds a coalesced request waits for the in-flight one before querying itself
+    "coalesce_timeout": float(os.getenv("RESPONSE_CACHE_COALESCE_TIMEOUT", "30")),
+    # Required in X-Cache-Token for POST /cache/invalidate; if empty only localhost may call it
+    "admin_token": os.getenv("CACHE_ADMIN_TOKEN", ""),
+    # Storage (app/cache_backends.py): memory (per process), sqlite or redis (shared by workers)
+    "backend": os.getenv("RESPONSE_CACHE_BACKEND", "memory").strip().lower(),
+    "sqlite_path": os.getenv("RESPONSE_CACHE_SQLITE_PATH", os.path.join("var", "response_cache.sqlite3")),
+    "redis_url": os.getenv("RESPONSE_CACHE_REDIS_URL", "redis://127.0.0.1:6379/0"),
+    "namespace": os.getenv("RESPONSE_CACHE_NAMESPACE", "olist"),
+    # Shared backends zlib-compress bodies of at least this many bytes (0 = never)
+    "compress_min": int(os.getenv("RESPONSE_CACHE_COMPRESS_MIN", "1024")),
+}
+
+# In-memory spatial index behind /geo/nearby (app/geo_index.py)
+GEO_INDEX_CFG = {
+    # Seconds before the index is rebuilt from customers/sellers/geo_zip
+    "ttl": float(os.getenv("GEO_INDEX_TTL", "3600")),
+    # Grid cell size in degrees (0.5 deg is ~55 km north-south)
+    "cell_deg": float(os.getenv("GEO_INDEX_CELL_DEG", "0.5")),
+}
+
+# Seconds /health/ready keeps cached row-count statistics
+HEALTH_STATS_TTL = float(os.getenv("HEALTH_STATS_TTL", "60"))
+
+# Flask JSON provider (app/json_provider.py): orjson (falls back to stdlib if not installed) or stdlib
+JSON_PROVIDER = os.getenv("JSON_PROVIDER", "orjson").strip().lower()
+
 # Warn if using default/empty password
 if not DB_CFG["password"]:
     logger.warning("DB_PASS not set or empty. Database connection may fail. Please set DB_PASS in your .env file.")
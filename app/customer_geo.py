@@ -0,0 +1,90 @@
+"""
+Customer Geo Projection Module
+
+Keeps customer_geo and its counts (db/ddl/080_customer_geo.sql) in step
+with single-customer writes. The ETL rebuilds the whole projection
+(db/etl/refresh_rollups.py refresh_customer_geo); the customer
+create/edit/delete routes call these helpers on the same cursor as their
+INSERT/UPDATE/DELETE, between begin() and conn.commit().
+
+Usage:
+    begin(cur)
+    remove_customer(cur, customer_id)    # old location, if any
+    cur.execute("UPDATE customers ...")
+    add_customer(cur, customer_id)       # new location, if its zip is in geo_zip
+    conn.commit()
+"""
+
+from app.config import DB_CFG
+
+# Tables written by add_customer()/remove_customer()
+TABLES = ("customer_geo", "customer_geo_state_counts")
+
+_PROJECT_SQL = """
+INSERT INTO customer_geo (customer_id, zip_code_prefix, lat, lng, city, state)
+SELECT
+    c.customer_id,
+    c.customer_zip_code_prefix,
+    g.geolocation_lat,
+    g.geolocation_lng,
+    g.geolocation_city,
+    g.geolocation_state
+FROM customers c
+JOIN geo_zip g ON g.geolocation_zip_code_prefix = c.customer_zip_code_prefix
+WHERE c.customer_id = %s
+"""
+
+_LOCATION_SQL = "SELECT state FROM customer_geo WHERE customer_id = %s"
+
+
+def _is_mysql():
+    return DB_CFG.get("vendor") == "mysql"
+
+
+def begin(cur):
+    """MySQL connections are autocommit; group the writes explicitly."""
+    if _is_mysql():
+        cur.execute("START TRANSACTION")
+
+
+def _increment(cur, table, keys, values):
+    cols = ", ".join(keys)
+    marks = ", ".join(["%s"] * len(keys))
+    if _is_mysql():
+        sql = (f"INSERT INTO {table} ({cols}, customer_count) VALUES ({marks}, 1) "
+               f"ON DUPLICATE KEY UPDATE customer_count = customer_count + 1")
+    else:
+        sql = (f"INSERT INTO {table} ({cols}, customer_count) VALUES ({marks}, 1) "
+               f"ON CONFLICT ({cols}) DO UPDATE SET customer_count = {table}.customer_count + 1")
+    cur.execute(sql, values)
+
+
+def _decrement(cur, table, keys, values):
+    where = " AND ".join(f"{k} = %s" for k in keys)
+    cur.execute(f"UPDATE {table} SET customer_count = customer_count - 1 WHERE {where}", values)
+    cur.execute(f"DELETE FROM {table} WHERE {where} AND customer_count <= 0", values)
+
+
+def _adjust(cur, state, step):
+    if state is not None:
+        apply = _increment if step > 0 else _decrement
+        apply(cur, "customer_geo_state_counts", ("state",), (state,))
+
+
+def add_customer(cur, customer_id):
+    """Project a customer row that is already in customers; bump its counts."""
+    cur.execute(_PROJECT_SQL, (customer_id,))
+    if cur.rowcount <= 0:
+        return  # zip prefix unknown to geo_zip, not part of the projection
+    cur.execute(_LOCATION_SQL, (customer_id,))
+    _adjust(cur, cur.fetchone()[0], +1)
+
+
+def remove_customer(cur, customer_id):
+    """Drop a customer from the projection; lower its counts."""
+    cur.execute(_LOCATION_SQL, (customer_id,))
+    row = cur.fetchone()
+    if row is None:
+        return
+    cur.execute("DELETE FROM customer_geo WHERE customer_id = %s", (customer_id,))
+    _adjust(cur, row[0], -1)
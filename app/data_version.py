@@ -0,0 +1,184 @@
+"""
+Data Version Module
+
+HTTP conditional caching for read endpoints, driven by the data_version
+table (db/ddl/110_data_version.sql).
+
+Usage:
+    @bp.get("/stats")
+    @conditional(tables=("order_payments",))
+    @cached(tables=("order_payments",))
+    def get_payment_stats(): ...
+
+- Every write path bumps the version of the tables it changed: ETL loaders
+  through db/etl/etl_utils.invalidate_api_cache, customer writes with
+  bump(cur, tables) in the same transaction
+- ETag: hash of the endpoint and the versions of the tables it reads;
+  Last-Modified: newest updated_at among them
+- A matching If-None-Match (or If-Modified-Since when no ETag is sent) gets
+  304 before the view runs, so neither the database nor the response
+  cache is touched
+- The ETag is also handed to @cached (g.cache_variant) as part of its key:
+  a cached body is only served under the versions it was computed at
+- Versions come from an in-process snapshot, re-read at most every
+  HTTP_CACHE_CFG["version_ttl"] seconds and immediately after
+  app.cache.invalidate(). If data_version cannot be read, responses are
+  sent without validators
+"""
+
+import functools
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import current_app, g, request
+from werkzeug.http import http_date, quote_etag
+
+from app.cache import on_invalidate
+from app.config import HTTP_CACHE_CFG
+from app.db import db, dialect
+
+logger = logging.getLogger(__name__)
+
+
+def _bump_sql():
+    if dialect.is_mysql():
+        return """
+        INSERT INTO data_version (table_name, version, updated_at)
+        VALUES (%s, 1, CURRENT_TIMESTAMP)
+        ON DUPLICATE KEY UPDATE version = version + 1, updated_at = CURRENT_TIMESTAMP
+        """
+    return """
+    INSERT INTO data_version (table_name, version, updated_at)
+    VALUES (%s, 1, now())
+    ON CONFLICT (table_name)
+    DO UPDATE SET version = data_version.version + 1, updated_at = now()
+    """
+
+
+def bump(cur, tables):
+    """Increment the version of each table; call inside the writing transaction."""
+    sql = _bump_sql()
+    for table in sorted(set(tables)):
+        cur.execute(sql, (table,))
+    mark_stale()
+
+
+def read_versions(conn):
+    """{table: (version, updated_at epoch seconds)} for every row of data_version."""
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT table_name, version, {dialect.epoch_seconds('updated_at')} FROM data_version")
+        return {row[0]: (int(row[1]), float(row[2])) for row in cur.fetchall()}
+
+
+_snapshot = None      # {table: (version, updated_at)}
+_loaded_at = 0.0
+_stale = False
+_lock = threading.Lock()
+
+
+def get_versions():
+    """Current version snapshot, reloaded when older than version_ttl; None if unreadable."""
+    global _snapshot, _loaded_at, _stale
+    if not _stale and time.monotonic() - _loaded_at <= HTTP_CACHE_CFG["version_ttl"]:
+        return _snapshot
+    with _lock:
+        if not _stale and time.monotonic() - _loaded_at <= HTTP_CACHE_CFG["version_ttl"]:
+            return _snapshot
+        try:
+            with db.get_conn() as conn:
+                _snapshot = read_versions(conn)
+        except Exception as e:
+            # Keep the previous snapshot if any; retry after another ttl.
+            logger.warning(f"data_version unavailable ({e}); conditional caching paused")
+        _loaded_at, _stale = time.monotonic(), False
+        return _snapshot
+
+
+def mark_stale():
+    """Re-read data_version on the next conditional request."""
+    global _stale
+    _stale = True
+
+
+@on_invalidate
+def _on_cache_invalidate(tables):
+    mark_stale()
+
+
+def validators(endpoint, tables, versions):
+    """(etag, last_modified datetime or None) for ``endpoint`` reading ``tables``."""
+    parts = [endpoint] + [f"{t}:{versions.get(t, (0, 0.0))[0]}" for t in sorted(tables)]
+    etag = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:20]
+    stamps = [versions[t][1] for t in tables if t in versions]
+    last_modified = datetime.fromtimestamp(int(max(stamps)), tz=timezone.utc) if stamps else None
+    return etag, last_modified
+
+
+def not_modified(etag, last_modified, if_none_match, if_modified_since):
+    """True if the request's parsed If-None-Match / If-Modified-Since match the validators."""
+    if if_none_match:
+        return if_none_match.contains_weak(etag)
+    return bool(if_modified_since and last_modified and last_modified <= if_modified_since)
+
+
+def _cache_control():
+    max_age = HTTP_CACHE_CFG["max_age"]
+    return f"public, max-age={max_age}" if max_age > 0 else "public, no-cache"
+
+
+def validator_headers(etag, last_modified):
+    """ETag, Last-Modified and Cache-Control as (name, value) pairs."""
+    headers = [("ETag", quote_etag(etag, weak=True))]
+    if last_modified is not None:
+        headers.append(("Last-Modified", http_date(last_modified)))
+    headers.append(("Cache-Control", _cache_control()))
+    return headers
+
+
+def _set_validators(response, etag, last_modified):
+    for name, value in validator_headers(etag, last_modified):
+        response.headers[name] = value
+    return response
+
+
+def conditional(tables):
+    """
+    Add ETag / Last-Modified / Cache-Control to a view's 200 responses and
+    answer matching conditional GETs with 304.
+
+    Args:
+        tables: Tables the response is derived from (their data_version rows)
+    """
+    tables = frozenset(tables)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not HTTP_CACHE_CFG["enabled"] or request.method != "GET":
+                return view(*args, **kwargs)
+            versions = get_versions()
+            if versions is None:
+                return view(*args, **kwargs)
+
+            # Validators are taken before the view reads and the response
+            # cache is keyed by them, so the body is at least as new as the
+            # versions in its ETag. It can be newer (a write racing the read,
+            # or a snapshot up to version_ttl old); the next snapshot then
+            # yields a new ETag and a cache miss.
+            etag, last_modified = validators(request.endpoint, tables, versions)
+            if not_modified(etag, last_modified, request.if_none_match, request.if_modified_since):
+                return _set_validators(current_app.response_class(status=304), etag, last_modified)
+            g.cache_variant = etag
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                _set_validators(response, etag, last_modified)
+            return response
+
+        wrapper.version_tables = tables
+        return wrapper
+
+    return decorator
@@ -1,13 +1,24 @@
 """
 Database module initialization.
 Exports db object with get_conn() method for compatibility with existing code.
+
+db.get_conn() checks a connection out of the per-process pool (see
+app/db/pool.py); closing it or leaving its ``with`` block returns it to the
+pool. With DB_POOL_ENABLED=0 it falls back to a fresh connection per call.
 """
-from .db import get_conn
+from .db import get_conn, get_pool, close_pool, pool_status
+from .pool import PoolTimeout
 
 class DB:
     """Database connection wrapper."""
     def get_conn(self):
-        return get_conn()
+        pool = get_pool()
+        if pool is None:
+            return get_conn()
+        return pool.getconn()
 
-db = DB()
+    def pool_status(self):
+        """Pool occupancy/counters, or None when pooling is disabled."""
+        return pool_status()
 
+db = DB()
@@ -14,13 +14,21 @@ Development Setup:
 8. Start Flask: flask run
 
 The get_conn() function automatically uses the correct driver based on DB_VENDOR.
+It always opens a new connection. Application code should use the db.get_conn()
+wrapper in app/db/__init__.py instead, which hands out pooled connections from
+get_pool() when DB_POOL_ENABLED is on.
 """
 
-from app.config import DB_CFG
+from app.config import DB_CFG, POOL_CFG
 import logging
+import os
+import threading
 
 logger = logging.getLogger(__name__)
 
+_pool = None
+_pool_lock = threading.Lock()
+
 def get_conn():
     """
     Get database connection based on DB_VENDOR environment variable.
@@ -87,7 +95,8 @@ def get_conn():
                 "database": dbname,
                 "user": user,
                 "password": password,
-                "autocommit": True  # Enable autocommit for MySQL
+                "autocommit": True,  # Enable autocommit for MySQL
+                "allow_local_infile": DB_CFG.get("local_infile", False),
             }
             
             conn = mysql.connector.connect(**conn_params)
@@ -111,3 +120,52 @@ def get_conn():
         error_msg = f"Unsupported DB_VENDOR: '{vendor}'. Must be 'postgres' or 'mysql'."
         logger.error(error_msg)
         raise ValueError(error_msg)
+
+
+def get_pool():
+    """
+    Get the per-process connection pool, creating it on first use.
+
+    Returns None when pooling is disabled (DB_POOL_ENABLED=0). The pool is
+    re-created after a fork so workers never share sockets with their parent.
+
+    Raises:
+        ConnectionError: If the initial min_size connections cannot be opened
+    """
+    global _pool
+    if not POOL_CFG.get("enabled"):
+        return None
+    pool = _pool
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            from app.db.pool import ConnectionPool
+            # Late-bound so tests can monkeypatch app.db.db.get_conn.
+            _pool = ConnectionPool(
+                lambda: get_conn(),
+                min_size=POOL_CFG["min_size"],
+                max_size=POOL_CFG["max_size"],
+                idle_timeout=POOL_CFG["idle_timeout"],
+                wait_timeout=POOL_CFG["wait_timeout"],
+                check_interval=POOL_CFG["check_interval"],
+            )
+            logger.info(
+                f"Connection pool created: min={POOL_CFG['min_size']}, max={POOL_CFG['max_size']}"
+            )
+        return _pool
+
+
+def pool_status():
+    """Pool occupancy/counters, or None when no pool has been created."""
+    pool = _pool
+    return pool.status() if pool is not None else None
+
+
+def close_pool():
+    """Close the connection pool (idle connections immediately)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
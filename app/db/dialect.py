@@ -0,0 +1,67 @@
+"""
+SQL Dialect Module
+
+Vendor-specific SQL fragments, so routes can write one query that runs
+unchanged on PostgreSQL and MySQL.
+
+Usage:
+    from app.db import dialect
+    sql = f"SELECT {dialect.round_to('AVG(review_score)', 2)} FROM order_reviews"
+
+Fragments are built per call from DB_CFG["vendor"]; the arguments are
+column expressions written by the caller, never user input.
+"""
+
+from app.config import DB_CFG
+
+
+def is_mysql():
+    return DB_CFG.get("vendor") == "mysql"
+
+
+def days_between(start, end):
+    """
+    Whole days from ``start`` to ``end`` (truncated toward zero), NULL if either is NULL.
+
+    MySQL:      TIMESTAMPDIFF(DAY, start, end)
+    PostgreSQL: DATE_PART('day', end - start)   (day field of the interval)
+    """
+    if is_mysql():
+        return f"TIMESTAMPDIFF(DAY, {start}, {end})"
+    return f"DATE_PART('day', {end} - {start})"
+
+
+def round_to(expr, digits):
+    """
+    ROUND(expr, digits) for any numeric expression.
+
+    PostgreSQL only has ROUND(numeric, int), so double precision results
+    (AVG over DATE_PART, float columns) are cast to NUMERIC first.
+    """
+    if is_mysql():
+        return f"ROUND({expr}, {int(digits)})"
+    return f"ROUND(CAST({expr} AS NUMERIC), {int(digits)})"
+
+
+def group_by_rollup(column):
+    """
+    GROUP BY clause adding a grand-total row (``column`` NULL, GROUPING(column) = 1).
+
+    MySQL:      GROUP BY column WITH ROLLUP
+    PostgreSQL: GROUP BY ROLLUP (column)
+    """
+    if is_mysql():
+        return f"GROUP BY {column} WITH ROLLUP"
+    return f"GROUP BY ROLLUP ({column})"
+
+
+def epoch_seconds(expr):
+    """
+    Seconds since 1970-01-01 UTC of a timestamp column, as a number.
+
+    MySQL:      UNIX_TIMESTAMP(expr)   (TIMESTAMP columns, session time zone aware)
+    PostgreSQL: EXTRACT(EPOCH FROM expr)
+    """
+    if is_mysql():
+        return f"UNIX_TIMESTAMP({expr})"
+    return f"EXTRACT(EPOCH FROM {expr})"
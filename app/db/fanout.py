@@ -0,0 +1,90 @@
+"""
+Query Fan-out Module
+
+Runs the independent queries of one request in parallel, each on its own
+pooled connection, so the request takes as long as its slowest query
+instead of the sum of all of them.
+
+Usage:
+    from app.db.fanout import fetch_all
+    rows = fetch_all({
+        "overall": ("SELECT COUNT(*) FROM order_reviews", None),
+        "dist": ("SELECT review_score, COUNT(*) FROM order_reviews "
+                 "WHERE review_score BETWEEN %s AND %s GROUP BY review_score", (1, 5)),
+    })
+    rows["overall"][0], rows["dist"]
+
+- Queries run on a shared per-process thread pool (FANOUT_CFG["max_workers"]);
+  each worker checks a connection out of the pool (db.get_conn()) and returns
+  it when its query is done. The caller must not hold a connection itself
+  while waiting, or one request could need more than max_workers + 1
+  connections
+- Read-only statements only: the queries do not share a transaction
+- The first failing query (in argument order) is re-raised after all queries
+  have finished, so no connection is left checked out
+- With FANOUT_CFG["enabled"] off, or a single query, everything runs in the
+  calling thread on one connection
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from app.config import FANOUT_CFG
+from app.db import db
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=FANOUT_CFG["max_workers"], thread_name_prefix="fanout"
+                )
+    return _executor
+
+
+def _fetch(cur, sql, params):
+    cur.execute(sql, params)
+    return cur.fetchall()
+
+
+def _fetch_one_conn(sql, params):
+    with db.get_conn() as conn:
+        with conn.cursor() as cur:
+            return _fetch(cur, sql, params)
+
+
+def fetch_all(queries):
+    """
+    Run ``{name: (sql, params)}`` and return ``{name: rows}`` (cursor.fetchall()).
+    """
+    if not FANOUT_CFG["enabled"] or len(queries) < 2:
+        with db.get_conn() as conn:
+            with conn.cursor() as cur:
+                return {name: _fetch(cur, sql, params) for name, (sql, params) in queries.items()}
+
+    executor = _get_executor()
+    futures = {name: executor.submit(_fetch_one_conn, sql, params) for name, (sql, params) in queries.items()}
+    wait(futures.values())
+    for name, future in futures.items():
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Fan-out query '{name}' failed: {error}")
+            raise error
+    return {name: future.result() for name, future in futures.items()}
+
+
+def shutdown():
+    """Stop the worker threads (tests, process shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
@@ -0,0 +1,283 @@
+"""
+Connection Pool Module
+
+A small, bounded, per-process connection pool that works for both psycopg and
+mysql.connector connections. Connections are created through a factory
+(normally app.db.db.get_conn) and handed out wrapped in a PooledConnection,
+which returns the underlying connection to the pool on close() or at the end
+of a ``with`` block instead of tearing down the TCP/auth session.
+
+Settings come from POOL_CFG in app/config.py:
+- min_size:       connections opened eagerly when the pool is created
+- max_size:       hard upper bound of open connections per process
+- idle_timeout:   idle connections older than this (seconds) are closed
+- wait_timeout:   how long getconn() waits for a free slot before PoolTimeout
+- check_interval: connections idle longer than this are pinged on checkout
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(ConnectionError):
+    """Raised when no connection becomes available within wait_timeout."""
+
+
+def _is_closed(conn) -> bool:
+    """Best-effort check whether a raw driver connection is unusable."""
+    # psycopg exposes closed/broken; mysql.connector is checked on checkout.
+    return bool(getattr(conn, "closed", False) or getattr(conn, "broken", False))
+
+
+def _autocommit(conn) -> bool:
+    return bool(getattr(conn, "autocommit", False))
+
+
+def check_connection(conn) -> bool:
+    """
+    Health check run on checkout: a SELECT 1 round trip.
+    Leaves the connection outside of any transaction.
+    """
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT 1")
+            cur.fetchone()
+        finally:
+            cur.close()
+        if not _autocommit(conn):
+            conn.rollback()
+        return True
+    except Exception as e:
+        logger.warning(f"Pooled connection failed health check: {type(e).__name__}: {e}")
+        return False
+
+
+class PooledConnection:
+    """
+    Proxy around a raw driver connection checked out from a ConnectionPool.
+
+    Supports the same usage as a plain connection in this codebase:
+        with db.get_conn() as conn: ...       # commit/rollback, then release
+        conn = db.get_conn(); ...; conn.close()  # release
+    Every other attribute (cursor, commit, rollback, ...) is delegated.
+    """
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        conn = self.__dict__.get("_conn")
+        if conn is None:
+            raise AttributeError(f"connection already returned to pool ({name})")
+        return getattr(conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        conn = self._conn
+        if conn is None:
+            return False
+        discard = False
+        if not _autocommit(conn):
+            try:
+                if exc_type is None:
+                    conn.commit()
+                else:
+                    conn.rollback()
+            except Exception as e:
+                logger.warning(f"Discarding pooled connection after failed {'commit' if exc_type is None else 'rollback'}: {e}")
+                discard = True
+        self._release(discard)
+        return False
+
+    def close(self):
+        """Return the connection to the pool (rolling back any open transaction)."""
+        conn = self._conn
+        if conn is None:
+            return
+        discard = False
+        if not _autocommit(conn):
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+        self._release(discard)
+
+    def discard(self):
+        """Close the underlying connection instead of returning it (e.g. after
+        an aborted streaming read left unread results on it)."""
+        if self._conn is not None:
+            self._release(discard=True)
+
+    @property
+    def raw(self):
+        """The underlying driver connection."""
+        return self._conn
+
+    def _release(self, discard=False):
+        conn, self._conn = self._conn, None
+        self._pool.putconn(conn, discard=discard)
+
+    def __del__(self):
+        # Safety net for code paths that forget close(); never raise here.
+        try:
+            if self.__dict__.get("_conn") is not None:
+                self._release(discard=True)
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Thread-safe bounded pool of driver connections for a single process."""
+
+    def __init__(self, factory, min_size=1, max_size=10, idle_timeout=300.0,
+                 wait_timeout=5.0, check_interval=5.0, check=check_connection):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.wait_timeout = wait_timeout
+        self.check_interval = check_interval
+        self.check = check
+        self.pid = os.getpid()
+
+        self._idle = deque()  # (conn, last_used_monotonic)
+        self._size = 0        # open connections: idle + checked out
+        self._cond = threading.Condition()
+        self._closed = False
+        self.stats = {"created": 0, "reused": 0, "discarded": 0, "timeouts": 0}
+
+        for _ in range(min_size):
+            with self._cond:
+                self._size += 1
+            conn = self._create()
+            with self._cond:
+                self._idle.append((conn, time.monotonic()))
+
+    def _create(self):
+        """Open a new connection for a slot already reserved in _size."""
+        try:
+            conn = self.factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        self.stats["created"] += 1
+        return conn
+
+    def _close_raw(self, conn):
+        self.stats["discarded"] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def getconn(self, timeout=None):
+        """
+        Check out a connection, waiting up to ``timeout`` (default wait_timeout)
+        seconds for one to become free.
+
+        Raises:
+            PoolTimeout: If the pool is exhausted for the whole wait period
+        """
+        timeout = self.wait_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            conn = None
+            reserved = False
+            with self._cond:
+                if self._closed:
+                    raise ConnectionError("Connection pool is closed")
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"No database connection available within {timeout:.1f}s "
+                            f"(pool max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+                if self._idle:
+                    # LIFO: the most recently used connection is the warmest.
+                    conn, last_used = self._idle.pop()
+                else:
+                    self._size += 1
+                    reserved = True
+
+            if reserved:
+                return PooledConnection(self, self._create())
+
+            idle_for = time.monotonic() - last_used
+            if self.idle_timeout and idle_for > self.idle_timeout:
+                self._discard(conn)
+                continue
+            if _is_closed(conn) or (idle_for > self.check_interval and not self.check(conn)):
+                self._discard(conn)
+                continue
+            self.stats["reused"] += 1
+            return PooledConnection(self, conn)
+
+    def putconn(self, conn, discard=False):
+        """Return a connection to the pool, or close it if it is unusable."""
+        if discard or self._closed or _is_closed(conn):
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+        self._reap()
+
+    def _discard(self, conn):
+        self._close_raw(conn)
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _reap(self):
+        """Close connections idle longer than idle_timeout, keeping min_size open."""
+        if not self.idle_timeout:
+            return
+        now = time.monotonic()
+        expired = []
+        with self._cond:
+            # Oldest connections sit at the left end of the deque.
+            while (self._idle and self._size - len(expired) > self.min_size
+                   and now - self._idle[0][1] > self.idle_timeout):
+                expired.append(self._idle.popleft()[0])
+        for conn in expired:
+            self._discard(conn)
+
+    def close(self):
+        """Close all idle connections; checked-out ones are closed on return."""
+        with self._cond:
+            self._closed = True
+            idle = [c for c, _ in self._idle]
+            self._idle.clear()
+        for conn in idle:
+            self._discard(conn)
+
+    def status(self) -> dict:
+        """Snapshot of pool occupancy and counters."""
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                **self.stats,
+            }
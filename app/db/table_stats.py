@@ -0,0 +1,142 @@
+"""
+Table Statistics Module
+
+Cheap row-count estimates for the readiness probe (/health/ready).
+
+Instead of SELECT COUNT(*) over every table (a full scan each), estimates are
+read from the catalog:
+- PostgreSQL: pg_class.reltuples (maintained by VACUUM/ANALYZE)
+- MySQL:      information_schema.tables.table_rows (InnoDB estimate)
+
+Results are kept in a small TTL cache so frequent probes do not touch the
+catalog either. Exact counts are still available on demand.
+"""
+
+import logging
+import threading
+import time
+
+from app.config import DB_CFG, HEALTH_STATS_TTL
+
+logger = logging.getLogger(__name__)
+
+# Real table names from db/ddl and db/ddl_mysql
+TABLES = [
+    "customers",
+    "orders",
+    "order_items",
+    "products",
+    "sellers",
+    "order_payments",
+    "order_reviews",
+    "categories",
+    "geo_zip",
+]
+
+_cache = {}  # mode -> (expires_at, stored_at, counts)
+_cache_lock = threading.Lock()
+
+
+def estimated_row_counts(conn, tables=None):
+    """
+    Read estimated row counts from the catalog in a single query.
+
+    Returns:
+        dict: table -> estimated rows (None if never analyzed). Tables that
+        do not exist are absent from the result.
+    """
+    tables = list(tables or TABLES)
+    vendor = DB_CFG.get("vendor", "postgres")
+    if vendor == "mysql":
+        placeholders = ", ".join(["%s"] * len(tables))
+        sql = f"""
+        SELECT table_name, table_rows
+        FROM information_schema.tables
+        WHERE table_schema = DATABASE()
+          AND table_name IN ({placeholders})
+        """
+        params = tables
+    else:
+        sql = """
+        SELECT c.relname, c.reltuples::bigint
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = current_schema()
+          AND c.relkind IN ('r', 'p')
+          AND c.relname = ANY(%s)
+        """
+        params = (tables,)
+
+    cur = conn.cursor()
+    try:
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+
+    counts = {}
+    for name, estimate in rows:
+        # reltuples is -1 for tables never vacuumed/analyzed (PostgreSQL 14+)
+        counts[name] = int(estimate) if estimate is not None and estimate >= 0 else None
+    return counts
+
+
+def exact_row_counts(conn, tables=None):
+    """
+    COUNT(*) per table. Expensive: one full scan per table.
+
+    Returns:
+        dict: table -> row count. Tables that cannot be counted (e.g. do not
+        exist) are absent from the result, as in estimated_row_counts().
+    """
+    counts = {}
+    cur = conn.cursor()
+    try:
+        for table in tables or TABLES:
+            if table not in TABLES:
+                raise ValueError(f"Unknown table: {table}")
+            try:
+                cur.execute(f"SELECT COUNT(*) FROM {table}")
+                counts[table] = int(cur.fetchone()[0])
+            except Exception as e:
+                if not getattr(conn, "autocommit", False):
+                    conn.rollback()
+                logger.warning(f"COUNT(*) on {table} failed: {e}")
+    finally:
+        cur.close()
+    return counts
+
+
+def get_row_counts(conn_factory, exact=False, ttl=None):
+    """
+    Cached row counts.
+
+    Args:
+        conn_factory: Callable returning a connection (e.g. db.get_conn); only
+            called on a cache miss
+        exact: Use COUNT(*) instead of catalog estimates
+        ttl: Cache lifetime in seconds (default HEALTH_STATS_TTL)
+
+    Returns:
+        tuple: (counts dict, age of the cached value in seconds)
+    """
+    ttl = HEALTH_STATS_TTL if ttl is None else ttl
+    mode = "exact" if exact else "estimated"
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(mode)
+    if entry and entry[0] > now:
+        return entry[2], round(now - entry[1], 1)
+
+    with conn_factory() as conn:
+        counts = exact_row_counts(conn) if exact else estimated_row_counts(conn)
+
+    with _cache_lock:
+        _cache[mode] = (now + ttl, now, counts)
+    return counts, 0.0
+
+
+def clear_cache():
+    """Drop cached counts (e.g. after an ETL run)."""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,214 @@
+"""
+Geo Index Module
+
+In-memory spatial index over customer and seller locations for /geo/nearby.
+
+- Every customer and seller is placed at the geo_zip lat/lng of its zip prefix
+- Points are bucketed into a regular lat/lng grid (GEO_INDEX_CFG["cell_deg"])
+  and kept in NumPy arrays sorted by cell, so a radius query only computes
+  haversine distances for the cells overlapping the circle's bounding box
+- k-NN widens the search radius until k points are inside it
+- Built lazily on first use; rebuilt when older than GEO_INDEX_CFG["ttl"] or
+  after app.cache.invalidate() touches customers, sellers or geo_zip. If a
+  rebuild fails the previous index keeps serving
+"""
+
+import logging
+import math
+import threading
+import time
+
+import numpy as np
+
+from app.cache import on_invalidate
+from app.config import GEO_INDEX_CFG
+from app.db import db
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = math.pi * EARTH_RADIUS_KM / 180
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM  # half the circumference
+
+# kind: (id, zip prefix, lat, lng) for every located row
+SOURCE_SQL = {
+    "customers": """
+        SELECT c.customer_id, c.customer_zip_code_prefix, g.geolocation_lat, g.geolocation_lng
+        FROM customers c
+        JOIN geo_zip g ON g.geolocation_zip_code_prefix = c.customer_zip_code_prefix
+        WHERE g.geolocation_lat IS NOT NULL AND g.geolocation_lng IS NOT NULL
+    """,
+    "sellers": """
+        SELECT s.seller_id, s.seller_zip_code_prefix, g.geolocation_lat, g.geolocation_lng
+        FROM sellers s
+        JOIN geo_zip g ON g.geolocation_zip_code_prefix = s.seller_zip_code_prefix
+        WHERE g.geolocation_lat IS NOT NULL AND g.geolocation_lng IS NOT NULL
+    """,
+}
+SOURCE_TABLES = {"customers", "sellers", "geo_zip"}
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance in km between points in degrees; NumPy arrays broadcast."""
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GridIndex:
+    """Points bucketed by lat/lng grid cell; all arrays are sorted by cell key."""
+
+    def __init__(self, ids, zips, lat, lng, cell_deg=0.5):
+        lat = np.asarray(lat, dtype=np.float64)
+        lng = np.asarray(lng, dtype=np.float64)
+        self.cell_deg = cell_deg
+        self.n_cols = int(math.ceil(360 / cell_deg)) + 1
+        keys = self._row(lat) * self.n_cols + self._col(lng)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.ids = np.asarray(ids, dtype=object)[order]
+        self.zips = np.asarray(zips, dtype=np.int64)[order]
+        self.lat = lat[order]
+        self.lng = lng[order]
+        self.positions = {id_: i for i, id_ in enumerate(self.ids.tolist())}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _row(self, lat):
+        return np.floor((np.asarray(lat) + 90) / self.cell_deg).astype(np.int64)
+
+    def _col(self, lng):
+        return np.floor((np.asarray(lng) + 180) / self.cell_deg).astype(np.int64)
+
+    def locate(self, id_):
+        """(lat, lng) of a point, or None if unknown."""
+        i = self.positions.get(id_)
+        return None if i is None else (float(self.lat[i]), float(self.lng[i]))
+
+    def _candidates(self, lat, lng, radius_km):
+        """Positions of the points in cells overlapping the circle's bounding box."""
+        dlat = radius_km / KM_PER_DEG_LAT
+        lat_lo, lat_hi = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+        cos_lat = math.cos(math.radians(max(abs(lat_lo), abs(lat_hi))))
+        dlng = radius_km / (KM_PER_DEG_LAT * cos_lat) if cos_lat > 1e-9 else 360.0
+        if lng - dlng < -180 or lng + dlng > 180:
+            return np.arange(len(self.keys))  # wraps around the antimeridian/poles: scan all
+        rows = np.arange(self._row(lat_lo), self._row(lat_hi) + 1)
+        starts = np.searchsorted(self.keys, rows * self.n_cols + self._col(lng - dlng), "left")
+        ends = np.searchsorted(self.keys, rows * self.n_cols + self._col(lng + dlng), "right")
+        spans = [np.arange(s, e) for s, e in zip(starts, ends) if e > s]
+        return np.concatenate(spans) if spans else np.empty(0, dtype=np.int64)
+
+    def within(self, lat, lng, radius_km):
+        """(positions, distances) of all points within radius_km, nearest first."""
+        idx = self._candidates(lat, lng, radius_km)
+        dist = haversine_km(lat, lng, self.lat[idx], self.lng[idx])
+        keep = dist <= radius_km
+        idx, dist = idx[keep], dist[keep]
+        order = np.argsort(dist, kind="stable")
+        return idx[order], dist[order]
+
+    def nearest(self, lat, lng, k, exclude=None, start_km=25.0):
+        """(positions, distances) of the k nearest points, skipping the id ``exclude``."""
+        skip = self.positions.get(exclude)
+        want = k + (skip is not None)
+        radius = start_km
+        while True:
+            idx, dist = self.within(lat, lng, radius)
+            if len(idx) >= want or radius >= MAX_DISTANCE_KM:
+                break
+            radius *= 4
+        if skip is not None:
+            keep = idx != skip
+            idx, dist = idx[keep], dist[keep]
+        return idx[:k], dist[:k]
+
+    def items(self, idx, dist):
+        return [
+            {
+                "id": self.ids[i],
+                "zip_code_prefix": int(self.zips[i]),
+                "lat": float(self.lat[i]),
+                "lng": float(self.lng[i]),
+                "distance_km": round(float(d), 3),
+            }
+            for i, d in zip(idx.tolist(), dist.tolist())
+        ]
+
+
+class GeoIndex:
+    """One GridIndex per kind ("customers", "sellers")."""
+
+    def __init__(self, grids):
+        self.grids = grids
+        self.built_at = time.monotonic()
+
+    def __getitem__(self, kind):
+        return self.grids[kind]
+
+    def sizes(self):
+        return {kind: len(grid) for kind, grid in self.grids.items()}
+
+
+def build_index(conn, cell_deg=None):
+    """Read every located customer and seller and bucket them."""
+    cell_deg = cell_deg or GEO_INDEX_CFG["cell_deg"]
+    grids = {}
+    with conn.cursor() as cur:
+        for kind, sql in SOURCE_SQL.items():
+            cur.execute(sql)
+            rows = cur.fetchall()
+            grids[kind] = GridIndex(
+                [r[0] for r in rows],
+                [r[1] for r in rows],
+                np.array([r[2] for r in rows], dtype=np.float64),
+                np.array([r[3] for r in rows], dtype=np.float64),
+                cell_deg,
+            )
+    return GeoIndex(grids)
+
+
+_index = None
+_stale = False
+_lock = threading.Lock()
+
+
+def _expired(index):
+    return _stale or time.monotonic() - index.built_at > GEO_INDEX_CFG["ttl"]
+
+
+def get_index():
+    """Current GeoIndex, (re)built from the database when missing or stale."""
+    global _index, _stale
+    index = _index
+    if index is not None and not _expired(index):
+        return index
+    with _lock:
+        if _index is not None and not _expired(_index):
+            return _index
+        started = time.perf_counter()
+        try:
+            with db.get_conn() as conn:
+                fresh = build_index(conn)
+        except Exception as e:
+            if _index is None:
+                raise
+            logger.warning(f"Geo index rebuild failed ({e}); serving the previous index")
+            _index.built_at, _stale = time.monotonic(), False  # retry after another ttl
+            return _index
+        _index, _stale = fresh, False
+        logger.info(f"Geo index built in {time.perf_counter() - started:.2f}s: {fresh.sizes()}")
+        return fresh
+
+
+def mark_stale():
+    """Rebuild the index on its next use."""
+    global _stale
+    _stale = True
+
+
+@on_invalidate
+def _on_cache_invalidate(tables):
+    if tables is None or SOURCE_TABLES & set(tables):
+        mark_stale()
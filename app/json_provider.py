@@ -0,0 +1,109 @@
+"""
+JSON Provider Module
+
+Flask JSON provider selected with JSON_PROVIDER (app/config.py):
+
+- orjson (default): serializes in C. datetime/date/time, UUID and tuples
+  (row tuples become arrays) are native; Decimal is converted in the
+  default hook
+- stdlib: Flask's json-module provider with the same conversions, used
+  when orjson is not installed
+
+Both write Decimal as a JSON number and datetime/date as ISO 8601, so
+routes can return DB values without converting them field by field and the
+output does not depend on the provider. Keys are sorted, like Flask's
+default provider.
+
+Usage:
+    app.json = make_provider(app)              # create_app()
+    return jsonify_rows(columns, cur.fetchall())  # [{col: value, ...}, ...]
+"""
+
+import logging
+from datetime import date, datetime, time
+from decimal import Decimal
+from itertools import repeat
+
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+from app.config import JSON_PROVIDER
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib provider below
+    orjson = None
+
+
+def _default(value):
+    """Types neither encoder handles natively."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's provider, with Decimal as a number and dates as ISO 8601."""
+
+    default = staticmethod(_default)
+
+
+class OrjsonProvider(JSONProvider):
+    """orjson-backed provider; ``response()`` writes bytes without a str round trip."""
+
+    sort_keys = True
+    mimetype = "application/json"
+
+    def _option(self):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self._app.debug:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps_bytes(self, obj):
+        return orjson.dumps(obj, default=_default, option=self._option())
+
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
+
+
+def make_provider(app):
+    """Provider instance for ``app`` as configured by JSON_PROVIDER."""
+    if JSON_PROVIDER == "orjson":
+        if orjson is not None:
+            return OrjsonProvider(app)
+        logger.warning("orjson not installed; using the stdlib JSON provider. Run: pip install orjson")
+    elif JSON_PROVIDER != "stdlib":
+        raise ValueError(f"Unknown JSON_PROVIDER: {JSON_PROVIDER!r} (expected orjson or stdlib)")
+    return StdlibJSONProvider(app)
+
+
+def row_dicts(columns, rows):
+    """Cursor rows as dicts keyed by ``columns`` (zip/dict run in C, no per-row Python code)."""
+    return list(map(dict, map(zip, repeat(columns), rows)))
+
+
+def jsonify_rows(columns, rows):
+    """JSON array response of objects built straight from cursor rows."""
+    return current_app.json.response(row_dicts(columns, rows))
+
+
+def dumps_line(obj):
+    """One compact JSON document plus newline, as bytes (NDJSON); usable outside an app context."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    import json
+    return (json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
@@ -0,0 +1,85 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the sort key of the last row of
+a page, e.g. (order_purchase_timestamp, order_id). The next page is fetched
+with a WHERE (key columns) < / > (cursor values) predicate on the same ORDER BY,
+which an index on those columns can seek to directly, so page 1000 costs the
+same as page 1.
+
+The next cursor is returned in the X-Next-Cursor response header (plus an RFC
+8288 Link header) so endpoints that return plain JSON arrays keep their shape.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from urllib.parse import urlencode
+
+from flask import request
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(values):
+    """Encode a tuple of sort-key values as an opaque token."""
+    raw = json.dumps(list(values), default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token, size):
+    """
+    Decode a token produced by encode_cursor().
+
+    Raises:
+        ValueError: If the token is malformed or does not hold ``size`` values
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError("cursor is not a valid pagination token") from e
+    if (not isinstance(values, list) or len(values) != size
+            or not all(isinstance(v, (str, int, float)) and not isinstance(v, bool) for v in values)):
+        raise ValueError("cursor is not a valid pagination token")
+    return values
+
+
+def next_cursor(rows, limit, key):
+    """
+    Cursor for the page after ``rows``, or None if this was the last page.
+
+    Args:
+        rows: Rows of the current page (as fetched)
+        limit: Page size that was requested
+        key: Function mapping a row to its sort-key tuple
+    """
+    if len(rows) < limit:
+        return None
+    values = key(rows[-1])
+    if any(v is None for v in values):
+        # NULL sort keys cannot be compared against; stop paginating.
+        return None
+    return encode_cursor(values)
+
+
+def with_next_cursor(response, cursor):
+    """Attach X-Next-Cursor / Link headers to a (response, status) or response."""
+    if cursor is None:
+        return response
+    resp = response[0] if isinstance(response, tuple) else response
+    resp.headers["X-Next-Cursor"] = cursor
+    args = request.args.to_dict(flat=True)
+    args["cursor"] = cursor
+    resp.headers["Link"] = f'<{request.path}?{urlencode(args)}>; rel="next"'
+    return response
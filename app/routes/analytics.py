@@ -1,68 +1,137 @@
 from flask import Blueprint, jsonify, request
-from app.db import db
+from app.db import db, dialect
+from app.cache import cached
+from app.data_version import conditional
+from app.json_provider import row_dicts
 import logging
-from decimal import Decimal
 
 logger = logging.getLogger(__name__)
 
 bp_analytics = Blueprint("analytics", __name__)
 
 
-def _decimal_to_float(obj):
-    """Convert Decimal objects to float for JSON serialization."""
-    if isinstance(obj, Decimal):
-        return float(obj)
-    raise TypeError
-
-
 def _query_all(sql, params=None):
-    """Execute query and return list of dicts."""
+    """Execute query and return list of dicts (Decimal values are encoded by the app's JSON provider)."""
     with db.get_conn() as conn:
         with conn.cursor() as cur:
             if params:
                 cur.execute(sql, params)
             else:
                 cur.execute(sql)
-            cols = [d[0] for d in cur.description]
-            rows = cur.fetchall()
-            return [dict(zip(cols, row)) for row in rows]
+            return row_dicts([d[0] for d in cur.description], cur.fetchall())
+
+
+def _query_rollup(rollup_sql, live_sql, params):
+    """
+    Read a top-N from a precomputed rollup table (db/etl/refresh_rollups.py).
+    Falls back to the live aggregate if the rollup table is missing or has
+    never been refreshed. Returns (rows, source).
+    """
+    try:
+        results = _query_all(rollup_sql, params)
+        if results:
+            return results, "rollup"
+        logger.warning("Rollup table empty, run db/etl/refresh_rollups.py; using live aggregate")
+    except Exception as e:
+        logger.warning(f"Rollup table unavailable ({e}); using live aggregate")
+    return _query_all(live_sql, params), "live"
+
+
+def revenue_by_category_sql():
+    """(rollup read, live aggregate) for /analytics/revenue-by-category; params: (limit,)"""
+    rollup_sql = f"""
+    SELECT
+        category_name,
+        items_sold,
+        distinct_orders,
+        {dialect.round_to('revenue_sum', 2)} AS total_revenue,
+        {dialect.round_to('price_sum / NULLIF(price_count, 0)', 2)} AS avg_item_price
+    FROM analytics_category_rollup
+    ORDER BY revenue_sum DESC
+    LIMIT %s
+    """
+
+    # Multi-table join with aggregations
+    sql = f"""
+    SELECT
+        COALESCE(p.product_category_name, 'Unknown') AS category_name,
+        COUNT(*) AS items_sold,
+        COUNT(DISTINCT oi.order_id) AS distinct_orders,
+        {dialect.round_to('SUM(oi.price + oi.freight_value)', 2)} AS total_revenue,
+        {dialect.round_to('AVG(oi.price)', 2)} AS avg_item_price
+    FROM order_items oi
+    JOIN products p ON p.product_id = oi.product_id
+    JOIN orders o ON o.order_id = oi.order_id
+    WHERE o.order_status = 'delivered'
+    GROUP BY p.product_category_name
+    ORDER BY total_revenue DESC
+    LIMIT %s
+    """
+    return rollup_sql, sql
+
+
+def top_sellers_sql():
+    """(rollup read, live aggregate) for /analytics/top-sellers; params: (limit,)"""
+    rollup_sql = f"""
+    SELECT
+        seller_id,
+        seller_city,
+        seller_state,
+        distinct_orders AS order_count,
+        items_sold,
+        {dialect.round_to('revenue_sum', 2)} AS total_revenue,
+        {dialect.round_to('price_sum / NULLIF(price_count, 0)', 2)} AS avg_item_price
+    FROM analytics_seller_rollup
+    ORDER BY revenue_sum DESC
+    LIMIT %s
+    """
+
+    sql = f"""
+    SELECT
+        s.seller_id,
+        s.seller_city,
+        s.seller_state,
+        COUNT(DISTINCT oi.order_id) AS order_count,
+        COUNT(*) AS items_sold,
+        {dialect.round_to('SUM(oi.price + oi.freight_value)', 2)} AS total_revenue,
+        {dialect.round_to('AVG(oi.price)', 2)} AS avg_item_price
+    FROM order_items oi
+    JOIN sellers s ON s.seller_id = oi.seller_id
+    JOIN orders o ON o.order_id = oi.order_id
+    WHERE o.order_status = 'delivered'
+    GROUP BY s.seller_id, s.seller_city, s.seller_state
+    ORDER BY total_revenue DESC
+    LIMIT %s
+    """
+    return rollup_sql, sql
 
 
 @bp_analytics.get("/analytics/revenue-by-category")
+@conditional(tables=("analytics_category_rollup", "order_items", "products", "orders"))
+@cached(tables=("analytics_category_rollup", "order_items", "products", "orders"))
 def revenue_by_category():
     """
     Complex query: Multi-table join + group by + order by
     
     Joins: order_items + products + orders + categories (if available)
     Computes: total_revenue, items_sold, distinct_orders per category
+    
+    Served from analytics_category_rollup (indexed top-N read); the live
+    aggregate below is only used when the rollup has not been built.
     """
     try:
         limit = request.args.get("limit", 10, type=int)
         if limit < 1 or limit > 100:
             return jsonify({"ok": False, "error": "limit must be between 1 and 100"}), 400
         
-        # Multi-table join with aggregations
-        sql = """
-        SELECT
-            COALESCE(p.product_category_name, 'Unknown') AS category_name,
-            COUNT(*) AS items_sold,
-            COUNT(DISTINCT oi.order_id) AS distinct_orders,
-            ROUND(SUM(oi.price + oi.freight_value), 2) AS total_revenue,
-            ROUND(AVG(oi.price), 2) AS avg_item_price
-        FROM order_items oi
-        JOIN products p ON p.product_id = oi.product_id
-        JOIN orders o ON o.order_id = oi.order_id
-        WHERE o.order_status = 'delivered'
-        GROUP BY p.product_category_name
-        ORDER BY total_revenue DESC
-        LIMIT %s
-        """
+        rollup_sql, sql = revenue_by_category_sql()
         
-        results = _query_all(sql, (limit,))
+        results, source = _query_rollup(rollup_sql, sql, (limit,))
         
         return jsonify({
             "ok": True,
             "params": {"limit": limit},
+            "source": source,
             "data": results
         }), 200
         
@@ -72,41 +141,31 @@ def revenue_by_category():
 
 
 @bp_analytics.get("/analytics/top-sellers")
+@conditional(tables=("analytics_seller_rollup", "order_items", "sellers", "orders"))
+@cached(tables=("analytics_seller_rollup", "order_items", "sellers", "orders"))
 def top_sellers():
     """
     Complex query: Join + group by + distinct + sorting
     
     Joins: order_items + sellers + orders
     Computes: total_revenue, order_count, avg_item_price per seller
+    
+    Served from analytics_seller_rollup (indexed top-N read); the live
+    aggregate below is only used when the rollup has not been built.
     """
     try:
         limit = request.args.get("limit", 10, type=int)
         if limit < 1 or limit > 100:
             return jsonify({"ok": False, "error": "limit must be between 1 and 100"}), 400
         
-        sql = """
-        SELECT
-            s.seller_id,
-            s.seller_city,
-            s.seller_state,
-            COUNT(DISTINCT oi.order_id) AS order_count,
-            COUNT(*) AS items_sold,
-            ROUND(SUM(oi.price + oi.freight_value), 2) AS total_revenue,
-            ROUND(AVG(oi.price), 2) AS avg_item_price
-        FROM order_items oi
-        JOIN sellers s ON s.seller_id = oi.seller_id
-        JOIN orders o ON o.order_id = oi.order_id
-        WHERE o.order_status = 'delivered'
-        GROUP BY s.seller_id, s.seller_city, s.seller_state
-        ORDER BY total_revenue DESC
-        LIMIT %s
-        """
+        rollup_sql, sql = top_sellers_sql()
         
-        results = _query_all(sql, (limit,))
+        results, source = _query_rollup(rollup_sql, sql, (limit,))
         
         return jsonify({
             "ok": True,
             "params": {"limit": limit},
+            "source": source,
             "data": results
         }), 200
         
@@ -116,10 +175,14 @@ def top_sellers():
 
 
 @bp_analytics.get("/analytics/review-vs-delivery")
+@conditional(tables=("order_items", "sellers", "orders", "order_reviews"))
+@cached(tables=("order_items", "sellers", "orders", "order_reviews"))
 def review_vs_delivery():
     """
     Complex query: Subquery/aggregation + derived metrics + HAVING clause
     
+    Date arithmetic and rounding come from app/db/dialect.py (MySQL and PostgreSQL).
+    
     Computes per seller:
     - avg_review_score
     - avg_delivery_days (delivered - purchase)
@@ -130,14 +193,15 @@ def review_vs_delivery():
         if min_reviews < 1 or min_reviews > 1000:
             return jsonify({"ok": False, "error": "min_reviews must be between 1 and 1000"}), 400
         
-        sql = """
+        delivery_days = dialect.days_between("o.order_purchase_timestamp", "o.order_delivered_customer_date")
+        sql = f"""
         SELECT
             s.seller_id,
             s.seller_city,
             s.seller_state,
             COUNT(DISTINCT r.review_id) AS review_count,
-            ROUND(AVG(r.review_score), 2) AS avg_review_score,
-            ROUND(AVG(TIMESTAMPDIFF(DAY, o.order_purchase_timestamp, o.order_delivered_customer_date)), 1) AS avg_delivery_days
+            {dialect.round_to('AVG(r.review_score)', 2)} AS avg_review_score,
+            {dialect.round_to(f"AVG({delivery_days})", 1)} AS avg_delivery_days
         FROM order_items oi
         JOIN sellers s ON s.seller_id = oi.seller_id
         JOIN orders o ON o.order_id = oi.order_id
@@ -163,7 +227,54 @@ def review_vs_delivery():
         return jsonify({"ok": False, "error": str(e)}), 503
 
 
+@bp_analytics.get("/analytics/distance-vs-delivery")
+@conditional(tables=("analytics_distance_delivery",))
+@cached(tables=("analytics_distance_delivery",))
+def distance_vs_delivery():
+    """
+    Seller -> customer shipping distance vs. delivery time and freight
+    
+    Reads analytics_distance_delivery, precomputed by
+    db/etl/refresh_distance_stats.py (haversine over geo_zip coordinates,
+    vectorized with NumPy). One row per distance bucket, averages per
+    delivered order item.
+    """
+    try:
+        sql = """
+        SELECT
+            bucket_no,
+            min_km,
+            max_km,
+            items,
+            avg_distance_km,
+            avg_delivery_days,
+            avg_freight_value,
+            refreshed_at
+        FROM analytics_distance_delivery
+        ORDER BY bucket_no
+        """
+        
+        results = _query_all(sql)
+        if not results:
+            return jsonify({
+                "ok": False,
+                "error": "distance stats not computed yet, run db/etl/refresh_distance_stats.py"
+            }), 503
+        
+        return jsonify({
+            "ok": True,
+            "params": {},
+            "data": results
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error in distance-vs-delivery: {e}")
+        return jsonify({"ok": False, "error": str(e)}), 503
+
+
 @bp_analytics.get("/analytics/order-funnel")
+@conditional(tables=("orders",))
+@cached(tables=("orders",))
 def order_funnel():
     """
     Complex query: Conditional aggregation
@@ -171,12 +282,14 @@ def order_funnel():
     Returns counts of orders by status and avg durations between milestones
     """
     try:
-        sql = """
+        delivery_days = dialect.days_between("order_purchase_timestamp", "order_delivered_customer_date")
+        approval_days = dialect.days_between("order_purchase_timestamp", "order_approved_at")
+        sql = f"""
         SELECT
             order_status,
             COUNT(*) AS order_count,
-            ROUND(AVG(TIMESTAMPDIFF(DAY, order_purchase_timestamp, order_delivered_customer_date)), 1) AS avg_delivery_days,
-            ROUND(AVG(TIMESTAMPDIFF(DAY, order_purchase_timestamp, order_approved_at)), 1) AS avg_approval_days
+            {dialect.round_to(f"AVG({delivery_days})", 1)} AS avg_delivery_days,
+            {dialect.round_to(f"AVG({approval_days})", 1)} AS avg_approval_days
         FROM orders
         GROUP BY order_status
         ORDER BY order_count DESC
@@ -0,0 +1,47 @@
+from flask import Blueprint, request, jsonify
+from app.cache import response_cache, invalidate
+from app.config import RESPONSE_CACHE_CFG
+import logging
+
+logger = logging.getLogger(__name__)
+
+bp_cache = Blueprint("cache", __name__, url_prefix="/cache")
+
+
+@bp_cache.get("/stats")
+def cache_stats():
+    """
+    Response cache hit/miss counters per endpoint.
+    GET /cache/stats
+    """
+    return jsonify(response_cache.snapshot()), 200
+
+
+@bp_cache.post("/invalidate")
+def cache_invalidate():
+    """
+    Invalidation hook for ETL loaders.
+    POST /cache/invalidate  {"tables": ["orders", "order_items"]}
+    
+    Without tables the whole cache is cleared. Requires the X-Cache-Token
+    header when CACHE_ADMIN_TOKEN is set, otherwise only localhost may call it.
+    """
+    token = RESPONSE_CACHE_CFG.get("admin_token")
+    if token:
+        if request.headers.get("X-Cache-Token") != token:
+            return jsonify({"error": "invalid cache token"}), 403
+    elif request.remote_addr not in ("127.0.0.1", "::1"):
+        return jsonify({"error": "cache invalidation only allowed from localhost"}), 403
+    
+    payload = request.get_json(silent=True) or {}
+    if not isinstance(payload, dict):
+        return jsonify({"error": "body must be a JSON object"}), 400
+    tables = payload.get("tables")
+    if tables is None:
+        tables = request.args.getlist("table")
+    # A bare string would pass a per-item check character by character.
+    if not isinstance(tables, list) or not all(isinstance(t, str) and t for t in tables):
+        return jsonify({"error": "tables must be a list of table names"}), 400
+    
+    removed = invalidate(tables=tables or None)
+    return jsonify({"ok": True, "tables": tables, "removed": removed}), 200
@@ -1,5 +1,9 @@
 from flask import Blueprint, request, jsonify, render_template, redirect, url_for, flash
 from app.db import db
+from app.cache import cached, invalidate
+from app.data_version import conditional
+from app import customer_geo, data_version, geo_index
+from app.pagination import decode_cursor, next_cursor, with_next_cursor
 from psycopg import OperationalError
 import logging
 
@@ -11,7 +15,13 @@ bp_geo = Blueprint("geo", __name__)
 
 @bp_customers.get("/customers/by-state/<string:state>")
 def customers_by_state(state):
-    """Get customers by state code with optional limit."""
+    """
+    Get customers by state code with optional limit.
+    GET /customers/by-state/SP?limit=10&cursor=<X-Next-Cursor of the previous page>
+    
+    Keyset pagination on (COALESCE(customer_city, ''), customer_id): customers
+    without a city sort first on both vendors and are paged like the rest.
+    """
     limit_str = request.args.get("limit", "10")
     
     # Validate state
@@ -29,21 +39,38 @@ def customers_by_state(state):
     except ValueError:
         return jsonify({"error": "limit must be a valid integer"}), 400
     
+    after = None
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            after = decode_cursor(cursor, 2)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+    
     try:
         sql = """
         SELECT 
             customer_id,
             customer_city,
-            customer_state
+            customer_state,
+            COALESCE(customer_city, '') AS city_key
         FROM customers
-        WHERE UPPER(customer_state) = UPPER(%s)
-        ORDER BY customer_city
-        LIMIT %s
+        WHERE customer_state = %s
         """
+        # States are stored upper-case (normalized on write), so the plain
+        # comparison can use idx_customers__state_city_key_id. NULL cities are
+        # keyed as '': a NULL in the row comparison would never match and
+        # NULLs sort differently on PostgreSQL and MySQL.
+        params = [state.strip().upper()]
+        if after:
+            sql += " AND (COALESCE(customer_city, ''), customer_id) > (%s, %s)"
+            params.extend(after)
+        sql += " ORDER BY COALESCE(customer_city, ''), customer_id LIMIT %s"
+        params.append(limit)
         
         with db.get_conn() as conn:
             with conn.cursor() as cur:
-                cur.execute(sql, (state, limit))
+                cur.execute(sql, params)
                 rows = cur.fetchall()
         
         customers = [
@@ -55,7 +82,10 @@ def customers_by_state(state):
             for row in rows
         ]
         
-        return jsonify(customers), 200
+        return with_next_cursor(
+            (jsonify(customers), 200),
+            next_cursor(rows, limit, key=lambda r: (r[3], r[0]))
+        )
     
     except Exception as e:
         logger.error(f"Error fetching customers by state: {e}")
@@ -83,6 +113,8 @@ def get_top_cities(limit: int = 5):
 
 
 @bp_customers.get("/customers/top-cities")
+@conditional(tables=("customers",))
+@cached(tables=("customers",))
 def customers_top_cities():
     limit = request.args.get("limit", default=5, type=int)
 
@@ -96,9 +128,36 @@ def customers_top_cities():
         return jsonify({"error": "database not available (top-cities)"}), 503
 
 
+def _query_all(sql, params):
+    with db.get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            cols = [d[0] for d in cur.description]
+            rows = cur.fetchall()
+    return [dict(zip(cols, row)) for row in rows]
+
+
+def _query_projection(projection_sql, live_sql, params):
+    """
+    Read from the customer_geo projection (db/ddl/080_customer_geo.sql).
+    Falls back to the live customers/geo_zip join only if the projection is
+    unavailable: the query fails, or customer_geo_state_counts is empty
+    (never built). An empty result from a built projection is the answer.
+    Returns (rows, source).
+    """
+    try:
+        results = _query_all(projection_sql, params)
+        if results or _query_all("SELECT 1 AS built FROM customer_geo_state_counts LIMIT 1", ()):
+            return results, "projection"
+        logger.warning("customer_geo projection not built; using live join")
+    except Exception as e:
+        logger.warning(f"customer_geo projection unavailable ({e}); using live join")
+    return _query_all(live_sql, params), "live"
+
+
 @bp_customers.get("/customers/by-city")
 def customers_by_city():
-    """Get customers by state and city from geo_zip table."""
+    """Get customers by state and city (customer_geo projection, live geo_zip join as fallback)."""
     state = request.args.get("state")
     city = request.args.get("city")
     limit = request.args.get("limit", default=10, type=int)
@@ -123,7 +182,19 @@ def customers_by_city():
     if limit < 1 or limit > 50:
         return jsonify({"error": "limit must be between 1 and 50"}), 422
     
-    # SQL query: join customers with geo_zip
+    # Denormalized projection: index seek on (state, city)
+    projection_sql = """
+    SELECT
+        customer_id,
+        city,
+        state
+    FROM customer_geo
+    WHERE state = %s
+      AND city = %s
+    LIMIT %s
+    """
+    
+    # Live join, used until db/etl/refresh_rollups.py --customer-geo has run
     sql = """
     SELECT
         c.customer_id,
@@ -138,13 +209,7 @@ def customers_by_city():
     """
     
     try:
-        with db.get_conn() as conn:
-            with conn.cursor() as cur:
-                cur.execute(sql, (state, city, limit))
-                cols = [d[0] for d in cur.description]
-                rows = cur.fetchall()
-        
-        result = [dict(zip(cols, row)) for row in rows]
+        result, _ = _query_projection(projection_sql, sql, (state, city, limit))
         return jsonify(result)
     except OperationalError as e:
         return jsonify({"error": "database not available (by-city)"}), 503
@@ -153,6 +218,8 @@ def customers_by_city():
 
 
 @bp_geo.get("/geo/top-states")
+@conditional(tables=("customers", "geo_zip", "customer_geo_state_counts"))
+@cached(tables=("customers", "geo_zip", "customer_geo_state_counts"))
 def geo_top_states():
     """Get top states by customer count."""
     limit = request.args.get("limit", default=10, type=int)
@@ -161,6 +228,16 @@ def geo_top_states():
     if limit < 1 or limit > 27:
         return jsonify({"error": "limit must be between 1 and 27"}), 422
     
+    # Precomputed per-state counts (27 rows)
+    projection_sql = """
+    SELECT
+        state,
+        customer_count
+    FROM customer_geo_state_counts
+    ORDER BY customer_count DESC
+    LIMIT %s
+    """
+    
     # SQL query: join customers with geo_zip and group by state
     sql = """
     SELECT
@@ -175,20 +252,82 @@ def geo_top_states():
     """
     
     try:
-        with db.get_conn() as conn:
-            with conn.cursor() as cur:
-                cur.execute(sql, (limit,))
-                cols = [d[0] for d in cur.description]
-                rows = cur.fetchall()
-        
-        result = [dict(zip(cols, row)) for row in rows]
-        return jsonify({"items": result})
+        result, source = _query_projection(projection_sql, sql, (limit,))
+        return jsonify({"items": result, "source": source})
     except OperationalError as e:
         return jsonify({"error": "database not available (top-states)"}), 503
     except Exception as e:
         return jsonify({"error": f"database error: {str(e)}"}), 503
 
 
+@bp_geo.get("/geo/nearby")
+def geo_nearby():
+    """
+    Customers or sellers near a point, from the in-memory geo index (app/geo_index.py).
+    GET /geo/nearby?lat=-23.55&lng=-46.63&radius_km=10&kind=customers&limit=100
+    GET /geo/nearby?customer_id=<id>&kind=sellers&k=5
+
+    The center is lat/lng or the location of customer_id / seller_id.
+    With radius_km every point inside the circle is counted and the nearest
+    ``limit`` are returned; otherwise the ``k`` nearest points.
+    """
+    kind = request.args.get("kind", "sellers")
+    if kind not in ("customers", "sellers"):
+        return jsonify({"error": "kind must be 'customers' or 'sellers'"}), 422
+    
+    lat = request.args.get("lat", type=float)
+    lng = request.args.get("lng", type=float)
+    if request.args.get("customer_id") and request.args.get("seller_id"):
+        return jsonify({"error": "Provide either customer_id or seller_id, not both"}), 400
+    center_kind, center_id = None, None
+    for id_kind, param in (("customers", "customer_id"), ("sellers", "seller_id")):
+        if request.args.get(param):
+            center_kind, center_id = id_kind, request.args.get(param).strip()
+    if center_id is None:
+        if lat is None or lng is None:
+            return jsonify({"error": "Provide lat and lng, customer_id or seller_id"}), 400
+        if not (-90 <= lat <= 90) or not (-180 <= lng <= 180):
+            return jsonify({"error": "lat must be in [-90, 90] and lng in [-180, 180]"}), 422
+    
+    radius_km = request.args.get("radius_km", type=float)
+    if radius_km is not None and not (0 < radius_km <= 1000):
+        return jsonify({"error": "radius_km must be between 0 and 1000"}), 422
+    limit = request.args.get("limit", default=100, type=int)
+    if limit < 1 or limit > 500:
+        return jsonify({"error": "limit must be between 1 and 500"}), 422
+    k = request.args.get("k", default=10, type=int)
+    if k < 1 or k > 100:
+        return jsonify({"error": "k must be between 1 and 100"}), 422
+    
+    try:
+        index = geo_index.get_index()
+    except OperationalError:
+        return jsonify({"error": "database not available (nearby)"}), 503
+    except Exception as e:
+        logger.error(f"Error building geo index: {e}")
+        return jsonify({"error": f"database error: {str(e)}"}), 503
+    
+    if center_id is not None:
+        location = index[center_kind].locate(center_id)
+        if location is None:
+            return jsonify({"error": f"{center_kind[:-1]} '{center_id}' not found or has no geo location"}), 404
+        lat, lng = location
+    
+    grid = index[kind]
+    exclude = center_id if center_kind == kind else None
+    response = {"kind": kind, "center": {"lat": lat, "lng": lng}}
+    if radius_km is not None:
+        idx, dist = grid.within(lat, lng, radius_km)
+        if exclude is not None:
+            keep = idx != grid.positions.get(exclude, -1)
+            idx, dist = idx[keep], dist[keep]
+        response.update(radius_km=radius_km, count=len(idx), items=grid.items(idx[:limit], dist[:limit]))
+    else:
+        idx, dist = grid.nearest(lat, lng, k, exclude=exclude)
+        response.update(k=k, items=grid.items(idx, dist))
+    return jsonify(response)
+
+
 @bp_customers.get("/customers/ui")
 def customers_ui():
     """Render customers list UI page with raw SQL query."""
@@ -235,7 +374,7 @@ def customers_create_post():
     customer_unique_id = request.form.get("customer_unique_id", "").strip()
     customer_zip_code_prefix = request.form.get("customer_zip_code_prefix", "").strip()
     customer_city = request.form.get("customer_city", "").strip()
-    customer_state = request.form.get("customer_state", "").strip()
+    customer_state = request.form.get("customer_state", "").strip().upper()
     
     # Validate required fields
     if not customer_id or not customer_unique_id:
@@ -260,8 +399,12 @@ def customers_create_post():
         
         with db.get_conn() as conn:
             with conn.cursor() as cur:
+                customer_geo.begin(cur)
                 cur.execute(sql, (customer_id, customer_unique_id, zip_code, customer_city or None, customer_state or None))
+                customer_geo.add_customer(cur, customer_id)
+                data_version.bump(cur, ("customers",) + customer_geo.TABLES)
                 conn.commit()
+        invalidate(tables=("customers",))
         
         return redirect(url_for("customers.customers_ui"))
     
@@ -308,7 +451,7 @@ def customers_edit_post(customer_id):
     customer_unique_id = request.form.get("customer_unique_id", "").strip()
     customer_zip_code_prefix = request.form.get("customer_zip_code_prefix", "").strip()
     customer_city = request.form.get("customer_city", "").strip()
-    customer_state = request.form.get("customer_state", "").strip()
+    customer_state = request.form.get("customer_state", "").strip().upper()
     
     # Validate required fields
     if not customer_unique_id:
@@ -339,12 +482,19 @@ def customers_edit_post(customer_id):
         
         with db.get_conn() as conn:
             with conn.cursor() as cur:
+                customer_geo.begin(cur)
                 cur.execute(sql, (customer_unique_id, zip_code, customer_city or None, customer_state or None, customer_id))
                 if cur.rowcount == 0:
+                    conn.rollback()
                     return render_template("customers/edit.html",
                                          customer={"customer_id": customer_id},
                                          error=f"Customer with ID '{customer_id}' not found."), 404
+                # Zip may have changed: move the customer between state counts
+                customer_geo.remove_customer(cur, customer_id)
+                customer_geo.add_customer(cur, customer_id)
+                data_version.bump(cur, ("customers",) + customer_geo.TABLES)
                 conn.commit()
+        invalidate(tables=("customers",))
         
         return redirect(url_for("customers.customers_ui"))
     
@@ -365,8 +515,12 @@ def customers_delete(customer_id):
         
         with db.get_conn() as conn:
             with conn.cursor() as cur:
+                customer_geo.begin(cur)
+                customer_geo.remove_customer(cur, customer_id)
                 cur.execute(sql, (customer_id,))
+                data_version.bump(cur, ("customers",) + customer_geo.TABLES)
                 conn.commit()
+        invalidate(tables=("customers",))
         
         return redirect(url_for("customers.customers_ui"))
     
@@ -0,0 +1,124 @@
+from flask import Blueprint, jsonify
+from app.db import dialect
+from app.db.fanout import fetch_all
+from app.cache import cached
+from app.data_version import conditional
+from app.routes.orders.routes import ORDER_STATS_SQL
+from app.routes.products import PRODUCT_STATS_SQL
+import logging
+
+logger = logging.getLogger(__name__)
+
+bp_dashboard = Blueprint("dashboard", __name__, url_prefix="/dashboard")
+
+
+def _payments_sql():
+    # One scan: a row per payment_type plus the ROLLUP grand total (is_total = 1)
+    return f"""
+    SELECT
+        payment_type,
+        GROUPING(payment_type) AS is_total,
+        COUNT(*) AS count,
+        SUM(payment_value) AS total,
+        AVG(payment_value) AS avg_value
+    FROM order_payments
+    {dialect.group_by_rollup("payment_type")}
+    """
+
+
+def _reviews_sql():
+    # One scan: a row per review_score plus the ROLLUP grand total (is_total = 1)
+    return f"""
+    SELECT
+        review_score,
+        GROUPING(review_score) AS is_total,
+        COUNT(*) AS count,
+        AVG(review_score) AS avg_score
+    FROM order_reviews
+    {dialect.group_by_rollup("review_score")}
+    """
+
+
+def _float(value):
+    return float(value) if value else 0.0
+
+
+def _split_rollup(rows):
+    """(grand total row or None, per-group rows) of a ROLLUP result."""
+    total = next((r for r in rows if r[1]), None)
+    return total, [r for r in rows if not r[1]]
+
+
+def _shape_orders(rows):
+    row = rows[0] if rows else (0, 0, None)
+    return {
+        "total_orders": int(row[0] or 0),
+        "total_items": int(row[1] or 0),
+        "avg_items_per_order": _float(row[2]),
+    }
+
+
+def _shape_products(rows):
+    row = rows[0] if rows else (0, 0)
+    return {
+        "total_products": int(row[0] or 0),
+        "total_categories": int(row[1] or 0),
+    }
+
+
+def _shape_payments(rows):
+    total, groups = _split_rollup(rows)
+    groups.sort(key=lambda r: r[2], reverse=True)
+    return {
+        "total_payments": int(total[2]) if total else 0,
+        "total_value": _float(total[3]) if total else 0.0,
+        "avg_payment_value": _float(total[4]) if total else 0.0,
+        "payment_types": [
+            {"type": r[0], "count": int(r[2]), "total": _float(r[3])}
+            for r in groups
+        ],
+    }
+
+
+def _shape_reviews(rows):
+    total, groups = _split_rollup(rows)
+    return {
+        "total_reviews": int(total[2]) if total else 0,
+        "avg_score": _float(total[3]) if total else 0.0,
+        "score_distribution": [
+            {"score": int(r[0]), "count": int(r[2])}
+            for r in sorted((r for r in groups if r[0] is not None), key=lambda r: r[0])
+        ],
+    }
+
+
+# section: (SQL builder, shape(rows) -> dict); shared with the async entry point (app/asgi.py)
+SECTIONS = {
+    "orders": (lambda: ORDER_STATS_SQL, _shape_orders),
+    "products": (lambda: PRODUCT_STATS_SQL, _shape_products),
+    "payments": (_payments_sql, _shape_payments),
+    "reviews": (_reviews_sql, _shape_reviews),
+}
+
+
+@bp_dashboard.get("/summary")
+@conditional(tables=("orders", "order_items", "products", "order_payments", "order_reviews"))
+@cached(tables=("orders", "order_items", "products", "order_payments", "order_reviews"))
+def dashboard_summary():
+    """
+    All dashboard KPIs in one response.
+    GET /dashboard/summary
+
+    Same numbers as /orders/stats, /products/stats, /payments/stats and
+    /reviews/stats, from one aggregate query per table, run in parallel
+    (app/db/fanout.py): payment-type and review-score breakdowns share a
+    scan with their totals through GROUP BY ROLLUP. Cached as a single entry.
+    """
+    try:
+        rows = fetch_all({name: (build_sql(), None) for name, (build_sql, _) in SECTIONS.items()})
+        summary = {name: shape(rows[name]) for name, (_, shape) in SECTIONS.items()}
+        return jsonify(summary), 200
+    
+    except Exception as e:
+        logger.error(f"Error fetching dashboard summary: {e}")
+        return jsonify({"error": "Failed to fetch dashboard summary"}), 503
@@ -0,0 +1,143 @@
+from flask import Blueprint, Response, request, jsonify
+from app.db import db
+from app.config import DB_CFG
+from app.json_provider import dumps_line, row_dicts
+import csv
+import io
+import logging
+
+logger = logging.getLogger(__name__)
+
+bp_export = Blueprint("export", __name__, url_prefix="/export")
+
+BATCH_SIZE = 2000
+
+# Exportable tables: column list and primary-key ordering (whitelist, never user SQL)
+EXPORT_TABLES = {
+    "orders": (
+        ["order_id", "customer_id", "order_status", "order_purchase_timestamp",
+         "order_estimated_delivery_date"],
+        "order_id",
+    ),
+    "order_items": (
+        ["order_id", "order_item_id", "product_id", "seller_id", "shipping_limit_date",
+         "price", "freight_value"],
+        "order_id, order_item_id",
+    ),
+    "order_payments": (
+        ["order_id", "payment_sequential", "payment_type", "payment_installments",
+         "payment_value"],
+        "order_id, payment_sequential",
+    ),
+    "order_reviews": (
+        ["review_id", "order_id", "customer_id", "review_score", "review_comment_message",
+         "review_creation_date"],
+        "review_id",
+    ),
+}
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _open_cursor(conn, table):
+    """Server-side cursor: rows are pulled from the DB in fetchmany() batches."""
+    if DB_CFG.get("vendor") == "mysql":
+        return conn.cursor(buffered=False)
+    return conn.cursor(name=f"export_{table}")  # psycopg named cursor (DECLARE ... CURSOR)
+
+
+def _iter_batches(conn, table, columns, order_by):
+    """Yield lists of row tuples, BATCH_SIZE at a time; releases conn when done."""
+    sql = f"SELECT {', '.join(columns)} FROM {table} ORDER BY {order_by}"
+    finished = False
+    try:
+        cur = _open_cursor(conn, table)
+        try:
+            cur.execute(sql)
+            while True:
+                rows = cur.fetchmany(BATCH_SIZE)
+                if not rows:
+                    break
+                yield rows
+            finished = True
+        except GeneratorExit:
+            logger.info(f"Export of {table} aborted by client")
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming export of {table}: {e}")
+            raise
+        finally:
+            if finished:
+                cur.close()
+    finally:
+        if finished:
+            conn.close()
+        else:
+            # Client went away or the query failed mid-stream: the connection
+            # may still hold unread results, so don't hand it back to the pool.
+            discard = getattr(conn, "discard", None)
+            try:
+                (discard or conn.close)()
+            except Exception:
+                pass
+
+
+def _ndjson(batches, columns):
+    # Decimal -> number, dates -> ISO 8601 (app/json_provider.py); one bytes chunk per batch
+    for rows in batches:
+        yield b"".join(map(dumps_line, row_dicts(columns, rows)))
+
+
+def _csv(batches, columns):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+@bp_export.get("/<string:table>")
+def export_table(table):
+    """
+    Stream a whole table as NDJSON or CSV.
+    GET /export/orders?format=ndjson
+    GET /export/order_items?format=csv
+
+    Rows are read through a server-side cursor in batches of BATCH_SIZE and
+    written to the response as they arrive, so memory use stays flat
+    regardless of table size.
+    """
+    if table not in EXPORT_TABLES:
+        return jsonify({
+            "error": f"table must be one of: {', '.join(sorted(EXPORT_TABLES))}"
+        }), 404
+
+    fmt = request.args.get("format", "ndjson").lower()
+    if fmt not in FORMATS:
+        return jsonify({"error": "format must be 'ndjson' or 'csv'"}), 422
+
+    columns, order_by = EXPORT_TABLES[table]
+
+    try:
+        # Acquire up front so connection failures are still a proper 503.
+        conn = db.get_conn()
+    except Exception as e:
+        logger.error(f"Error starting export of {table}: {e}")
+        return jsonify({"error": "Database unavailable"}), 503
+
+    batches = _iter_batches(conn, table, columns, order_by)
+    body = _ndjson(batches, columns) if fmt == "ndjson" else _csv(batches, columns)
+
+    return Response(
+        body,
+        content_type=FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{fmt}"'},
+    )
@@ -1,5 +1,9 @@
 from flask import Blueprint, request, jsonify
 from app.db import db
+from app.cache import cached
+from app.data_version import conditional
+from app.json_provider import jsonify_rows
+from app.pagination import decode_cursor, next_cursor, with_next_cursor
 import logging
 
 # service.py dosyasından fonksiyonları import ediyoruz
@@ -10,6 +14,25 @@ logger = logging.getLogger(__name__)
 
 orders_bp = Blueprint('orders', __name__, url_prefix='/orders')
 
+RECENT_ORDER_COLUMNS = (
+    "order_id", "customer_id", "order_status",
+    "order_purchase_timestamp", "order_estimated_delivery_date",
+)
+
+# /orders/stats; /dashboard/summary runs the same query (app/routes/dashboard.py)
+ORDER_STATS_SQL = """
+SELECT
+    COUNT(DISTINCT o.order_id) AS total_orders,
+    COUNT(oi.order_id) AS total_items,
+    AVG(items_per_order) AS avg_items_per_order
+FROM orders o
+LEFT JOIN (
+    SELECT order_id, COUNT(*) AS items_per_order
+    FROM order_items
+    GROUP BY order_id
+) oi ON o.order_id = oi.order_id
+"""
+
 #
 # 1. GÜNCELLENEN ROUTE: Müşteri Siparişleri
 #
@@ -73,28 +96,17 @@ def get_sample_customer():
 # ----------------------------------------------------------------
 
 @orders_bp.get("/stats")
+@conditional(tables=("orders", "order_items"))
+@cached(tables=("orders", "order_items"))
 def get_order_stats():
     """
     Get order statistics including total orders, items, and averages.
     GET /orders/stats
     """
     try:
-        sql = """
-        SELECT 
-            COUNT(DISTINCT o.order_id) as total_orders,
-            COUNT(oi.order_id) as total_items,
-            AVG(items_per_order) as avg_items_per_order
-        FROM orders o
-        LEFT JOIN (
-            SELECT order_id, COUNT(*) as items_per_order
-            FROM order_items
-            GROUP BY order_id
-        ) oi ON o.order_id = oi.order_id
-        """
-        
         with db.get_conn() as conn:
             with conn.cursor() as cur:
-                cur.execute(sql)
+                cur.execute(ORDER_STATS_SQL)
                 row = cur.fetchone()
                 
                 if row:
@@ -117,6 +129,11 @@ def get_recent_orders():
     """
     Get recent orders with optional limit.
     GET /orders/recent?limit=20
+    GET /orders/recent?limit=20&cursor=<X-Next-Cursor of the previous page>
+    
+    Keyset pagination on (order_purchase_timestamp, order_id); the cursor for
+    the next page is returned in the X-Next-Cursor header. Orders without a
+    purchase timestamp have no place in that order and are not listed.
     """
     limit_str = request.args.get('limit', '20')
     
@@ -127,6 +144,14 @@ def get_recent_orders():
     except ValueError:
         return jsonify({"error": "limit must be a valid integer"}), 422
     
+    after = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            after = decode_cursor(cursor, 2)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 422
+    
     try:
         sql = """
         SELECT 
@@ -136,27 +161,26 @@ def get_recent_orders():
             order_purchase_timestamp,
             order_estimated_delivery_date
         FROM orders
-        ORDER BY order_purchase_timestamp DESC
-        LIMIT %s
+        WHERE order_purchase_timestamp IS NOT NULL
         """
+        params = []
+        if after:
+            sql += " AND (order_purchase_timestamp, order_id) < (%s, %s)"
+            params.extend(after)
+        sql += " ORDER BY order_purchase_timestamp DESC, order_id DESC LIMIT %s"
+        params.append(limit)
         
         with db.get_conn() as conn:
             with conn.cursor() as cur:
-                cur.execute(sql, (limit,))
+                cur.execute(sql, params)
                 rows = cur.fetchall()
                 
-                orders = []
-                for row in rows:
-                    orders.append({
-                        "order_id": row[0],
-                        "customer_id": row[1],
-                        "order_status": row[2],
-                        "order_purchase_timestamp": row[3].isoformat() if row[3] else None,
-                        "order_estimated_delivery_date": row[4].isoformat() if row[4] else None
-                    })
-                
-                return jsonify(orders), 200
+                # Timestamps are written as ISO 8601 by the app's JSON provider
+                return with_next_cursor(
+                    (jsonify_rows(RECENT_ORDER_COLUMNS, rows), 200),
+                    next_cursor(rows, limit, key=lambda r: (r[3], r[0]))
+                )
                     
     except Exception as e:
         logger.error(f"Error fetching recent orders: {e}")
-        return jsonify({"error": "Failed to fetch recent orders"}), 500
\ No newline at end of file
+        return jsonify({"error": "Failed to fetch recent orders"}), 500
@@ -1,24 +1,27 @@
 import os
-from app.db.db import get_conn # Veritabanı bağlantısı için
+from app.db import db # Veritabanı bağlantısı için (pool üzerinden)
 from psycopg.rows import dict_row # Sonuçları dictionary olarak almak için
 
+# app/asgi.py da aynı sorguyu kullanır; params: (customer_id, limit)
+ORDERS_BY_CUSTOMER_SQL = """
+SELECT o.order_id,
+       o.order_status,
+       o.order_purchase_timestamp
+FROM orders o
+WHERE o.customer_id = %s
+ORDER BY o.order_purchase_timestamp DESC
+LIMIT %s
+"""
+
 def get_orders_by_customer(customer_id: str, limit: int = 10):
     """
     Belirli bir müşterinin son siparişlerini döner.
     Hata durumunda (DB kapalıysa) None döner.
     """
-    sql = """
-    SELECT o.order_id,
-           o.order_status,
-           o.order_purchase_timestamp
-    FROM orders o
-    WHERE o.customer_id = %s
-    ORDER BY o.order_purchase_timestamp DESC
-    LIMIT %s
-    """
+    sql = ORDERS_BY_CUSTOMER_SQL
     
     try:
-        with get_conn() as conn:
+        with db.get_conn() as conn:
             with conn.cursor(row_factory=dict_row) as cur:
                 cur.execute(sql, (customer_id, limit))
                 orders = cur.fetchall()
@@ -40,7 +43,7 @@ def get_sample_customer_ids(limit: int = 5):
     """
     
     try:
-        with get_conn() as conn:
+        with db.get_conn() as conn:
             with conn.cursor(row_factory=dict_row) as cur:
                 cur.execute(sql, (limit,))
                 results = cur.fetchall()
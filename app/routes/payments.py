@@ -1,11 +1,17 @@
 from flask import Blueprint, request, jsonify
 from app.db import db
+from app.db.fanout import fetch_all
+from app.cache import cached
+from app.data_version import conditional
+from app.json_provider import row_dicts
 import logging
 
 logger = logging.getLogger(__name__)
 
 bp_payments = Blueprint("payments", __name__, url_prefix="/payments")
 
+PAYMENT_COLUMNS = ("order_id", "payment_sequential", "payment_type", "payment_installments", "payment_value")
+
 
 @bp_payments.get("/by-type")
 def payments_by_type():
@@ -50,16 +56,7 @@ def payments_by_type():
                 cur.execute(sql, (payment_type, limit))
                 rows = cur.fetchall()
         
-        payments = [
-            {
-                "order_id": row[0],
-                "payment_sequential": row[1],
-                "payment_type": row[2],
-                "payment_installments": row[3],
-                "payment_value": float(row[4]) if row[4] is not None else None
-            }
-            for row in rows
-        ]
+        payments = row_dicts(PAYMENT_COLUMNS, rows)
         
         return jsonify({
             "payment_type": payment_type,
@@ -74,6 +71,8 @@ def payments_by_type():
 
 
 @bp_payments.get("/stats")
+@conditional(tables=("order_payments",))
+@cached(tables=("order_payments",))
 def get_payment_stats():
     """
     Get payment statistics including totals, averages, and payment type breakdown.
@@ -100,30 +99,27 @@ def get_payment_stats():
         ORDER BY count DESC
         """
         
-        with db.get_conn() as conn:
-            with conn.cursor() as cur:
-                # Get overall stats
-                cur.execute(stats_sql)
-                stats_row = cur.fetchone()
-                
-                # Get payment types
-                cur.execute(types_sql)
-                type_rows = cur.fetchall()
-                
-                payment_types = []
-                for row in type_rows:
-                    payment_types.append({
-                        "type": row[0],
-                        "count": int(row[1]),
-                        "total": float(row[2]) if row[2] else 0.0
-                    })
-                
-                return jsonify({
-                    "total_payments": int(stats_row[0]) if stats_row[0] else 0,
-                    "total_value": float(stats_row[1]) if stats_row[1] else 0.0,
-                    "avg_payment_value": float(stats_row[2]) if stats_row[2] else 0.0,
-                    "payment_types": payment_types
-                }), 200
+        # Independent queries: run in parallel on separate pooled connections
+        rows = fetch_all({
+            "stats": (stats_sql, None),
+            "types": (types_sql, None),
+        })
+        stats_row = rows["stats"][0]
+        
+        payment_types = []
+        for row in rows["types"]:
+            payment_types.append({
+                "type": row[0],
+                "count": int(row[1]),
+                "total": float(row[2]) if row[2] else 0.0
+            })
+        
+        return jsonify({
+            "total_payments": int(stats_row[0]) if stats_row[0] else 0,
+            "total_value": float(stats_row[1]) if stats_row[1] else 0.0,
+            "avg_payment_value": float(stats_row[2]) if stats_row[2] else 0.0,
+            "payment_types": payment_types
+        }), 200
                     
     except Exception as e:
         logger.error(f"Error fetching payment stats: {e}")
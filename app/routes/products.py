@@ -1,11 +1,29 @@
 from flask import Blueprint, request, jsonify
 from app.db import db
+from app.cache import cached
+from app.data_version import conditional
+from app.json_provider import jsonify_rows
+from app.pagination import decode_cursor, next_cursor, with_next_cursor
 import logging
 
 logger = logging.getLogger(__name__)
 
 products_bp = Blueprint("products", __name__, url_prefix="/products")
 
+PRODUCT_COLUMNS = (
+    "product_id", "product_category_name", "product_photos_qty", "product_weight_g",
+    "product_length_cm", "product_height_cm", "product_width_cm",
+    "product_name_length", "product_description_length",
+)
+
+# /products/stats; /dashboard/summary runs the same query (app/routes/dashboard.py)
+PRODUCT_STATS_SQL = """
+SELECT
+    COUNT(DISTINCT p.product_id) AS total_products,
+    COUNT(DISTINCT p.category_id) AS total_categories
+FROM products p
+"""
+
 @products_bp.get("/sample")
 def products_sample():
     """
@@ -150,22 +168,17 @@ def products_top_categories():
 
 
 @products_bp.get("/stats")
+@conditional(tables=("products",))
+@cached(tables=("products",))
 def get_product_stats():
     """
     Get product statistics including total products and categories.
     GET /products/stats
     """
     try:
-        sql = """
-        SELECT 
-            COUNT(DISTINCT p.product_id) as total_products,
-            COUNT(DISTINCT p.category_id) as total_categories
-        FROM products p
-        """
-        
         with db.get_conn() as conn:
             with conn.cursor() as cur:
-                cur.execute(sql)
+                cur.execute(PRODUCT_STATS_SQL)
                 row = cur.fetchone()
                 
                 if row:
@@ -186,6 +199,9 @@ def get_products():
     """
     Get products with optional limit.
     GET /products?limit=50
+    GET /products?limit=50&cursor=<X-Next-Cursor of the previous page>
+    
+    Keyset pagination on product_id (primary key).
     """
     limit_str = request.args.get('limit', '50')
     
@@ -196,6 +212,14 @@ def get_products():
     except ValueError:
         return jsonify({"error": "limit must be a valid integer"}), 422
     
+    after = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            after = decode_cursor(cursor, 1)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 422
+    
     try:
         sql = """
         SELECT 
@@ -205,32 +229,27 @@ def get_products():
             p.product_weight_g,
             p.product_length_cm,
             p.product_height_cm,
-            p.product_width_cm
+            p.product_width_cm,
+            0 AS product_name_length,         -- not available in schema
+            0 AS product_description_length   -- not available in schema
         FROM products p
-        ORDER BY p.product_id
-        LIMIT %s
         """
+        params = []
+        if after:
+            sql += " WHERE p.product_id > %s"
+            params.extend(after)
+        sql += " ORDER BY p.product_id LIMIT %s"
+        params.append(limit)
         
         with db.get_conn() as conn:
             with conn.cursor() as cur:
-                cur.execute(sql, (limit,))
+                cur.execute(sql, params)
                 rows = cur.fetchall()
                 
-                products = []
-                for row in rows:
-                    products.append({
-                        "product_id": row[0],
-                        "product_category_name": row[1],
-                        "product_name_length": 0,  # Not available in schema
-                        "product_description_length": 0,  # Not available in schema
-                        "product_photos_qty": row[2],
-                        "product_weight_g": row[3],
-                        "product_length_cm": row[4],
-                        "product_height_cm": row[5],
-                        "product_width_cm": row[6]
-                    })
-                
-                return jsonify(products), 200
+                return with_next_cursor(
+                    (jsonify_rows(PRODUCT_COLUMNS, rows), 200),
+                    next_cursor(rows, limit, key=lambda r: (r[0],))
+                )
                     
     except Exception as e:
         logger.error(f"Error fetching products: {e}")
@@ -1,13 +1,25 @@
 from flask import Blueprint, request, jsonify
 from app.db import db
+from app.db.fanout import fetch_all
+from app.cache import cached
+from app.data_version import conditional
+from app.json_provider import jsonify_rows
+from app.pagination import decode_cursor, next_cursor, with_next_cursor
 import logging
 
 logger = logging.getLogger(__name__)
 
 bp_reviews = Blueprint("reviews", __name__, url_prefix="/reviews")
 
+RECENT_REVIEW_COLUMNS = (
+    "review_id", "order_id", "review_score", "review_comment_message",
+    "review_creation_date", "review_comment_title", "review_answer_timestamp",
+)
+
 
 @bp_reviews.get("/stats")
+@conditional(tables=("order_reviews",))
+@cached(tables=("order_reviews",))
 def reviews_stats():
     """Get review statistics including score distribution and averages."""
     # Make parameters optional for dashboard use
@@ -54,18 +66,15 @@ def reviews_stats():
         ORDER BY review_score
         """
         
-        with db.get_conn() as conn:
-            with conn.cursor() as cur:
-                # Get overall stats
-                cur.execute(overall_sql)
-                overall_row = cur.fetchone()
-                
-                # Get distribution
-                cur.execute(dist_sql, (min_score, max_score))
-                dist_rows = cur.fetchall()
+        # Independent queries: run in parallel on separate pooled connections
+        rows = fetch_all({
+            "overall": (overall_sql, None),
+            "distribution": (dist_sql, (min_score, max_score)),
+        })
+        overall_row = rows["overall"][0]
         
         score_distribution = []
-        for row in dist_rows:
+        for row in rows["distribution"]:
             score_distribution.append({
                 "score": int(row[0]),
                 "count": int(row[1])
@@ -87,6 +96,9 @@ def get_recent_reviews():
     """
     Get recent reviews with optional limit.
     GET /reviews/recent?limit=20
+    GET /reviews/recent?limit=20&cursor=<X-Next-Cursor of the previous page>
+    
+    Keyset pagination on (review_creation_date, review_id).
     """
     limit_str = request.args.get('limit', '20')
     
@@ -97,37 +109,43 @@ def get_recent_reviews():
     except ValueError:
         return jsonify({"error": "limit must be a valid integer"}), 422
     
+    after = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            after = decode_cursor(cursor, 2)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 422
+    
     try:
         sql = """
         SELECT 
             review_id,
             order_id,
-            review_score,
+            COALESCE(review_score, 0) AS review_score,
             review_comment_message,
-            review_creation_date
+            review_creation_date,
+            NULL AS review_comment_title,     -- not available in schema
+            NULL AS review_answer_timestamp   -- not available in schema
         FROM order_reviews
-        ORDER BY review_creation_date DESC
-        LIMIT %s
+        WHERE review_creation_date IS NOT NULL  -- undated reviews are not listed
         """
+        params = []
+        if after:
+            sql += " AND (review_creation_date, review_id) < (%s, %s)"
+            params.extend(after)
+        sql += " ORDER BY review_creation_date DESC, review_id DESC LIMIT %s"
+        params.append(limit)
         
         with db.get_conn() as conn:
             with conn.cursor() as cur:
-                cur.execute(sql, (limit,))
+                cur.execute(sql, params)
                 rows = cur.fetchall()
                 
-                reviews = []
-                for row in rows:
-                    reviews.append({
-                        "review_id": row[0],
-                        "order_id": row[1],
-                        "review_score": int(row[2]) if row[2] else 0,
-                        "review_comment_title": None,  # Not available in schema
-                        "review_comment_message": row[3],
-                        "review_creation_date": row[4].isoformat() if row[4] else None,
-                        "review_answer_timestamp": None  # Not available in schema
-                    })
-                
-                return jsonify(reviews), 200
+                return with_next_cursor(
+                    (jsonify_rows(RECENT_REVIEW_COLUMNS, rows), 200),
+                    next_cursor(rows, limit, key=lambda r: (r[4], r[0]))
+                )
                     
     except Exception as e:
         logger.error(f"Error fetching recent reviews: {e}")
@@ -6,3 +6,10 @@ CREATE INDEX IF NOT EXISTS idx_reviews__customer_id  ON order_reviews(customer_i
 CREATE INDEX IF NOT EXISTS idx_oi__order_id          ON order_items(order_id);
 CREATE INDEX IF NOT EXISTS idx_oi__product_id        ON order_items(product_id);
 CREATE INDEX IF NOT EXISTS idx_oi__seller_id         ON order_items(seller_id);
+CREATE INDEX IF NOT EXISTS idx_orders__status        ON orders(order_status);
+CREATE INDEX IF NOT EXISTS idx_reviews__order_id     ON order_reviews(order_id);
+
+-- Keyset pagination (app/pagination.py): one index per (sort key, tiebreak).
+-- orders(customer_id), the orders keyset and the customers-by-state keyset are
+-- served by the covering / expression indexes in 070_route_indexes.sql.
+CREATE INDEX IF NOT EXISTS idx_reviews__creation_date_id ON order_reviews(review_creation_date, review_id);
@@ -0,0 +1,30 @@
+-- Precomputed analytics rollups (refreshed by db/etl/refresh_rollups.py)
+-- /analytics/revenue-by-category and /analytics/top-sellers read these
+-- instead of aggregating order_items ⋈ orders ⋈ products/sellers per request.
+-- Only delivered orders are counted, same as the live queries.
+
+CREATE TABLE IF NOT EXISTS analytics_category_rollup (
+  category_name TEXT PRIMARY KEY,          -- 'Unknown' for NULL categories
+  items_sold BIGINT NOT NULL,
+  distinct_orders BIGINT NOT NULL,
+  revenue_sum NUMERIC(14,2) NOT NULL,      -- SUM(price + freight_value)
+  price_sum NUMERIC(14,2) NOT NULL,
+  price_count BIGINT NOT NULL,             -- AVG(price) = price_sum / price_count
+  refreshed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS analytics_seller_rollup (
+  seller_id TEXT PRIMARY KEY,
+  seller_city TEXT,
+  seller_state TEXT,
+  items_sold BIGINT NOT NULL,
+  distinct_orders BIGINT NOT NULL,
+  revenue_sum NUMERIC(14,2) NOT NULL,
+  price_sum NUMERIC(14,2) NOT NULL,
+  price_count BIGINT NOT NULL,
+  refreshed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Top-N reads: ORDER BY revenue_sum DESC LIMIT n
+CREATE INDEX IF NOT EXISTS idx_cat_rollup__revenue    ON analytics_category_rollup(revenue_sum DESC);
+CREATE INDEX IF NOT EXISTS idx_seller_rollup__revenue ON analytics_seller_rollup(revenue_sum DESC);
@@ -0,0 +1,32 @@
+-- Composite / covering indexes matched to the WHERE + ORDER BY of the hot routes.
+-- INCLUDE columns let the planner answer the route from the index alone (Index Only Scan).
+
+-- /customers/by-state compares customer_state directly (no UPPER() around the
+-- column) and pages on (COALESCE(customer_city, ''), customer_id) so NULL cities
+-- stay reachable; the expression index serves both. State codes are upper-cased at
+-- write time (customers CRUD, db/etl/load_customers.py); normalize old rows once.
+UPDATE customers
+SET customer_state = UPPER(TRIM(customer_state))
+WHERE customer_state <> UPPER(TRIM(customer_state));
+CREATE INDEX IF NOT EXISTS idx_customers__state_city_key_id
+  ON customers(customer_state, (COALESCE(customer_city, '')), customer_id);
+
+-- /orders/by-customer: WHERE customer_id = ? ORDER BY order_purchase_timestamp DESC
+CREATE INDEX IF NOT EXISTS idx_orders__customer_purchase_ts
+  ON orders(customer_id, order_purchase_timestamp DESC) INCLUDE (order_id, order_status);
+
+-- /orders/recent: keyset on (order_purchase_timestamp DESC, order_id DESC), every column covered
+CREATE INDEX IF NOT EXISTS idx_orders__purchase_ts_id_cover
+  ON orders(order_purchase_timestamp DESC, order_id DESC)
+  INCLUDE (customer_id, order_status, order_estimated_delivery_date);
+-- /reviews/recent stays on idx_reviews__creation_date_id (040, scanned backwards);
+-- review_comment_message is too wide to INCLUDE.
+
+-- /payments/by-type: WHERE payment_type = ? ORDER BY order_id, payment_sequential
+CREATE INDEX IF NOT EXISTS idx_payments__type_order_seq
+  ON order_payments(payment_type, order_id, payment_sequential)
+  INCLUDE (payment_installments, payment_value);
+
+-- /customers/by-city: geo_zip filtered on (state, city), joined on the zip prefix
+CREATE INDEX IF NOT EXISTS idx_geo_zip__state_city
+  ON geo_zip(geolocation_state, geolocation_city) INCLUDE (geolocation_zip_code_prefix);
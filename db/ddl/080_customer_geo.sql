@@ -0,0 +1,21 @@
+-- Denormalized customers ⋈ geo_zip projection (db/etl/refresh_rollups.py refresh_customer_geo,
+-- kept current by the customer create/edit/delete routes through app/customer_geo.py).
+-- /customers/by-city is an index seek on (state, city); /geo/top-states reads 27 rows,
+-- and an empty customer_geo_state_counts means the projection has not been built yet.
+-- Only customers whose zip prefix exists in geo_zip are projected, same as the live join.
+
+CREATE TABLE IF NOT EXISTS customer_geo (
+  customer_id TEXT PRIMARY KEY,
+  zip_code_prefix INT NOT NULL,
+  lat NUMERIC(10,6),
+  lng NUMERIC(10,6),
+  city TEXT,                               -- geo_zip.geolocation_city
+  state TEXT                               -- geo_zip.geolocation_state
+);
+
+CREATE INDEX IF NOT EXISTS idx_customer_geo__state_city ON customer_geo(state, city, customer_id);
+
+CREATE TABLE IF NOT EXISTS customer_geo_state_counts (
+  state TEXT PRIMARY KEY,
+  customer_count BIGINT NOT NULL
+);
@@ -0,0 +1,8 @@
+-- Order milestone timestamps from olist_orders_dataset.csv, needed for delivery-time
+-- analytics (/analytics/review-vs-delivery, /analytics/order-funnel,
+-- /analytics/distance-vs-delivery). Loaded by db/etl/load_orders.py; existing rows
+-- are filled by: python db/etl/load_orders.py <csv> --backfill-milestones
+
+ALTER TABLE orders
+  ADD COLUMN IF NOT EXISTS order_approved_at TIMESTAMP,
+  ADD COLUMN IF NOT EXISTS order_delivered_customer_date TIMESTAMP;
@@ -0,0 +1,14 @@
+-- Seller -> customer shipping distance vs. delivery time
+-- (refreshed by db/etl/refresh_distance_stats.py, read by /analytics/distance-vs-delivery).
+-- One row per distance bucket; averages are per delivered order item.
+
+CREATE TABLE IF NOT EXISTS analytics_distance_delivery (
+  bucket_no INT PRIMARY KEY,
+  min_km NUMERIC(8,1) NOT NULL,
+  max_km NUMERIC(8,1),                     -- NULL for the open-ended last bucket
+  items BIGINT NOT NULL,
+  avg_distance_km NUMERIC(8,1),
+  avg_delivery_days NUMERIC(6,2),          -- order_delivered_customer_date - order_purchase_timestamp
+  avg_freight_value NUMERIC(10,2),
+  refreshed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
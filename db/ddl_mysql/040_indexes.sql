@@ -6,3 +6,8 @@ CREATE INDEX idx_reviews__customer_id  ON order_reviews(customer_id);
 CREATE INDEX idx_oi__order_id          ON order_items(order_id);
 CREATE INDEX idx_oi__product_id        ON order_items(product_id);
 CREATE INDEX idx_oi__seller_id         ON order_items(seller_id);
+
+-- Keyset pagination (app/pagination.py): one index per (sort key, tiebreak);
+-- customers by state is served by the functional index in 070_route_indexes.sql
+CREATE INDEX idx_orders__purchase_ts_id    ON orders(order_purchase_timestamp, order_id);
+CREATE INDEX idx_reviews__creation_date_id ON order_reviews(review_creation_date, review_id);
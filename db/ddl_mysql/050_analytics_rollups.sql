@@ -0,0 +1,28 @@
+-- Precomputed analytics rollups (refreshed by db/etl/refresh_rollups.py)
+-- /analytics/revenue-by-category and /analytics/top-sellers read these
+-- instead of aggregating order_items ⋈ orders ⋈ products/sellers per request.
+-- Only delivered orders are counted, same as the live queries.
+
+CREATE TABLE IF NOT EXISTS analytics_category_rollup (
+  category_name VARCHAR(100) PRIMARY KEY,  -- 'Unknown' for NULL categories
+  items_sold BIGINT NOT NULL,
+  distinct_orders BIGINT NOT NULL,
+  revenue_sum DECIMAL(14,2) NOT NULL,      -- SUM(price + freight_value)
+  price_sum DECIMAL(14,2) NOT NULL,
+  price_count BIGINT NOT NULL,             -- AVG(price) = price_sum / price_count
+  refreshed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_cat_rollup__revenue (revenue_sum DESC)
+);
+
+CREATE TABLE IF NOT EXISTS analytics_seller_rollup (
+  seller_id VARCHAR(50) PRIMARY KEY,
+  seller_city VARCHAR(100),
+  seller_state VARCHAR(10),
+  items_sold BIGINT NOT NULL,
+  distinct_orders BIGINT NOT NULL,
+  revenue_sum DECIMAL(14,2) NOT NULL,
+  price_sum DECIMAL(14,2) NOT NULL,
+  price_count BIGINT NOT NULL,
+  refreshed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_seller_rollup__revenue (revenue_sum DESC)
+);
@@ -0,0 +1,16 @@
+-- Incremental ETL bookkeeping (written by db/etl/etl_utils.load_csv when ETL_INCREMENTAL=1)
+-- One row per source table: fingerprint of the CSV file as of the last load.
+--   same sha256                    -> file unchanged, load skipped
+--   first byte_offset bytes match  -> file was appended to, only the tail is read
+--   otherwise                      -> full read; orders/reviews skip rows at or
+--                                     before the stored timestamp watermark
+
+CREATE TABLE IF NOT EXISTS etl_runs (
+  source_name VARCHAR(64) PRIMARY KEY,     -- target table, e.g. 'orders'
+  file_path VARCHAR(512) NOT NULL,
+  file_sha256 CHAR(64) NOT NULL,           -- hash of bytes [0, byte_offset)
+  byte_offset BIGINT NOT NULL,             -- file size at the last load
+  row_count BIGINT NOT NULL,               -- data rows read from the file so far
+  watermark VARCHAR(32),                   -- max timestamp loaded (orders, reviews)
+  loaded_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,30 @@
+-- Composite / covering indexes matched to the WHERE + ORDER BY of the hot routes.
+-- MySQL has no INCLUDE: covered columns are appended to the key. InnoDB secondary
+-- indexes also carry the primary key, so PK columns never need to be listed.
+
+-- /customers/by-state compares customer_state directly (no UPPER() around the
+-- column) and pages on (COALESCE(customer_city, ''), customer_id) so NULL cities
+-- stay reachable; the functional index (MySQL 8.0.13+) serves both. State codes
+-- are upper-cased at write time (customers CRUD, db/etl/load_customers.py);
+-- normalize old rows once.
+UPDATE customers
+SET customer_state = UPPER(TRIM(customer_state))
+WHERE BINARY customer_state <> BINARY UPPER(TRIM(customer_state));
+CREATE INDEX idx_customers__state_city_key_id
+  ON customers(customer_state, (COALESCE(customer_city, '')), customer_id);
+
+-- /orders/by-customer: WHERE customer_id = ? ORDER BY order_purchase_timestamp DESC
+-- (order_id is the PK, order_status appended so the query never reads the row)
+CREATE INDEX idx_orders__customer_purchase_ts
+  ON orders(customer_id, order_purchase_timestamp DESC, order_status);
+
+-- /orders/recent and /reviews/recent use the (timestamp, id) keyset indexes
+-- from 040; InnoDB scans them backwards for the DESC order.
+
+-- /payments/by-type: WHERE payment_type = ? ORDER BY order_id, payment_sequential
+CREATE INDEX idx_payments__type_order_seq
+  ON order_payments(payment_type, order_id, payment_sequential, payment_installments, payment_value);
+
+-- /customers/by-city: geo_zip filtered on (state, city), zip prefix is the PK
+CREATE INDEX idx_geo_zip__state_city
+  ON geo_zip(geolocation_state, geolocation_city);
@@ -0,0 +1,13 @@
+-- Data version counters for HTTP conditional caching (app/data_version.py)
+-- One row per table, bumped by every write path:
+--   ETL loaders and rollup refreshes  -> db/etl/etl_utils.invalidate_api_cache
+--   customer create/edit/delete       -> same transaction as the write
+-- Read endpoints derive their ETag from the versions of the tables they read
+-- and Last-Modified from the newest updated_at, so unchanged data answers
+-- If-None-Match / If-Modified-Since with 304.
+
+CREATE TABLE IF NOT EXISTS data_version (
+  table_name VARCHAR(64) PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -1,9 +1,17 @@
 """
-ETL utility functions for dry-run mode and batch processing.
+ETL utility functions for dry-run mode, typed CSV ingestion and bulk loading.
 """
 import csv
+import hashlib
+import json
 import os
-from typing import Iterable, List, Tuple, Any
+import tempfile
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import pandas as pd
 
 
 def get_env_bool(key: str, default: bool = False) -> bool:
@@ -41,24 +49,6 @@ def get_insert_ignore_sql(table: str, columns: str, placeholders: str, conflict_
             return f"INSERT INTO {table}({columns}) VALUES ({placeholders})"
 
 
-def read_csv_in_batches(csv_path: str, batch_size: int = 5000) -> Iterable[List[dict]]:
-    """
-    Read CSV file in batches.
-    Yields batches of dictionaries.
-    Uses utf-8-sig to handle BOM if present.
-    """
-    with open(csv_path, newline='', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        batch: List[dict] = []
-        for row in reader:
-            batch.append(row)
-            if len(batch) >= batch_size:
-                yield batch
-                batch = []
-        if batch:
-            yield batch
-
-
 def dry_insert_preview(table: str, rows: List[Tuple], total_count: int):
     """
     Print preview of data for dry-run mode.
@@ -72,15 +62,469 @@ def dry_insert_preview(table: str, rows: List[Tuple], total_count: int):
     print()
 
 
-def iter_batches(rows: Iterable[Tuple], batch_size: int = 5000) -> Iterable[List[Tuple]]:
+# Rows per pandas chunk when reading the Olist CSV files
+CSV_CHUNK_ROWS = 50_000
+
+# Declared column types for coerce_frame(): "str" (stripped, '' -> NULL),
+# "int" (non-integers -> NULL) and "float" (unparseable -> NULL)
+_CSV_DTYPES = ("str", "int", "float")
+
+
+def coerce_frame(df: pd.DataFrame, schema: Dict[str, str], required: Sequence[str] = ()) -> pd.DataFrame:
+    """
+    Return ``df`` with exactly the ``schema`` columns, in order, coerced to their declared types.
+
+    Missing columns become all-NULL. Rows with a NULL in any ``required``
+    column are dropped. Every step is a vectorized pandas operation.
     """
-    Batch generator for tuple rows.
+    out = {}
+    for col, kind in schema.items():
+        if kind not in _CSV_DTYPES:
+            raise ValueError(f"{col}: unknown dtype {kind!r}, expected one of {_CSV_DTYPES}")
+        if col not in df.columns:
+            out[col] = pd.Series(pd.NA, index=df.index, dtype="string" if kind == "str" else "Float64")
+            continue
+        values = df[col].astype("string").str.strip()
+        if kind == "str":
+            out[col] = values.mask(values == "")
+        elif kind == "int":
+            numbers = pd.to_numeric(values, errors="coerce")
+            out[col] = numbers.where(numbers % 1 == 0).astype("Int64")
+        else:
+            out[col] = pd.to_numeric(values, errors="coerce").astype("Float64")
+    frame = pd.DataFrame(out, index=df.index)
+    if required:
+        frame = frame.dropna(subset=list(required))
+    return frame
+
+
+def iter_csv_chunks(csv_path: str, schema: Dict[str, str], required: Sequence[str] = (),
+                    chunksize: int = CSV_CHUNK_ROWS, start: int = 0) -> Iterator[pd.DataFrame]:
+    """
+    Read ``csv_path`` in chunks of typed, cleaned DataFrames (see coerce_frame).
+
+    Only the ``schema`` columns are parsed; values are read as raw strings
+    (no NA guessing, so e.g. a city called "NA" survives) and coerced per column.
+    With ``start`` (a byte offset at a line boundary) only the rows after it
+    are read, using the header from the top of the file.
+    """
+    options = dict(usecols=lambda c: c in schema, dtype=str, na_filter=False, chunksize=chunksize)
+    if not start:
+        with pd.read_csv(csv_path, encoding="utf-8-sig", **options) as reader:
+            for chunk in reader:
+                yield coerce_frame(chunk, schema, required)
+        return
+
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        header = next(csv.reader(f))
+    with open(csv_path, "rb") as f:
+        f.seek(start)
+        with pd.read_csv(f, encoding="utf-8", header=None, names=header, **options) as reader:
+            for chunk in reader:
+                yield coerce_frame(chunk, schema, required)
+
+
+def frame_rows(df: pd.DataFrame) -> Iterator[Tuple]:
+    """Row tuples of ``df`` with NULLs as None and Python scalars, ready for bulk_load()."""
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+
+def csv_rows(csv_path: str, schema: Dict[str, str], required: Sequence[str] = ()) -> Iterator[Tuple]:
+    """All rows of ``csv_path`` as typed tuples in ``schema`` column order."""
+    for chunk in iter_csv_chunks(csv_path, schema, required):
+        yield from frame_rows(chunk)
+
+
+def incremental_enabled() -> bool:
+    """ETL_INCREMENTAL=1 turns on fingerprint/watermark based loads (see load_csv)."""
+    return get_env_bool("ETL_INCREMENTAL")
+
+
+def _file_fingerprint(path: str, prefix_bytes: int = 0) -> Tuple[str, int, str]:
+    """(sha256 of the file, size, sha256 of its first ``prefix_bytes`` bytes) in one pass."""
+    digest = hashlib.sha256()
+    prefix_digest = None
+    size = 0
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(1 << 20)
+            if not block:
+                break
+            if prefix_digest is None and size + len(block) >= prefix_bytes:
+                digest.update(block[:prefix_bytes - size])
+                prefix_digest = digest.copy()
+                digest.update(block[prefix_bytes - size:])
+            else:
+                digest.update(block)
+            size += len(block)
+    if prefix_digest is None:
+        prefix_digest = digest  # file shorter than prefix_bytes
+    return digest.hexdigest(), size, prefix_digest.hexdigest()
+
+
+def _ends_line(path: str, offset: int) -> bool:
+    if offset == 0:
+        return True  # start of file (previous run saw an empty file)
+    with open(path, "rb") as f:
+        f.seek(offset - 1)
+        return f.read(1) == b"\n"
+
+
+def plan_incremental(cur, source: str, csv_path: str) -> Dict[str, Any]:
+    """
+    Compare ``csv_path`` with the etl_runs row of ``source``.
+
+    Returns a plan dict whose "mode" is:
+        "full"    - no previous run: read the whole file
+        "skip"    - same content hash: nothing to do
+        "append"  - previous content is an unchanged prefix: read from "offset"
+        "changed" - rewritten file: read everything, "watermark" may filter rows
+    """
+    cur.execute(
+        "SELECT file_sha256, byte_offset, row_count, watermark FROM etl_runs WHERE source_name = %s",
+        (source,),
+    )
+    prev = cur.fetchone()
+    plan = {"source": source, "path": csv_path, "mode": "full", "offset": 0, "row_count": 0, "watermark": None}
+    if prev is None:
+        plan["sha256"], plan["size"], _ = _file_fingerprint(csv_path)
+        return plan
+
+    prev_sha, prev_offset, prev_rows, prev_watermark = prev
+    plan["sha256"], plan["size"], prefix_sha = _file_fingerprint(csv_path, prev_offset)
+    plan["watermark"] = prev_watermark
+    if plan["sha256"] == prev_sha:
+        plan["mode"] = "skip"
+    elif plan["size"] > prev_offset and prefix_sha == prev_sha and _ends_line(csv_path, prev_offset):
+        plan.update(mode="append", offset=prev_offset, row_count=prev_rows)
+    else:
+        plan["mode"] = "changed"
+    return plan
+
+
+def record_etl_run(cur, plan: Dict[str, Any], rows_read: int, watermark: str = None):
+    """Store the fingerprint of a finished load in etl_runs (same transaction as the load)."""
+    cur.execute("DELETE FROM etl_runs WHERE source_name = %s", (plan["source"],))
+    cur.execute(
+        "INSERT INTO etl_runs (source_name, file_path, file_sha256, byte_offset, row_count, watermark) "
+        "VALUES (%s, %s, %s, %s, %s, %s)",
+        (plan["source"], plan["path"], plan["sha256"], plan["size"], plan["row_count"] + rows_read, watermark),
+    )
+
+
+@contextmanager
+def load_transaction(cur):
+    """
+    Group a load's writes (rows plus its etl_runs record) into one transaction.
+
+    MySQL connections here are autocommit: START TRANSACTION, then COMMIT on
+    success or ROLLBACK on error. On PostgreSQL the connection is already in
+    a transaction that the caller commits, so nothing is sent.
+    """
+    from app.config import DB_CFG
+    if DB_CFG.get("vendor") != "mysql":
+        yield
+        return
+    cur.execute("START TRANSACTION")
+    try:
+        yield
+    except Exception:
+        cur.execute("ROLLBACK")
+        raise
+    cur.execute("COMMIT")
+
+
+def load_csv(cur, table: str, csv_path: str, schema: Dict[str, str], required: Sequence[str] = (),
+             columns: List[str] = None, watermark_column: str = None,
+             transform: Callable[[pd.DataFrame], pd.DataFrame] = None) -> int:
+    """
+    Parse ``csv_path`` with the typed engine and bulk_load() it into ``table``.
+
+    With ETL_INCREMENTAL=1 the file is fingerprinted against etl_runs first:
+    unchanged files are skipped, appended files only send the new tail and,
+    if ``watermark_column`` is given, rewritten files only send rows newer
+    than the stored watermark (rows without a timestamp are always sent).
+
+    The rows and their etl_runs record are written in one transaction
+    (see load_transaction).
+
+    Args:
+        columns: Target column names if they differ from the schema's CSV names
+        transform: Applied to every typed chunk before it is sent, e.g. to add
+            looked-up columns; its output columns must match ``columns``
+
+    Returns:
+        int: Number of rows sent to the database
+    """
+    columns = columns or list(schema)
+    plan = plan_incremental(cur, table, csv_path) if incremental_enabled() else None
+    if plan and plan["mode"] == "skip":
+        print(f"[{table}] incremental: {csv_path} unchanged since last load, skipped")
+        return 0
+    since = None
+    if plan:
+        since = plan["watermark"] if plan["mode"] == "changed" and watermark_column else None
+        print(f"[{table}] incremental: mode={plan['mode']} offset={plan['offset']}"
+              + (f" watermark>{since}" if since else ""))
+
+    progress = {"rows_read": 0, "watermark": plan["watermark"] if plan else None}
+
+    def rows():
+        for chunk in iter_csv_chunks(csv_path, schema, required, start=plan["offset"] if plan else 0):
+            progress["rows_read"] += len(chunk)
+            if plan and watermark_column:
+                stamps = chunk[watermark_column]
+                if since:
+                    chunk = chunk[stamps.isna() | (stamps > since)]
+                newest = stamps.max()
+                if newest is not pd.NA and (progress["watermark"] is None or newest > progress["watermark"]):
+                    progress["watermark"] = newest
+            if transform is not None:
+                chunk = transform(chunk)
+            yield from frame_rows(chunk)
+
+    with load_transaction(cur):
+        total = bulk_load(cur, table, columns, rows())
+        if plan:
+            record_etl_run(cur, plan, progress["rows_read"], progress["watermark"] if watermark_column else None)
+    return total
+
+
+# MySQL LOAD DATA default field format: tab separated, backslash escaped, \N = NULL
+_MYSQL_TSV_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"})
+
+# Fallback when @@max_allowed_packet cannot be read (MySQL 8 default is 64 MB)
+_MYSQL_DEFAULT_PACKET = 16 * 1024 * 1024
+
+
+def _mysql_tsv_field(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return str(value).translate(_MYSQL_TSV_ESCAPES)
+
+
+def _mysql_server_var(cur, name: str):
+    try:
+        cur.execute(f"SELECT @@{name}")
+        row = cur.fetchone()
+        return row[0] if row else None
+    except Exception:
+        return None
+
+
+def _mysql_local_infile_enabled(cur) -> bool:
+    """LOAD DATA LOCAL needs both the client flag and the server variable."""
+    from app.config import DB_CFG
+    if not DB_CFG.get("local_infile"):
+        return False
+    return str(_mysql_server_var(cur, "local_infile")) in ("1", "ON")
+
+
+def _mysql_load_data(cur, table: str, columns: List[str], rows: Iterable[Tuple]) -> Tuple[int, int]:
+    """Write rows to a temp TSV, LOAD DATA LOCAL it into a staging table, merge with INSERT IGNORE."""
+    cols = ", ".join(columns)
+    stage = f"_stage_{table}"
+    total = 0
+    fd, path = tempfile.mkstemp(prefix=f"etl_{table}_", suffix=".tsv")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            for row in rows:
+                f.write("\t".join(_mysql_tsv_field(v) for v in row))
+                f.write("\n")
+                total += 1
+        cur.execute(f"DROP TEMPORARY TABLE IF EXISTS {stage}")
+        # Same column types as the target, but none of its keys.
+        cur.execute(f"CREATE TEMPORARY TABLE {stage} SELECT {cols} FROM {table} LIMIT 0")
+        infile = path.replace("\\", "/").replace("'", "\\'")
+        cur.execute(
+            f"LOAD DATA LOCAL INFILE '{infile}' INTO TABLE {stage} "
+            f"CHARACTER SET utf8mb4 ({cols})"
+        )
+        cur.execute(f"INSERT IGNORE INTO {table} ({cols}) SELECT {cols} FROM {stage}")
+        inserted = cur.rowcount
+        cur.execute(f"DROP TEMPORARY TABLE {stage}")
+    finally:
+        os.remove(path)
+    return total, inserted
+
+
+def _mysql_multirow_insert(cur, table: str, columns: List[str], rows: Iterable[Tuple]) -> Tuple[int, int]:
+    """INSERT IGNORE ... VALUES (...),(...) statements cut at half of max_allowed_packet."""
+    packet = _mysql_server_var(cur, "max_allowed_packet")
+    budget = max(int(packet or _MYSQL_DEFAULT_PACKET) // 2, 64 * 1024)
+    prefix = f"INSERT IGNORE INTO {table} ({', '.join(columns)}) VALUES "
+    row_sql = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    total = inserted = 0
+    params: List[Any] = []
+    count = 0
+    size = len(prefix)
+
+    def flush():
+        cur.execute(prefix + ", ".join([row_sql] * count), params)
+        return max(cur.rowcount, 0)
+
+    for row in rows:
+        # Rendered literal: quotes + worst-case escaping/multi-byte characters.
+        row_size = sum(2 * len(str(v)) + 3 for v in row) + 4
+        if count and size + row_size > budget:
+            inserted += flush()
+            params, count, size = [], 0, len(prefix)
+        params.extend(row)
+        count += 1
+        size += row_size
+        total += 1
+    if count:
+        inserted += flush()
+    return total, inserted
+
+
+# Foreign keys of the loaded tables (db/ddl/010_categories.sql, 020_geo_zip.sql,
+# 030_fk_v2_1.sql): table -> {column: (parent table, parent column)}
+FOREIGN_KEYS: Dict[str, Dict[str, Tuple[str, str]]] = {
+    "products": {"category_id": ("categories", "category_id")},
+    "customers": {"customer_zip_code_prefix": ("geo_zip", "geolocation_zip_code_prefix")},
+    "sellers": {"seller_zip_code_prefix": ("geo_zip", "geolocation_zip_code_prefix")},
+    "orders": {"customer_id": ("customers", "customer_id")},
+    "order_payments": {"order_id": ("orders", "order_id")},
+    "order_reviews": {"customer_id": ("customers", "customer_id")},
+    "order_items": {
+        "order_id": ("orders", "order_id"),
+        "product_id": ("products", "product_id"),
+        "seller_id": ("sellers", "seller_id"),
+    },
+}
+
+
+def _pg_drop_orphans(cur, table: str, stage: str, columns: List[str],
+                     foreign_keys: Dict[str, Tuple[str, str]]) -> int:
+    """Delete staged rows whose non-NULL FK value has no parent row; returns how many."""
+    dropped = 0
+    for column, (parent, parent_column) in foreign_keys.items():
+        if column not in columns:
+            continue
+        cur.execute(
+            f"DELETE FROM {stage} s WHERE s.{column} IS NOT NULL "
+            f"AND NOT EXISTS (SELECT 1 FROM {parent} p WHERE p.{parent_column} = s.{column})"
+        )
+        removed = max(cur.rowcount, 0)
+        if removed:
+            print(f"[{table}] skipped {removed} rows: {column} not in {parent}.{parent_column}")
+        dropped += removed
+    return dropped
+
+
+def bulk_load(cur, table: str, columns: List[str], rows: Iterable[Tuple],
+              foreign_keys: Dict[str, Tuple[str, str]] = None) -> int:
+    """
+    Idempotently load rows into ``table``; existing keys and rows whose
+    foreign key has no parent row are skipped.
+
+    PostgreSQL: rows are streamed with COPY into a temporary staging table,
+    staged rows violating ``foreign_keys`` are deleted (and counted), and the
+    rest is merged with a single INSERT ... SELECT ... ON CONFLICT DO NOTHING.
+    MySQL: rows are written to a temp file and loaded with LOAD DATA LOCAL
+    INFILE into a staging table when MYSQL_LOCAL_INFILE=1 and the server
+    allows it; otherwise multi-row INSERT IGNORE statements sized by
+    max_allowed_packet are used. INSERT IGNORE skips FK violations itself.
+
+    Prints rows/sec for the table when done.
+
+    Args:
+        cur: Cursor of the loader's connection (committed by the caller)
+        table: Target table
+        columns: Target column names, in the order of each row tuple
+        rows: Iterable of row tuples
+        foreign_keys: {column: (parent table, parent column)} to enforce
+            (default FOREIGN_KEYS[table])
+
+    Returns:
+        int: Number of rows sent to the database
+    """
+    from app.config import DB_CFG
+    vendor = DB_CFG.get("vendor", "postgres")
+    started = time.perf_counter()
+    if foreign_keys is None:
+        foreign_keys = FOREIGN_KEYS.get(table, {})
+    orphans = 0
+
+    if vendor == "postgres":
+        method = "COPY"
+        cols = ", ".join(columns)
+        stage = f"_stage_{table}"
+        total = 0
+        cur.execute(f"DROP TABLE IF EXISTS {stage}")
+        # Same column types as the target, but none of its constraints.
+        cur.execute(f"CREATE TEMP TABLE {stage} AS SELECT {cols} FROM {table} WITH NO DATA")
+        with cur.copy(f"COPY {stage} ({cols}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+                total += 1
+        # ON CONFLICT only covers unique keys; FK violations would abort the merge.
+        orphans = _pg_drop_orphans(cur, table, stage, columns, foreign_keys)
+        cur.execute(
+            f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {stage} ON CONFLICT DO NOTHING"
+        )
+        inserted = cur.rowcount
+        cur.execute(f"DROP TABLE {stage}")
+    elif _mysql_local_infile_enabled(cur):
+        method = "LOAD DATA"
+        total, inserted = _mysql_load_data(cur, table, columns, rows)
+    else:
+        method = "multi-row INSERT"
+        total, inserted = _mysql_multirow_insert(cur, table, columns, rows)
+
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed > 0 else float(total)
+    skipped = f", {orphans} without parent" if orphans else ""
+    print(f"[{table}] {method}: {total} rows ({inserted} new{skipped}) in {elapsed:.2f}s, {rate:,.0f} rows/s")
+    return total
+
+
+def bump_data_version(tables: List[str]):
+    """
+    Increment the data_version rows of ``tables`` (db/ddl/110_data_version.sql),
+    which changes the ETag of every endpoint reading them.
+
+    Best effort: skipped with DRY_RUN=1; failures (e.g. DDL not applied yet)
+    are printed, never raised.
+    """
+    if get_env_bool("DRY_RUN"):
+        return
+    from app.data_version import bump
+    from app.db.db import get_conn
+    try:
+        with get_conn() as conn, conn.cursor() as cur:
+            bump(cur, tables)
+            conn.commit()
+    except Exception as e:
+        print(f"[data_version] bump failed for {tables}: {e}")
+
+
+def invalidate_api_cache(tables: List[str]):
+    """
+    Record a write to ``tables``: bump their data_version, then tell a
+    running API to drop cached responses derived from them.
+
+    The API call is best effort: only active when CACHE_INVALIDATE_URL is set
+    (e.g. http://127.0.0.1:5000/cache/invalidate); failures are printed, never raised.
     """
-    batch: List[Tuple] = []
-    for r in rows:
-        batch.append(r)
-        if len(batch) >= batch_size:
-            yield batch
-            batch = []
-    if batch:
-        yield batch
+    bump_data_version(tables)
+    url = os.getenv("CACHE_INVALIDATE_URL", "").strip()
+    if not url:
+        return
+    req = urllib.request.Request(
+        url,
+        data=json.dumps({"tables": list(tables)}).encode("utf-8"),
+        headers={
+            "Content-Type": "application/json",
+            "X-Cache-Token": os.getenv("CACHE_ADMIN_TOKEN", ""),
+        },
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            print(f"[cache] invalidated {tables}: {resp.read().decode('utf-8', 'replace')}")
+    except Exception as e:
+        print(f"[cache] invalidation request failed ({url}): {e}")
@@ -3,56 +3,36 @@ Usage: python db/etl/load_categories.py data/raw/product_category_name_translati
 Parametrik INSERT kullan; executemany ile batch ekle.
 DRY_RUN=1 ile DB'siz veri önizleme.
 """
-from db.etl.etl_utils import get_env_bool, iter_batches, dry_insert_preview
-import csv
-from typing import Iterable, List, Tuple
+from db.etl.etl_utils import get_env_bool, csv_rows, dry_insert_preview, invalidate_api_cache, load_csv
 
-BATCH_SIZE = 5000
+# CSV kolonları ve tipleri (etl_utils.coerce_frame); tablo kolonları farklı isimde
+CATEGORIES_SCHEMA = {
+    "product_category_name": "str",
+    "product_category_name_english": "str",
+}
 
 
 def load_categories(csv_path: str):  # product_category_name_translation.csv
     """Load categories into categories(category_name, category_name_english).
-    Uses parametrized executemany in batches with ON CONFLICT DO NOTHING.
+    Uses etl_utils.load_csv: typed parsing plus bulk_load (COPY on Postgres,
+    LOAD DATA / multi-row INSERT IGNORE on MySQL), incremental if ETL_INCREMENTAL=1.
     """
     DRY_RUN = get_env_bool("DRY_RUN")
 
-    with open(csv_path, newline='', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        def gen_rows():
-            for row in reader:
-                name = (row.get('product_category_name') or '').strip() or None
-                name_en = (row.get('product_category_name_english') or '').strip() or None
-                if not name:
-                    continue
-                yield (name, name_en)
+    if DRY_RUN:
+        all_rows = list(csv_rows(csv_path, CATEGORIES_SCHEMA, required=("product_category_name",)))
+        dry_insert_preview("categories", all_rows, len(all_rows))
+        return
 
-        all_rows = list(gen_rows())
+    # Real DB insert
+    from app.db.db import get_conn
+    
+    with get_conn() as conn, conn.cursor() as cur:
+        total = load_csv(cur, "categories", csv_path, CATEGORIES_SCHEMA, required=("product_category_name",),
+                         columns=["category_name", "category_name_english"])
+        print(f"categories loaded: {total}")
+    invalidate_api_cache(["categories"])
 
-        if DRY_RUN:
-            dry_insert_preview("categories", all_rows, len(all_rows))
-            return
-
-        # Real DB insert
-        from app.db.db import get_conn
-        from app.config import DB_CFG
-        
-        vendor = DB_CFG.get("vendor", "postgres")
-        if vendor == "mysql":
-            sql = (
-                "INSERT IGNORE INTO categories(category_name, category_name_english) "
-                "VALUES (%s, %s)"
-            )
-        else:
-            sql = (
-                "INSERT INTO categories(category_name, category_name_english) "
-                "VALUES (%s, %s) ON CONFLICT (category_name) DO NOTHING"
-            )
-        with get_conn() as conn, conn.cursor() as cur:
-            total = 0
-            for batch in iter_batches(all_rows, BATCH_SIZE):
-                cur.executemany(sql, batch)
-                total += len(batch)
-            print(f"categories loaded: {total}")
 
 if __name__ == "__main__":
     import sys
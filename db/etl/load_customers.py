@@ -1,21 +1,18 @@
 import os, csv, sys
 from app.db.db import get_conn
-from typing import Iterable, List, Tuple
+from db.etl.etl_utils import invalidate_api_cache, load_csv
+
+# CSV kolonları ve tipleri (etl_utils.coerce_frame)
+CUSTOMERS_SCHEMA = {
+    "customer_id": "str",
+    "customer_unique_id": "str",
+    "customer_zip_code_prefix": "int",
+    "customer_city": "str",
+    "customer_state": "str",
+}
 
 DRY = os.getenv("DRY_RUN", "0") in ("1","true","True")
 EXPECTED_COLS = {"customer_id","customer_unique_id","customer_zip_code_prefix","customer_city","customer_state"}
-BATCH_SIZE = 5000
-
-def _iter_batches(rows: Iterable[Tuple], batch_size: int = BATCH_SIZE):
-    batch: List[Tuple] = []
-    for r in rows:
-        batch.append(r)
-        if len(batch) >= batch_size:
-            yield batch
-            batch = []
-    if batch:
-        yield batch
-
 def read_head(path, n=3):
     with open(path, "r", encoding="utf-8-sig") as f:
         r = csv.DictReader(f); cols=set(r.fieldnames or []); missing = EXPECTED_COLS - cols
@@ -28,33 +25,17 @@ def read_head(path, n=3):
 def count_rows(path):
     with open(path, "r", encoding="utf-8-sig") as f: return sum(1 for _ in f)-1
 
+def normalize_state(chunk):
+    """Eyalet kodları büyük harfle saklanır (/customers/by-state düz eşitlik + index kullanır)."""
+    chunk["customer_state"] = chunk["customer_state"].str.upper()
+    return chunk
+
 def load_customers(csv_path: str):
-    sql = (
-        "INSERT IGNORE INTO customers(customer_id, customer_unique_id, customer_zip_code_prefix, customer_city, customer_state) "
-        "VALUES (%s,%s,%s,%s,%s)"
-    )
-    with open(csv_path, newline='', encoding='utf-8-sig') as f, get_conn() as conn, conn.cursor() as cur:
-        reader = csv.DictReader(f)
-        def to_int(x):
-            try:
-                return int(x) if x not in (None, '') else None
-            except ValueError:
-                return None
-        def gen_rows():
-            for row in reader:
-                cid = (row.get('customer_id') or '').strip()
-                if not cid:
-                    continue
-                uid = (row.get('customer_unique_id') or '').strip() or None
-                zipi = to_int(row.get('customer_zip_code_prefix'))
-                city = (row.get('customer_city') or '').strip() or None
-                state = (row.get('customer_state') or '').strip() or None
-                yield (cid, uid, zipi, city, state)
-        total = 0
-        for batch in _iter_batches(gen_rows()):
-            cur.executemany(sql, batch)
-            total += len(batch)
+    with get_conn() as conn, conn.cursor() as cur:
+        total = load_csv(cur, "customers", csv_path, CUSTOMERS_SCHEMA, required=("customer_id",),
+                         transform=normalize_state)
         print(f"customers loaded: {total}")
+    invalidate_api_cache(["customers"])
 
 def main():
     if len(sys.argv)<2: print("Usage: python db/etl/load_customers.py <csv_path>"); sys.exit(1)
@@ -1,21 +1,18 @@
 import os, csv, sys
 from app.db.db import get_conn
-from typing import Iterable, List, Tuple
+from db.etl.etl_utils import invalidate_api_cache, load_csv
+
+# CSV kolonları ve tipleri (etl_utils.coerce_frame)
+GEO_ZIP_SCHEMA = {
+    "geolocation_zip_code_prefix": "int",
+    "geolocation_lat": "float",
+    "geolocation_lng": "float",
+    "geolocation_city": "str",
+    "geolocation_state": "str",
+}
 
 DRY = os.getenv("DRY_RUN", "0") in ("1","true","True")
 EXPECTED_COLS = {"geolocation_zip_code_prefix","geolocation_lat","geolocation_lng","geolocation_city","geolocation_state"}
-BATCH_SIZE = 5000
-
-def _iter_batches(rows: Iterable[Tuple], batch_size: int = BATCH_SIZE):
-    batch: List[Tuple] = []
-    for r in rows:
-        batch.append(r)
-        if len(batch) >= batch_size:
-            yield batch
-            batch = []
-    if batch:
-        yield batch
-
 def read_head(path, n=3):
     with open(path, "r", encoding="utf-8-sig") as f:
         r = csv.DictReader(f); cols = set(r.fieldnames or []); missing = EXPECTED_COLS - cols
@@ -29,37 +26,10 @@ def count_rows(path):
     with open(path, "r", encoding="utf-8-sig") as f: return sum(1 for _ in f)-1
 
 def load_geo_zip(csv_path: str):
-    sql = (
-        "INSERT IGNORE INTO geo_zip(geolocation_zip_code_prefix, geolocation_lat, geolocation_lng, geolocation_city, geolocation_state) "
-        "VALUES (%s,%s,%s,%s,%s)"
-    )
-    with open(csv_path, newline='', encoding='utf-8-sig') as f, get_conn() as conn, conn.cursor() as cur:
-        reader = csv.DictReader(f)
-        def to_int(x):
-            try:
-                return int(x) if x not in (None, '') else None
-            except ValueError:
-                return None
-        def to_float(x):
-            try:
-                return float(x) if x not in (None, '') else None
-            except ValueError:
-                return None
-        def gen_rows():
-            for row in reader:
-                zipi = to_int(row.get('geolocation_zip_code_prefix'))
-                if zipi is None:
-                    continue
-                lat = to_float(row.get('geolocation_lat'))
-                lng = to_float(row.get('geolocation_lng'))
-                city = (row.get('geolocation_city') or '').strip() or None
-                state = (row.get('geolocation_state') or '').strip() or None
-                yield (zipi, lat, lng, city, state)
-        total = 0
-        for batch in _iter_batches(gen_rows()):
-            cur.executemany(sql, batch)
-            total += len(batch)
+    with get_conn() as conn, conn.cursor() as cur:
+        total = load_csv(cur, "geo_zip", csv_path, GEO_ZIP_SCHEMA, required=("geolocation_zip_code_prefix",))
         print(f"geo_zip loaded: {total}")
+    invalidate_api_cache(["geo_zip"])
 
 def main():
     if len(sys.argv)<2: print("Usage: python db/etl/load_geo_zip.py <csv_path>"); sys.exit(1)
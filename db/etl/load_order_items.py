@@ -4,21 +4,19 @@ Parametrik INSERT kullan; executemany ile batch ekle.
 """
 import os  # <-- EKLE (DRY_RUN KONTROLÜ İÇİN)
 import csv
-from typing import Iterable, List, Tuple, Optional
 from app.db.db import get_conn
+from db.etl.etl_utils import invalidate_api_cache, load_csv
 
-BATCH_SIZE = 5000
-
-
-def _iter_batches(rows: Iterable[Tuple], batch_size: int = BATCH_SIZE):
-    batch: List[Tuple] = []
-    for r in rows:
-        batch.append(r)
-        if len(batch) >= batch_size:
-            yield batch
-            batch = []
-    if batch:
-        yield batch
+# CSV kolonları ve tipleri (etl_utils.coerce_frame)
+ORDER_ITEMS_SCHEMA = {
+    "order_id": "str",
+    "order_item_id": "int",
+    "product_id": "str",
+    "seller_id": "str",
+    "shipping_limit_date": "str",
+    "price": "float",
+    "freight_value": "float",
+}
 
 
 def load_order_items(csv_path: str):  # olist_order_items_dataset.csv
@@ -49,41 +47,10 @@ def load_order_items(csv_path: str):  # olist_order_items_dataset.csv
 
     # Orijinal kod (DRY_RUN = 0 ise buradan devam eder)
     print("DRY_RUN=0. Connecting to database for real load...")
-    sql = (
-        "INSERT IGNORE INTO order_items(order_id, order_item_id, product_id, seller_id, shipping_limit_date, price, freight_value) "
-        "VALUES (%s,%s,%s,%s,%s,%s,%s)"
-    )
-    with open(csv_path, newline='', encoding='utf-8-sig') as f, get_conn() as conn, conn.cursor() as cur:
-        reader = csv.DictReader(f)
-        def to_int(x: Optional[str]):
-            try:
-                return int(x) if x not in (None, '') else None
-            except ValueError:
-                return None
-        def to_float(x: Optional[str]):
-            try:
-                return float(x) if x not in (None, '') else None
-            except ValueError:
-                return None
-        def gen_rows():
-            for row in reader:
-                oid = (row.get('order_id') or '').strip()
-                if not oid:
-                    continue
-                item_id = to_int(row.get('order_item_id'))
-                pid = (row.get('product_id') or '').strip() or None
-                sid = (row.get('seller_id') or '').strip() or None
-                ship = (row.get('shipping_limit_date') or '').strip() or None
-                price = to_float(row.get('price'))
-                freight = to_float(row.get('freight_value'))
-                if item_id is None:
-                    continue
-                yield (oid, item_id, pid, sid, ship, price, freight)
-        total = 0
-        for batch in _iter_batches(gen_rows()):
-            cur.executemany(sql, batch)
-            total += len(batch)
+    with get_conn() as conn, conn.cursor() as cur:
+        total = load_csv(cur, "order_items", csv_path, ORDER_ITEMS_SCHEMA, required=("order_id", "order_item_id"))
         print(f"order_items loaded: {total}")
+    invalidate_api_cache(["order_items"])
 
 
 if __name__ == "__main__":
@@ -1,24 +1,28 @@
 """
-Usage: python db/etl/load_orders.py data/raw/olist_orders_dataset.csv
+Usage: python db/etl/load_orders.py data/raw/olist_orders_dataset.csv [--backfill-milestones]
 Parametrik INSERT kullan; executemany ile batch ekle.
+
+--backfill-milestones: 090_order_milestones.sql öncesinde yüklenmiş siparişlerin
+order_approved_at / order_delivered_customer_date kolonlarını CSV'den doldurur.
 """
 import os  # <-- EKLE (DRY_RUN KONTROLÜ İÇİN)
 import csv
-from typing import Iterable, List, Tuple
 from app.db.db import get_conn
+from app.config import DB_CFG
+from db.etl.etl_utils import bulk_load, csv_rows, invalidate_api_cache, load_csv
 
-BATCH_SIZE = 5000
-
+# CSV kolonları ve tipleri (etl_utils.coerce_frame)
+ORDERS_SCHEMA = {
+    "order_id": "str",
+    "customer_id": "str",
+    "order_status": "str",
+    "order_purchase_timestamp": "str",
+    "order_approved_at": "str",
+    "order_delivered_customer_date": "str",
+    "order_estimated_delivery_date": "str",
+}
 
-def _iter_batches(rows: Iterable[Tuple], batch_size: int = BATCH_SIZE):
-    batch: List[Tuple] = []
-    for r in rows:
-        batch.append(r)
-        if len(batch) >= batch_size:
-            yield batch
-            batch = []
-    if batch:
-        yield batch
+MILESTONE_COLUMNS = ["order_id", "order_approved_at", "order_delivered_customer_date"]
 
 
 def load_orders(csv_path: str):  # olist_orders_dataset.csv
@@ -52,34 +56,57 @@ def load_orders(csv_path: str):  # olist_orders_dataset.csv
 
     # Orijinal kod (DRY_RUN = 0 ise buradan devam eder)
     print("DRY_RUN=0. Connecting to database for real load...")
-    sql = (
-        "INSERT IGNORE INTO orders(order_id, customer_id, order_status, order_purchase_timestamp, order_estimated_delivery_date) "
-        "VALUES (%s,%s,%s,%s,%s)"
-    )
-    with open(csv_path, newline='', encoding='utf-8-sig') as f, get_conn() as conn, conn.cursor() as cur:
-        reader = csv.DictReader(f)
-        def gen_rows():
-            for row in reader:
-                oid = (row.get('order_id') or '').strip()
-                if not oid:
-                    continue
-                cid = (row.get('customer_id') or '').strip() or None
-                status = (row.get('order_status') or '').strip() or None
-                ts = (row.get('order_purchase_timestamp') or '').strip() or None
-                est = (row.get('order_estimated_delivery_date') or '').strip() or None
-                yield (oid, cid, status, ts, est)
-        
-        total = 0
-        for batch in _iter_batches(gen_rows()):
-            cur.executemany(sql, batch)
-            total += len(batch)
+    with get_conn() as conn, conn.cursor() as cur:
+        total = load_csv(cur, "orders", csv_path, ORDERS_SCHEMA, required=("order_id",), watermark_column="order_purchase_timestamp")
         print(f"orders loaded: {total}")
         print(f"[orders] batch loaded (DRY_RUN={DRY_RUN_ENV_VALUE})")
+    invalidate_api_cache(["orders"])
+
+
+def backfill_milestones(csv_path: str):
+    """
+    Mevcut siparişlerde boş kalan milestone kolonlarını CSV'den doldurur.
+    bulk_load ile geçici tabloya yükler, tek UPDATE ... JOIN ile uygular.
+    """
+    schema = {c: "str" for c in MILESTONE_COLUMNS}
+    with get_conn() as conn, conn.cursor() as cur:
+        if DB_CFG.get("vendor") == "mysql":
+            cur.execute("CREATE TEMPORARY TABLE _order_milestones "
+                        "(order_id VARCHAR(50) PRIMARY KEY, order_approved_at DATETIME, "
+                        "order_delivered_customer_date DATETIME)")
+            update_sql = """
+            UPDATE orders o
+            JOIN _order_milestones m ON m.order_id = o.order_id
+            SET o.order_approved_at = m.order_approved_at,
+                o.order_delivered_customer_date = m.order_delivered_customer_date
+            WHERE o.order_approved_at IS NULL AND o.order_delivered_customer_date IS NULL
+            """
+        else:
+            cur.execute("CREATE TEMP TABLE _order_milestones "
+                        "(order_id TEXT PRIMARY KEY, order_approved_at TIMESTAMP, "
+                        "order_delivered_customer_date TIMESTAMP)")
+            update_sql = """
+            UPDATE orders o
+            SET order_approved_at = m.order_approved_at,
+                order_delivered_customer_date = m.order_delivered_customer_date
+            FROM _order_milestones m
+            WHERE m.order_id = o.order_id
+              AND o.order_approved_at IS NULL AND o.order_delivered_customer_date IS NULL
+            """
+        bulk_load(cur, "_order_milestones", MILESTONE_COLUMNS,
+                  csv_rows(csv_path, schema, required=("order_id",)))
+        cur.execute(update_sql)
+        print(f"orders milestones backfilled: {cur.rowcount}")
+        conn.commit()
+    invalidate_api_cache(["orders"])
 
 
 if __name__ == "__main__":
     import sys
     if len(sys.argv) < 2:
-        print("Usage: python db/etl/load_orders.py <csv_path>")
+        print("Usage: python db/etl/load_orders.py <csv_path> [--backfill-milestones]")
         sys.exit(1)
-    load_orders(sys.argv[1])
\ No newline at end of file
+    if "--backfill-milestones" in sys.argv[2:]:
+        backfill_milestones(sys.argv[1])
+    else:
+        load_orders(sys.argv[1])
\ No newline at end of file
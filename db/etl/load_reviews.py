@@ -2,77 +2,80 @@
 Usage: python db/etl/load_reviews.py data/raw/olist_order_reviews_dataset.csv
 Parametrik INSERT kullan; executemany ile batch ekle.
 """
+from app.config import DB_CFG
 from app.db.db import get_conn
-import csv
-from typing import Iterable, List, Tuple, Optional
+from db.etl.etl_utils import invalidate_api_cache, load_csv
 
-BATCH_SIZE = 5000
+# CSV kolonları ve tipleri (etl_utils.coerce_frame)
+REVIEWS_SCHEMA = {
+    "review_id": "str",
+    "order_id": "str",
+    "review_score": "int",
+    "review_comment_message": "str",
+    "review_creation_date": "str",
+}
 
 
-def _iter_batches(rows: Iterable[Tuple], batch_size: int = BATCH_SIZE):
-    batch: List[Tuple] = []
-    for r in rows:
-        batch.append(r)
-        if len(batch) >= batch_size:
-            yield batch
-            batch = []
-    if batch:
-        yield batch
+def _customer_id_nullable(cur):
+    """(is order_reviews.customer_id nullable?, its column type) from information_schema."""
+    if DB_CFG.get("vendor") == "mysql":
+        cur.execute(
+            "SELECT is_nullable, column_type FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = 'order_reviews' AND column_name = 'customer_id'"
+        )
+    else:
+        cur.execute(
+            "SELECT is_nullable, data_type FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = 'order_reviews' AND column_name = 'customer_id'"
+        )
+    row = cur.fetchone()
+    return (row is None or row[0] == "YES"), (row[1] if row else None)
 
 
 def load_reviews(csv_path: str):  # olist_order_reviews_dataset.csv
     """
-    Loads reviews without customer_id (NULL), then updates from orders table,
-    checks orphans, and tightens NOT NULL if safe.
+    Loads reviews with customer_id resolved from orders while loading
+    (order_id -> customer_id map read once), then tightens NOT NULL on
+    customer_id if the column is still nullable and no NULLs remain.
     """
-    insert_sql = (
-        "INSERT IGNORE INTO order_reviews(review_id, order_id, review_score, review_comment_message, review_creation_date) "
-        "VALUES (%s,%s,%s,%s,%s)"
-    )
-    with open(csv_path, newline='', encoding='utf-8-sig') as f, get_conn() as conn, conn.cursor() as cur:
-        reader = csv.DictReader(f)
-        def to_int(x: Optional[str]):
-            try:
-                return int(x) if x not in (None, '') else None
-            except ValueError:
-                return None
-        def gen_rows():
-            for row in reader:
-                rid = (row.get('review_id') or '').strip()
-                if not rid:
-                    continue
-                oid = (row.get('order_id') or '').strip() or None
-                score = to_int(row.get('review_score'))
-                msg = row.get('review_comment_message')
-                if msg is not None:
-                    msg = msg.strip() or None
-                cdate = (row.get('review_creation_date') or '').strip() or None
-                yield (rid, oid, score, msg, cdate)
-        total = 0
-        for batch in _iter_batches(gen_rows()):
-            cur.executemany(insert_sql, batch)
-            total += len(batch)
+    columns = list(REVIEWS_SCHEMA) + ["customer_id"]
+    with get_conn() as conn, conn.cursor() as cur:
+        # order_id -> customer_id, tek sorgu
+        cur.execute("SELECT order_id, customer_id FROM orders")
+        order_customers = dict(cur.fetchall())
+        nullable, column_type = _customer_id_nullable(cur)
+        unresolved = {"rows": 0}
+
+        def resolve_customer(chunk):
+            chunk = chunk.assign(customer_id=chunk["order_id"].map(order_customers).astype("string"))
+            missing = chunk["customer_id"].isna()
+            unresolved["rows"] += int(missing.sum())
+            # NOT NULL kolona NULL gönderme: siparişi olmayan yorumları at
+            return chunk if nullable else chunk[~missing]
+
+        total = load_csv(cur, "order_reviews", csv_path, REVIEWS_SCHEMA, required=("review_id",),
+                         columns=columns, watermark_column="review_creation_date", transform=resolve_customer)
         print(f"order_reviews loaded: {total}")
+        if unresolved["rows"]:
+            action = "loaded with NULL customer_id" if nullable else "skipped (customer_id is NOT NULL)"
+            print(f"order_reviews without a matching order: {unresolved['rows']} rows {action}")
 
-        # Update customer_id from orders after load
-        print("Updating order_reviews.customer_id from orders...")
-        cur.execute(
-            """
-            UPDATE order_reviews r
-            JOIN orders o ON r.order_id = o.order_id
-            SET r.customer_id = o.customer_id
-            WHERE r.customer_id IS NULL
-            """
-        )
-        # Orphan check (customer_id still NULL?)
-        cur.execute("SELECT COUNT(*) FROM order_reviews WHERE customer_id IS NULL")
-        (orphans,) = cur.fetchone()
-        print(f"order_reviews.customer_id NULL count: {orphans}")
-        if orphans == 0:
-            print("Tightening NOT NULL on order_reviews.customer_id...")
-            cur.execute("ALTER TABLE order_reviews MODIFY customer_id VARCHAR(255) NOT NULL")
+        if not nullable:
+            print("order_reviews.customer_id is already NOT NULL.")
         else:
-            print("Skipping NOT NULL alter due to remaining NULLs.")
+            # Orphan check (customer_id still NULL?), also covers rows from earlier loads
+            cur.execute("SELECT COUNT(*) FROM order_reviews WHERE customer_id IS NULL")
+            (orphans,) = cur.fetchone()
+            print(f"order_reviews.customer_id NULL count: {orphans}")
+            if orphans == 0 and column_type:
+                print("Tightening NOT NULL on order_reviews.customer_id...")
+                if DB_CFG.get("vendor") == "mysql":
+                    cur.execute(f"ALTER TABLE order_reviews MODIFY customer_id {column_type} NOT NULL")
+                else:
+                    cur.execute("ALTER TABLE order_reviews ALTER COLUMN customer_id SET NOT NULL")
+            else:
+                print("Skipping NOT NULL alter due to remaining NULLs.")
+    invalidate_api_cache(["order_reviews"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,121 @@
+"""
+Usage: python db/etl/refresh_distance_stats.py
+
+Rebuilds analytics_distance_delivery (db/ddl/100_analytics_distance_delivery.sql):
+seller -> customer shipping distance buckets vs. average delivery days and
+freight value, served by /analytics/distance-vs-delivery.
+
+One query pulls every delivered order item with the geo_zip coordinates of
+its seller and customer; distances, delivery days and the per-bucket
+averages are then computed with NumPy over whole columns (no per-row
+Python). Run after the ETL loaders (python -m db.etl.run does this).
+"""
+import time
+
+import numpy as np
+
+from app.config import DB_CFG
+from app.db.db import get_conn
+from app.geo_index import haversine_km
+from db.etl.etl_utils import invalidate_api_cache
+
+# Lower bucket edges in km; the last bucket is open-ended
+BUCKET_EDGES_KM = [0, 50, 100, 200, 400, 800, 1600]
+
+SOURCE_SQL = """
+SELECT
+    sg.geolocation_lat,
+    sg.geolocation_lng,
+    cg.geolocation_lat,
+    cg.geolocation_lng,
+    o.order_purchase_timestamp,
+    o.order_delivered_customer_date,
+    oi.freight_value
+FROM order_items oi
+JOIN orders o ON o.order_id = oi.order_id
+JOIN sellers s ON s.seller_id = oi.seller_id
+JOIN geo_zip sg ON sg.geolocation_zip_code_prefix = s.seller_zip_code_prefix
+JOIN customers c ON c.customer_id = o.customer_id
+JOIN geo_zip cg ON cg.geolocation_zip_code_prefix = c.customer_zip_code_prefix
+WHERE o.order_status = 'delivered'
+  AND o.order_delivered_customer_date IS NOT NULL
+  AND o.order_purchase_timestamp IS NOT NULL
+"""
+
+INSERT_SQL = """
+INSERT INTO analytics_distance_delivery
+    (bucket_no, min_km, max_km, items, avg_distance_km, avg_delivery_days, avg_freight_value)
+VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def _bucket_mean(bucket, values, n_buckets):
+    """Per-bucket mean of ``values`` ignoring NaN; None for buckets without values."""
+    valid = ~np.isnan(values)
+    counts = np.bincount(bucket[valid], minlength=n_buckets)
+    sums = np.bincount(bucket[valid], weights=values[valid], minlength=n_buckets)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    return [None if c == 0 else float(m) for c, m in zip(counts, means)]
+
+
+def compute_buckets(seller_lat, seller_lng, customer_lat, customer_lng, purchased, delivered, freight,
+                    edges=BUCKET_EDGES_KM):
+    """
+    Distance-bucket averages over whole columns.
+
+    Returns:
+        list: (bucket_no, min_km, max_km, items, avg_distance_km, avg_delivery_days, avg_freight_value)
+    """
+    distance = haversine_km(seller_lat, seller_lng, customer_lat, customer_lng)
+    days = (np.asarray(delivered, dtype="datetime64[s]") - np.asarray(purchased, dtype="datetime64[s]")) \
+        / np.timedelta64(1, "D")
+    freight = np.asarray(freight, dtype=np.float64)
+    bucket = np.digitize(distance, edges[1:])  # 0 .. len(edges) - 1
+    n = len(edges)
+
+    items = np.bincount(bucket, minlength=n)
+    avg_distance = _bucket_mean(bucket, distance, n)
+    avg_days = _bucket_mean(bucket, days.astype(np.float64), n)
+    avg_freight = _bucket_mean(bucket, freight, n)
+
+    def rounded(v, digits):
+        return None if v is None else round(v, digits)
+
+    return [
+        (i, edges[i], edges[i + 1] if i + 1 < n else None, int(items[i]),
+         rounded(avg_distance[i], 1), rounded(avg_days[i], 2), rounded(avg_freight[i], 2))
+        for i in range(n)
+    ]
+
+
+def refresh_distance_stats():
+    """Recompute analytics_distance_delivery. Returns the number of order items measured."""
+    started = time.perf_counter()
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute(SOURCE_SQL)
+        rows = cur.fetchall()
+        columns = list(zip(*rows)) if rows else [()] * 7
+        buckets = compute_buckets(
+            np.array(columns[0], dtype=np.float64),
+            np.array(columns[1], dtype=np.float64),
+            np.array(columns[2], dtype=np.float64),
+            np.array(columns[3], dtype=np.float64),
+            columns[4],
+            columns[5],
+            np.array(columns[6], dtype=np.float64),
+        )
+        if DB_CFG.get("vendor", "postgres") == "mysql":
+            # Connection is autocommit; group DELETE + INSERT explicitly.
+            cur.execute("START TRANSACTION")
+        cur.execute("DELETE FROM analytics_distance_delivery")
+        cur.executemany(INSERT_SQL, buckets)
+        conn.commit()
+    print(f"analytics_distance_delivery refreshed: {len(rows)} items in "
+          f"{len(buckets)} buckets, {time.perf_counter() - started:.2f}s")
+    invalidate_api_cache(["analytics_distance_delivery"])
+    return len(rows)
+
+
+if __name__ == "__main__":
+    refresh_distance_stats()
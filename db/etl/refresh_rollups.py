@@ -0,0 +1,127 @@
+"""
+Usage: python db/etl/refresh_rollups.py [--customer-geo]
+
+Rebuilds the analytics rollup tables (db/ddl/050_analytics_rollups.sql):
+- analytics_category_rollup: per product category
+- analytics_seller_rollup:   per seller
+
+With --customer-geo it rebuilds the customer geo projection instead
+(db/ddl/080_customer_geo.sql): customer_geo plus its per-state counts.
+The customer CRUD routes keep it current between loads
+(app/customer_geo.py).
+
+Run after the ETL loaders (python -m db.etl.run does this) or on a
+schedule, e.g. cron: */30 * * * * cd /srv/olist && PYTHONPATH=. python db/etl/refresh_rollups.py
+
+Each table is rebuilt with DELETE + INSERT ... SELECT inside one transaction,
+so readers keep seeing the previous snapshot until the commit.
+"""
+import sys
+import time
+
+from app.db.db import get_conn
+from app.config import DB_CFG
+from db.etl.etl_utils import invalidate_api_cache
+
+CATEGORY_REFRESH_SQL = """
+INSERT INTO analytics_category_rollup
+    (category_name, items_sold, distinct_orders, revenue_sum, price_sum, price_count)
+SELECT
+    COALESCE(p.product_category_name, 'Unknown') AS category_name,
+    COUNT(*) AS items_sold,
+    COUNT(DISTINCT oi.order_id) AS distinct_orders,
+    COALESCE(SUM(oi.price + oi.freight_value), 0) AS revenue_sum,
+    COALESCE(SUM(oi.price), 0) AS price_sum,
+    COUNT(oi.price) AS price_count
+FROM order_items oi
+JOIN products p ON p.product_id = oi.product_id
+JOIN orders o ON o.order_id = oi.order_id
+WHERE o.order_status = 'delivered'
+GROUP BY COALESCE(p.product_category_name, 'Unknown')
+"""
+
+SELLER_REFRESH_SQL = """
+INSERT INTO analytics_seller_rollup
+    (seller_id, seller_city, seller_state, items_sold, distinct_orders, revenue_sum, price_sum, price_count)
+SELECT
+    s.seller_id,
+    s.seller_city,
+    s.seller_state,
+    COUNT(*) AS items_sold,
+    COUNT(DISTINCT oi.order_id) AS distinct_orders,
+    COALESCE(SUM(oi.price + oi.freight_value), 0) AS revenue_sum,
+    COALESCE(SUM(oi.price), 0) AS price_sum,
+    COUNT(oi.price) AS price_count
+FROM order_items oi
+JOIN sellers s ON s.seller_id = oi.seller_id
+JOIN orders o ON o.order_id = oi.order_id
+WHERE o.order_status = 'delivered'
+GROUP BY s.seller_id, s.seller_city, s.seller_state
+"""
+
+ROLLUPS = [
+    ("analytics_category_rollup", CATEGORY_REFRESH_SQL),
+    ("analytics_seller_rollup", SELLER_REFRESH_SQL),
+]
+
+CUSTOMER_GEO_REFRESH_SQL = """
+INSERT INTO customer_geo (customer_id, zip_code_prefix, lat, lng, city, state)
+SELECT
+    c.customer_id,
+    c.customer_zip_code_prefix,
+    g.geolocation_lat,
+    g.geolocation_lng,
+    g.geolocation_city,
+    g.geolocation_state
+FROM customers c
+JOIN geo_zip g ON g.geolocation_zip_code_prefix = c.customer_zip_code_prefix
+"""
+
+STATE_COUNTS_REFRESH_SQL = """
+INSERT INTO customer_geo_state_counts (state, customer_count)
+SELECT state, COUNT(*)
+FROM customer_geo
+WHERE state IS NOT NULL
+GROUP BY state
+"""
+
+# State counts are derived from customer_geo, so it has to be rebuilt first.
+CUSTOMER_GEO = [
+    ("customer_geo", CUSTOMER_GEO_REFRESH_SQL),
+    ("customer_geo_state_counts", STATE_COUNTS_REFRESH_SQL),
+]
+
+
+def refresh_rollups():
+    """Rebuild every rollup table. Returns {table: row_count}."""
+    return _rebuild(ROLLUPS)
+
+
+def refresh_customer_geo():
+    """Rebuild the customer geo projection and its counts. Returns {table: row_count}."""
+    return _rebuild(CUSTOMER_GEO)
+
+
+def _rebuild(tables):
+    vendor = DB_CFG.get("vendor", "postgres")
+    counts = {}
+    with get_conn() as conn, conn.cursor() as cur:
+        for table, insert_sql in tables:
+            started = time.perf_counter()
+            if vendor == "mysql":
+                # Connection is autocommit; group DELETE + INSERT explicitly.
+                cur.execute("START TRANSACTION")
+            cur.execute(f"DELETE FROM {table}")
+            cur.execute(insert_sql)
+            counts[table] = cur.rowcount
+            conn.commit()
+            print(f"{table} refreshed: {counts[table]} rows in {time.perf_counter() - started:.2f}s")
+    invalidate_api_cache(list(counts))
+    return counts
+
+
+if __name__ == "__main__":
+    if "--customer-geo" in sys.argv[1:]:
+        refresh_customer_geo()
+    else:
+        refresh_rollups()
@@ -0,0 +1,185 @@
+"""
+Run the whole ETL pipeline in dependency order, loading independent tables in parallel.
+
+Usage: PYTHONPATH=. python -m db.etl.run [--data-dir data/raw] [--workers 4] [--only orders,order_items]
+                                         [--incremental]
+
+Each step runs in a worker process of a process pool; a step is submitted as
+soon as every table it references through a foreign key has been loaded:
+
+    categories         -> products
+    geo_zip            -> customers, sellers
+    customers          -> orders, customer_geo
+    orders             -> order_items, order_payments, order_reviews
+    products, sellers  -> order_items
+    order_items        -> rollups, distance_stats
+
+Workers are reused across steps and each step holds a single connection for
+its whole load. With --only, the other steps are treated as already loaded.
+DRY_RUN=1 prints the execution plan without touching the database.
+--incremental compares each CSV with its etl_runs fingerprint and only loads
+what changed (see etl_utils.load_csv).
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# name: (module, function, csv file or None, dependencies)
+STEPS = {
+    "categories": ("db.etl.load_categories", "load_categories", "product_category_name_translation.csv", ()),
+    "geo_zip": ("db.etl.load_geo_zip", "load_geo_zip", "olist_geolocation_dataset.csv", ()),
+    "products": ("db.etl.load_products", "load_products", "olist_products_dataset.csv", ("categories",)),
+    "customers": ("db.etl.load_customers", "load_customers", "olist_customers_dataset.csv", ("geo_zip",)),
+    "sellers": ("db.etl.load_sellers", "load_sellers", "olist_sellers_dataset.csv", ("geo_zip",)),
+    "orders": ("db.etl.load_orders", "load_orders", "olist_orders_dataset.csv", ("customers",)),
+    "order_items": ("db.etl.load_order_items", "load_order_items", "olist_order_items_dataset.csv",
+                    ("orders", "products", "sellers")),
+    "order_payments": ("db.etl.load_payments", "load_payments", "olist_order_payments_dataset.csv", ("orders",)),
+    # Reviews take customer_id from the already loaded orders.
+    "order_reviews": ("db.etl.load_reviews", "load_reviews", "olist_order_reviews_dataset.csv",
+                      ("orders", "customers")),
+    "rollups": ("db.etl.refresh_rollups", "refresh_rollups", None, ("order_items", "products", "sellers")),
+    "customer_geo": ("db.etl.refresh_rollups", "refresh_customer_geo", None, ("customers", "geo_zip")),
+    "distance_stats": ("db.etl.refresh_distance_stats", "refresh_distance_stats", None,
+                       ("order_items", "customers", "sellers", "geo_zip")),
+}
+
+
+def plan_stages(steps):
+    """
+    Group steps into stages; every step of a stage only depends on earlier stages.
+
+    Raises:
+        ValueError: On unknown dependencies or a dependency cycle
+    """
+    remaining = {name: set(deps) for name, (_, _, _, deps) in steps.items()}
+    for name, deps in remaining.items():
+        unknown = deps - set(steps)
+        if unknown:
+            raise ValueError(f"{name} depends on unknown step(s): {', '.join(sorted(unknown))}")
+    stages = []
+    done = set()
+    while remaining:
+        ready = sorted(name for name, deps in remaining.items() if deps <= done)
+        if not ready:
+            raise ValueError(f"dependency cycle between: {', '.join(sorted(remaining))}")
+        stages.append(ready)
+        done.update(ready)
+        for name in ready:
+            del remaining[name]
+    return stages
+
+
+def _run_step(name, module, func, csv_path):
+    """Worker entry point: import the loader and run it. Returns elapsed seconds."""
+    started = time.perf_counter()
+    loader = getattr(importlib.import_module(module), func)
+    if csv_path is None:
+        loader()
+    else:
+        loader(csv_path)
+    return time.perf_counter() - started
+
+
+def run_pipeline(steps, data_dir, workers, executor_cls=ProcessPoolExecutor):
+    """
+    Execute ``steps`` on a pool of ``workers`` processes.
+
+    A failed step stops new submissions; steps already running finish.
+
+    Returns:
+        dict: {name: (status, seconds)} with status "ok", "failed: ..." or "skipped"
+    """
+    pending = {name: set(deps) for name, (_, _, _, deps) in steps.items()}
+    done = set()
+    results = {}
+    running = {}
+    failed = False
+
+    with executor_cls(max_workers=workers) as pool:
+        while pending or running:
+            if not failed:
+                for name in sorted(n for n, deps in pending.items() if deps <= done):
+                    module, func, csv_name, _ = steps[name]
+                    csv_path = os.path.join(data_dir, csv_name) if csv_name else None
+                    print(f"[etl] start {name}")
+                    running[pool.submit(_run_step, name, module, func, csv_path)] = name
+                    del pending[name]
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    failed = True
+                    results[name] = (f"failed: {type(e).__name__}: {e}", None)
+                    print(f"[etl] FAILED {name}: {e}")
+                else:
+                    done.add(name)
+                    results[name] = ("ok", seconds)
+                    print(f"[etl] done {name} in {seconds:.2f}s")
+
+    for name in pending:
+        results[name] = ("skipped", None)
+    return results
+
+
+def print_summary(results, wall_seconds):
+    print()
+    print(f"{'step':<16} {'status':<8} {'seconds':>8}")
+    print("-" * 34)
+    for name in STEPS:
+        if name not in results:
+            continue
+        status, seconds = results[name]
+        shown = f"{seconds:8.2f}" if seconds is not None else f"{'-':>8}"
+        print(f"{name:<16} {status.split(':')[0]:<8} {shown}")
+    busy = sum(s for _, s in results.values() if s is not None)
+    print("-" * 34)
+    print(f"wall clock {wall_seconds:.2f}s, sum of steps {busy:.2f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run all ETL loaders in FK dependency order.")
+    parser.add_argument("--data-dir", default="data/raw", help="directory holding the Olist CSV files")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="loader processes (each holds one DB connection)")
+    parser.add_argument("--only", default="",
+                        help="comma separated steps to run; the others are assumed loaded")
+    parser.add_argument("--incremental", action="store_true",
+                        help="skip unchanged CSV files and load only appended rows (ETL_INCREMENTAL=1)")
+    args = parser.parse_args(argv)
+    if args.incremental:
+        os.environ["ETL_INCREMENTAL"] = "1"  # inherited by the worker processes
+
+    steps = STEPS
+    if args.only:
+        wanted = {s.strip() for s in args.only.split(",") if s.strip()}
+        unknown = wanted - set(STEPS)
+        if unknown:
+            parser.error(f"unknown step(s): {', '.join(sorted(unknown))}")
+        steps = {
+            name: (module, func, csv_name, tuple(d for d in deps if d in wanted))
+            for name, (module, func, csv_name, deps) in STEPS.items() if name in wanted
+        }
+
+    stages = plan_stages(steps)
+    if os.getenv("DRY_RUN", "0") in ("1", "true", "True"):
+        print("[DRY_RUN] ETL plan (steps in the same stage run in parallel):")
+        for i, stage in enumerate(stages, 1):
+            print(f"  stage {i}: {', '.join(stage)}")
+        return 0
+
+    started = time.perf_counter()
+    results = run_pipeline(steps, args.data_dir, max(1, args.workers))
+    print_summary(results, time.perf_counter() - started)
+    return 0 if all(status == "ok" for status, _ in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
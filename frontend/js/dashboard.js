@@ -0,0 +1,64 @@
+"use strict";
+
+const API_BASE_DASHBOARD = window.API_BASE_URL || 'http://127.0.0.1:5000';
+
+/**
+ * Overview KPIs from GET /dashboard/summary: one request (and one cached
+ * response) instead of /orders/stats, /products/stats, /payments/stats and
+ * /reviews/stats separately.
+ */
+async function loadDashboardSummary() {
+    const errorDiv = document.getElementById("dashboard-error");
+    const resultsDiv = document.getElementById("dashboard-results");
+
+    errorDiv.textContent = "";
+    resultsDiv.innerHTML = "<p>Loading...</p>";
+
+    let response = null;
+    try {
+        response = await fetch(`${API_BASE_DASHBOARD}/dashboard/summary`);
+
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        const data = await response.json();
+        const { orders, products, payments, reviews } = data;
+
+        let html = `<div class="stats-summary">`;
+        html += `<p><strong>Orders:</strong> ${orders.total_orders.toLocaleString()}`
+              + ` (${orders.total_items.toLocaleString()} items, ${orders.avg_items_per_order.toFixed(2)} per order)</p>`;
+        html += `<p><strong>Products:</strong> ${products.total_products.toLocaleString()}`
+              + ` in ${products.total_categories.toLocaleString()} categories</p>`;
+        html += `<p><strong>Payments:</strong> ${payments.total_payments.toLocaleString()}`
+              + ` totalling ${payments.total_value.toFixed(2)} (avg ${payments.avg_payment_value.toFixed(2)})</p>`;
+        html += `<p><strong>Reviews:</strong> ${reviews.total_reviews.toLocaleString()}`
+              + ` (avg score ${reviews.avg_score.toFixed(2)})</p>`;
+        html += `</div>`;
+
+        if (payments.payment_types.length > 0) {
+            html += `<table><thead><tr><th>Payment Type</th><th>Count</th><th>Total</th></tr></thead><tbody>`;
+            for (const p of payments.payment_types) {
+                html += `<tr><td>${p.type}</td><td>${p.count.toLocaleString()}</td><td>${p.total.toFixed(2)}</td></tr>`;
+            }
+            html += `</tbody></table>`;
+        }
+
+        resultsDiv.innerHTML = html;
+
+    } catch (error) {
+        console.error("Error loading dashboard summary:", error);
+        const errorMsg = window.handleFetchError ? window.handleFetchError(error, response) : "Network error";
+        errorDiv.textContent = `❌ ${errorMsg}`;
+        resultsDiv.innerHTML = "";
+    }
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+    const button = document.getElementById("dashboard-summary-btn");
+    if (button) {
+        button.addEventListener("click", loadDashboardSummary);
+    }
+
+    console.log("dashboard.js loaded - Dashboard summary UI ready");
+});
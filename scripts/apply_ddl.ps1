@@ -4,4 +4,11 @@ psql -U $User -d $Db -f db/ddl/010_categories.sql
 psql -U $User -d $Db -f db/ddl/020_geo_zip.sql
 psql -U $User -d $Db -f db/ddl/030_fk_v2_1.sql
 psql -U $User -d $Db -f db/ddl/040_indexes.sql
+psql -U $User -d $Db -f db/ddl/050_analytics_rollups.sql
+psql -U $User -d $Db -f db/ddl/060_etl_runs.sql
+psql -U $User -d $Db -f db/ddl/070_route_indexes.sql
+psql -U $User -d $Db -f db/ddl/080_customer_geo.sql
+psql -U $User -d $Db -f db/ddl/090_order_milestones.sql
+psql -U $User -d $Db -f db/ddl/100_analytics_distance_delivery.sql
+psql -U $User -d $Db -f db/ddl/110_data_version.sql
 Write-Host "DDL applied."
\ No newline at end of file
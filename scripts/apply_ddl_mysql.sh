@@ -30,6 +30,13 @@ DDL_FILES=(
     "db/ddl_mysql/020_geo_zip.sql"
     "db/ddl_mysql/030_fk_v2_1.sql"
     "db/ddl_mysql/040_indexes.sql"
+    "db/ddl_mysql/050_analytics_rollups.sql"
+    "db/ddl_mysql/060_etl_runs.sql"
+    "db/ddl_mysql/070_route_indexes.sql"
+    "db/ddl_mysql/080_customer_geo.sql"
+    "db/ddl_mysql/090_order_milestones.sql"
+    "db/ddl_mysql/100_analytics_distance_delivery.sql"
+    "db/ddl_mysql/110_data_version.sql"
 )
 
 for ddl_file in "${DDL_FILES[@]}"; do
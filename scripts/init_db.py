@@ -21,6 +21,13 @@ DDL_FILES = [
     "db/ddl/020_geo_zip.sql",
     "db/ddl/030_fk_v2_1.sql",
     "db/ddl/040_indexes.sql",
+    "db/ddl/050_analytics_rollups.sql",
+    "db/ddl/060_etl_runs.sql",
+    "db/ddl/070_route_indexes.sql",
+    "db/ddl/080_customer_geo.sql",
+    "db/ddl/090_order_milestones.sql",
+    "db/ddl/100_analytics_distance_delivery.sql",
+    "db/ddl/110_data_version.sql",
 ]
 
 
@@ -1,6 +1,6 @@
 #!/bin/bash
 # Run all ETL scripts in the correct order
-# Usage: ./scripts/run_all_etls.sh
+# Usage: ./scripts/run_all_etls.sh [--workers N] [--only step1,step2]
 
 echo "======================================"
 echo "Running All ETL Scripts"
@@ -9,29 +9,14 @@ echo ""
 
 export PYTHONPATH=.
 
-ETL_SCRIPTS=(
-    "db/etl/load_categories.py data/raw/product_category_name_translation.csv"
-    "db/etl/load_geo_zip.py data/raw/olist_geolocation_dataset.csv"
-    "db/etl/load_products.py data/raw/olist_products_dataset.csv"
-    "db/etl/load_customers.py data/raw/olist_customers_dataset.csv"
-    "db/etl/load_sellers.py data/raw/olist_sellers_dataset.csv"
-    "db/etl/load_orders.py data/raw/olist_orders_dataset.csv"
-    "db/etl/load_order_items.py data/raw/olist_order_items_dataset.csv"
-    "db/etl/load_payments.py data/raw/olist_order_payments_dataset.csv"
-    "db/etl/load_reviews.py data/raw/olist_order_reviews_dataset.csv"
-)
-
-for etl in "${ETL_SCRIPTS[@]}"; do
-    echo "Running: venv/bin/python $etl"
-    venv/bin/python $etl
-    if [ $? -eq 0 ]; then
-        echo "✓ Completed successfully"
-    else
-        echo "✗ Failed"
-        exit 1
-    fi
-    echo ""
-done
+# Loaders run in FK dependency order; independent tables load in parallel.
+# Extra arguments are passed through (e.g. --workers 2, --only orders,order_items).
+echo "Running: venv/bin/python -m db.etl.run $*"
+if ! venv/bin/python -m db.etl.run "$@"; then
+    echo "✗ Failed"
+    exit 1
+fi
+echo ""
 
 echo "======================================"
 echo "✓ All ETL scripts completed!"
@@ -1,7 +1,7 @@
 # ============================================================================
 # Run All ETL Scripts for Windows
 # ============================================================================
-# Runs all ETL scripts in the correct dependency order.
+# Runs all ETL loaders in dependency order via the parallel orchestrator.
 # Run from repo root: .\scripts\run_etl_all.ps1
 #
 # Prerequisites:
@@ -62,57 +62,21 @@ if (-not (Test-Path $pythonPath)) {
     exit 1
 }
 
-# ETL scripts in dependency order
-$etlScripts = @(
-    "load_categories.py",
-    "load_geo_zip.py",
-    "load_products.py",
-    "load_customers.py",
-    "load_sellers.py",
-    "load_orders.py",
-    "load_order_items.py",
-    "load_payments.py",
-    "load_reviews.py"
-)
+# Loaders run in FK dependency order; independent tables load in parallel
+# (db\etl\run.py). Extra arguments are passed through, e.g. --workers 2
+Write-Host "Running python -m db.etl.run $args" -ForegroundColor Cyan
+$env:PYTHONPATH = $repoRoot
+& $pythonPath -m db.etl.run @args
 
-$etlDir = "db\etl"
-$successCount = 0
-$totalCount = $etlScripts.Count
-
-foreach ($script in $etlScripts) {
-    $scriptPath = Join-Path $etlDir $script
-    
-    if (-not (Test-Path $scriptPath)) {
-        Write-Host "WARNING: $script not found, skipping..." -ForegroundColor Yellow
-        continue
-    }
-    
-    Write-Host "[$($successCount + 1)/$totalCount] Running $script..." -ForegroundColor Cyan
-    
-    try {
-        & $pythonPath $scriptPath
-        
-        if ($LASTEXITCODE -eq 0) {
-            Write-Host "  ✓ $script completed successfully" -ForegroundColor Green
-            $successCount++
-        } else {
-            Write-Host "  ✗ $script failed (exit code: $LASTEXITCODE)" -ForegroundColor Red
-            Write-Host ""
-            Write-Host "ETL pipeline stopped due to error." -ForegroundColor Yellow
-            Write-Host "Fix the issue and run this script again." -ForegroundColor Yellow
-            exit 1
-        }
-    } catch {
-        Write-Host "  ✗ Error running $script`: $_" -ForegroundColor Red
-        exit 1
-    }
-    
+if ($LASTEXITCODE -ne 0) {
+    Write-Host "  ✗ ETL pipeline failed (exit code: $LASTEXITCODE)" -ForegroundColor Red
     Write-Host ""
+    Write-Host "Fix the issue and run this script again." -ForegroundColor Yellow
+    exit 1
 }
 
 Write-Host "============================================================================" -ForegroundColor Green
 Write-Host "✓ ETL Pipeline Complete!" -ForegroundColor Green
 Write-Host "============================================================================" -ForegroundColor Green
-Write-Host "Successfully loaded $successCount/$totalCount datasets" -ForegroundColor Yellow
 Write-Host ""
 Write-Host "Next step: .\scripts\check-health.ps1" -ForegroundColor Cyan
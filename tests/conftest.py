@@ -0,0 +1,120 @@
+"""
+Shared test doubles: a configurable fake DB connection
+Monkeypatched database, no real DB needed
+"""
+
+import time
+
+import pytest
+from app.db import db
+
+
+class FakeCursor:
+    """Cursor of a FakeConnection; each cursor keeps its own result rows."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+        self.rowcount = 0
+        self.description = conn.description
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.log.append((sql, params))
+        if self.conn.delay:
+            time.sleep(self.conn.delay)
+        result = self.conn.answer(sql, params)
+        if isinstance(result, Exception):
+            raise result
+        self.rows = list(result)
+        self.rowcount = self.conn.rowcount if self.conn.rowcount is not None else len(self.rows)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchmany(self, size):
+        self.conn.fetch_sizes.append(size)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    """
+    Stands in for db.get_conn(): answers each statement by SQL marker.
+
+    Args:
+        results: {marker: rows}; a statement gets the rows of the first marker
+            found in its SQL. Rows may be an exception (raised by execute) or
+            a callable taking (sql, params) and returning rows
+        default: Rows for statements that match no marker
+        log: List receiving (sql, params) for every statement; pass the same
+            list to several connections to see all of them
+        delay: Seconds each execute() takes
+        rowcount: cursor.rowcount after execute() (default: number of rows)
+        description: cursor.description
+    """
+
+    def __init__(self, results=None, default=(), log=None, delay=0, rowcount=None, description=None):
+        self.results = results or {}
+        self.default = default
+        self.log = log if log is not None else []
+        self.delay = delay
+        self.rowcount = rowcount
+        self.description = description
+        self.cursor_kwargs = None
+        self.fetch_sizes = []
+        self.exits = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.exits += 1
+        return False
+
+    def answer(self, sql, params):
+        rows = next((rows for marker, rows in self.results.items() if marker in sql), self.default)
+        return rows(sql, params) if callable(rows) else rows
+
+    def cursor(self, **kwargs):
+        self.cursor_kwargs = kwargs
+        return FakeCursor(self)
+
+    @property
+    def statements(self):
+        """SQL of every statement, whitespace collapsed."""
+        return [" ".join(sql.split()) for sql, _ in self.log]
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """Point db.get_conn at a FakeConnection: conn = fake_db(results, default=..., ...)."""
+    def install(*args, **kwargs):
+        conn = FakeConnection(*args, **kwargs)
+        monkeypatch.setattr(db, "get_conn", lambda: conn)
+        return conn
+    return install
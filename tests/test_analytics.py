@@ -5,11 +5,13 @@ Sprint B - Testing complex SQL queries without real DB
 
 import pytest
 from app.app import create_app
+from app.config import RESPONSE_CACHE_CFG
 
 
 @pytest.fixture
-def app():
-    """Create Flask app for testing."""
+def app(monkeypatch):
+    """Create Flask app for testing (response cache off: each test patches its own DB)."""
+    monkeypatch.setitem(RESPONSE_CACHE_CFG, "enabled", False)
     app = create_app()
     app.config['TESTING'] = True
     return app
@@ -177,3 +179,86 @@ def test_analytics_endpoint_db_error_handling(client, monkeypatch):
     data = response.get_json()
     assert data['ok'] == False
     assert 'error' in data
+
+
+def test_revenue_by_category_reads_rollup(client, monkeypatch):
+    """Test revenue-by-category is served from the rollup table when built."""
+    
+    seen = []
+    
+    def mock_query_all(sql, params=None):
+        seen.append(sql)
+        return [{"category_name": "electronics", "total_revenue": 10.0}]
+    
+    monkeypatch.setattr("app.routes.analytics._query_all", mock_query_all)
+    
+    response = client.get('/analytics/revenue-by-category?limit=5')
+    assert response.status_code == 200
+    
+    data = response.get_json()
+    assert data['source'] == 'rollup'
+    assert len(seen) == 1
+    assert 'analytics_category_rollup' in seen[0]
+
+
+def test_top_sellers_falls_back_to_live_query(client, monkeypatch):
+    """Test top-sellers falls back to the live aggregate without a rollup."""
+    
+    def mock_query_all(sql, params=None):
+        if 'analytics_seller_rollup' in sql:
+            raise Exception('relation "analytics_seller_rollup" does not exist')
+        return [{"seller_id": "abc123", "total_revenue": 3500.00}]
+    
+    monkeypatch.setattr("app.routes.analytics._query_all", mock_query_all)
+    
+    response = client.get('/analytics/top-sellers?limit=10')
+    assert response.status_code == 200
+    
+    data = response.get_json()
+    assert data['source'] == 'live'
+    assert data['data'][0]['seller_id'] == 'abc123'
+
+
+def test_distance_vs_delivery_serves_precomputed_buckets(client, monkeypatch):
+    """Rows come straight from analytics_distance_delivery; empty means not refreshed."""
+    rows = [{"bucket_no": 0, "min_km": 0, "max_km": 50, "items": 10,
+             "avg_distance_km": 21.5, "avg_delivery_days": 6.2, "avg_freight_value": 12.3}]
+    seen = []
+
+    def mock_query_all(sql, params=None):
+        seen.append(sql)
+        return rows
+
+    monkeypatch.setattr("app.routes.analytics._query_all", mock_query_all)
+
+    response = client.get('/analytics/distance-vs-delivery')
+    assert response.status_code == 200
+    assert response.get_json()['data'] == rows
+    assert 'FROM analytics_distance_delivery' in seen[0]
+
+    rows = []
+    assert client.get('/analytics/distance-vs-delivery').status_code == 503
+
+
+@pytest.mark.parametrize("vendor, days, rounded", [
+    ("postgres", "DATE_PART('day', order_delivered_customer_date - order_purchase_timestamp)",
+     "ROUND(CAST(AVG(DATE_PART('day', order_delivered_customer_date - order_purchase_timestamp)) AS NUMERIC), 1)"),
+    ("mysql", "TIMESTAMPDIFF(DAY, order_purchase_timestamp, order_delivered_customer_date)",
+     "ROUND(AVG(TIMESTAMPDIFF(DAY, order_purchase_timestamp, order_delivered_customer_date)), 1)"),
+])
+def test_order_funnel_uses_vendor_dialect(client, monkeypatch, vendor, days, rounded):
+    """Date differences and rounding are rendered for the configured vendor."""
+    from app.config import DB_CFG
+    from app.db import dialect
+    monkeypatch.setitem(DB_CFG, "vendor", vendor)
+    seen = []
+
+    def mock_query_all(sql, params=None):
+        seen.append(sql)
+        return []
+
+    monkeypatch.setattr("app.routes.analytics._query_all", mock_query_all)
+
+    assert dialect.days_between("order_purchase_timestamp", "order_delivered_customer_date") == days
+    assert client.get('/analytics/order-funnel').status_code == 200
+    assert rounded in seen[0]
@@ -0,0 +1,214 @@
+"""
+Tests for the async (ASGI) entry point
+Fake async pool, no real DB or ASGI server needed
+"""
+
+import asyncio
+import json
+
+import pytest
+from app import asgi, data_version
+from app.cache import response_cache
+from app.config import DB_CFG, HTTP_CACHE_CFG, RESPONSE_CACHE_CFG
+from app.db import db
+from tests.test_dashboard import RESULTS
+
+
+class FakeAsyncDB:
+    """Stands in for asgi.AsyncDB: answers by SQL marker, records concurrency."""
+
+    def __init__(self, rows=None, error=None):
+        self.pool = object()
+        self.rows = rows or {}
+        self.error = error
+        self.log = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def fetchall(self, sql, params=None, row_factory=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.error:
+                raise self.error
+            self.log.append((sql, params))
+            return next(rows for marker, rows in self.rows.items() if marker in sql)
+        finally:
+            self.in_flight -= 1
+
+    async def query_all(self, sql, params=None):
+        return await self.fetchall(sql, params)
+
+
+def call(app, path, method="GET", body=b"", headers=()):
+    """Drive one HTTP request through the ASGI app; returns (status, headers, body)."""
+    route, _, query = path.partition("?")
+    scope = {
+        "type": "http", "method": method, "path": route, "query_string": query.encode(),
+        "headers": [(b"host", b"testserver")] + list(headers), "http_version": "1.1", "scheme": "http",
+        "server": ("testserver", 80), "client": ("127.0.0.1", 1234),
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = sent[0]
+    return (start["status"], dict(start["headers"]),
+            b"".join(m.get("body", b"") for m in sent[1:]))
+
+
+@pytest.fixture
+def make_app(monkeypatch):
+    monkeypatch.setitem(DB_CFG, "vendor", "postgres")
+    monkeypatch.setitem(RESPONSE_CACHE_CFG, "enabled", False)
+    monkeypatch.setitem(HTTP_CACHE_CFG, "enabled", False)
+
+    def make(db):
+        app = asgi.AsyncApp(db=db, wsgi_threads=2)
+        app.flask_app.config["TESTING"] = True
+        return app
+    return make
+
+
+def test_dashboard_summary_runs_sections_concurrently(make_app):
+    db = FakeAsyncDB(RESULTS)
+    status, headers, body = call(make_app(db), "/dashboard/summary")
+
+    assert status == 200
+    assert headers[b"content-type"] == b"application/json"
+    data = json.loads(body)
+    assert data["orders"]["total_orders"] == 99441
+    assert data["payments"]["total_payments"] == 96579
+    assert db.max_in_flight == 4
+
+
+def test_top_sellers_falls_back_to_live(make_app):
+    db = FakeAsyncDB({"analytics_top_sellers": [], "FROM order_items": [{"seller_id": "s1"}]})
+    status, _, body = call(make_app(db), "/analytics/top-sellers?limit=5")
+
+    assert status == 200
+    assert json.loads(body) == {"ok": True, "params": {"limit": 5}, "source": "live",
+                                "data": [{"seller_id": "s1"}]}
+    assert [params for _, params in db.log] == [(5,), (5,)]
+
+
+def test_revenue_by_category_rejects_bad_limit(make_app):
+    status, _, body = call(make_app(FakeAsyncDB()), "/analytics/revenue-by-category?limit=0")
+    assert status == 400
+    assert json.loads(body)["ok"] is False
+
+
+def test_orders_by_customer(make_app):
+    db = FakeAsyncDB({"FROM orders": [{"order_id": "o1", "order_status": "delivered"}]})
+    app = make_app(db)
+
+    status, _, body = call(app, "/orders/by-customer/c1?limit=3")
+    assert status == 200
+    assert json.loads(body) == [{"order_id": "o1", "order_status": "delivered"}]
+    assert db.log[0][1] == ("c1", 3)
+
+    status, _, _ = call(app, "/orders/by-customer/c1?limit=99")
+    assert status == 422
+
+
+def test_db_error_returns_503(make_app):
+    status, _, body = call(make_app(FakeAsyncDB(error=RuntimeError("down"))), "/orders/by-customer/c1")
+    assert status == 503
+    assert json.loads(body)["code"] == "DB_CONNECTION_ERROR"
+
+
+def test_pool_timeout_returns_503_with_retry_after(make_app):
+    class PoolTimeout(Exception):
+        pass
+
+    async def busy(db, query):
+        raise PoolTimeout("no connection available")
+
+    app = make_app(FakeAsyncDB())
+    status, headers, body = asyncio.run(_call_handler(app, busy))
+    assert status == 503
+    assert headers[b"retry-after"] == b"1"
+    assert json.loads(body)["code"] == "DB_POOL_TIMEOUT"
+
+
+async def _call_handler(app, handler):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await app._native("busy", handler, {}, {"query_string": b""}, send)
+    return sent[0]["status"], dict(sent[0]["headers"]), sent[1]["body"]
+
+
+def test_other_routes_go_through_flask(make_app):
+    db = FakeAsyncDB()
+    status, headers, body = call(make_app(db), "/nonexistent-route")
+
+    assert status == 404
+    assert db.log == []
+
+
+def test_mysql_serves_everything_through_flask(make_app, monkeypatch, fake_db):
+    monkeypatch.setitem(DB_CFG, "vendor", "mysql")
+    async_db = FakeAsyncDB(RESULTS)
+    app = make_app(async_db)
+    conn = fake_db(RESULTS)
+
+    status, _, body = call(app, "/dashboard/summary")
+    assert status == 200
+    assert async_db.log == []
+    assert len(conn.log) == 4
+    assert json.loads(body)["orders"]["total_orders"] == 99441
+
+
+def test_native_route_shares_etag_and_cache_with_flask(make_app, monkeypatch):
+    monkeypatch.setitem(RESPONSE_CACHE_CFG, "enabled", True)
+    monkeypatch.setitem(HTTP_CACHE_CFG, "enabled", True)
+    monkeypatch.setattr(data_version, "get_versions", lambda: {"orders": (3, 1700000000.0)})
+    response_cache.invalidate(endpoint="dashboard.dashboard_summary")
+    async_db = FakeAsyncDB(RESULTS)
+    app = make_app(async_db)
+
+    try:
+        status, headers, first = call(app, "/dashboard/summary")
+        assert status == 200
+        etag = headers[b"etag"]
+        assert etag.startswith(b'W/"')
+        assert len(async_db.log) == 4
+
+        # Matching If-None-Match: 304 without a query
+        status, headers, body = call(app, "/dashboard/summary", headers=[(b"if-none-match", etag)])
+        assert (status, body, headers[b"etag"]) == (304, b"", etag)
+
+        # Same key as the Flask view: both modes serve the entry computed here
+        assert call(app, "/dashboard/summary")[::2] == (200, first)
+        monkeypatch.setattr(db, "get_conn", lambda: pytest.fail("cache miss"))
+        response = app.flask_app.test_client().get("/dashboard/summary")
+        assert response.status_code == 200
+        assert response.headers["ETag"] == etag.decode()
+        assert response.get_data() == first
+        assert len(async_db.log) == 4
+    finally:
+        response_cache.invalidate(endpoint="dashboard.dashboard_summary")
+
+
+def test_request_body_reaches_flask_routes(make_app):
+    status, _, body = call(make_app(FakeAsyncDB()), "/cache/invalidate", method="POST",
+                           body=b'{"tables": "products"}',
+                           headers=[(b"content-type", b"application/json"), (b"content-length", b"22")])
+
+    assert status == 400
+    assert b"tables" in body
@@ -0,0 +1,141 @@
+"""
+Tests for the in-process response cache
+Monkeypatched database, no real DB needed
+"""
+
+import threading
+
+import pytest
+from app.app import create_app
+from app.cache import response_cache
+from app.config import HTTP_CACHE_CFG
+
+
+@pytest.fixture
+def app():
+    """Create Flask app for testing."""
+    app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """Create test client."""
+    return app.test_client()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(monkeypatch):
+    # Only the response cache is under test here; keep data_version reads out of the call counts.
+    monkeypatch.setitem(HTTP_CACHE_CFG, "enabled", False)
+    response_cache.invalidate()
+    response_cache.stats.clear()
+    yield
+    response_cache.invalidate()
+
+
+def _patch_db(fake_db, delay=0):
+    conn = fake_db({"FROM products": [(32951, 71)]}, default=[("sao paulo", 15540)], delay=delay)
+    return conn.log
+
+
+def test_stats_endpoint_served_from_cache(client, fake_db):
+    """Second identical request does not touch the database."""
+    calls = _patch_db(fake_db)
+
+    first = client.get('/products/stats')
+    second = client.get('/products/stats')
+
+    assert first.status_code == 200
+    assert second.get_json() == first.get_json()
+    assert len(calls) == 1
+    counters = response_cache.snapshot()['endpoints']['products.get_product_stats']
+    assert counters['hits'] == 1
+    assert counters['misses'] == 1
+
+
+def test_cache_key_normalizes_query_param_order(client, fake_db):
+    """Query parameter order does not create separate cache entries."""
+    calls = _patch_db(fake_db)
+
+    client.get('/customers/top-cities?limit=5&x=1')
+    client.get('/customers/top-cities?x=1&limit=5')
+    client.get('/customers/top-cities?limit=6&x=1')
+
+    assert len(calls) == 2
+
+
+def test_error_responses_are_not_cached(client, monkeypatch, fake_db):
+    """Validation errors and DB failures are never stored."""
+    from app.db import db
+
+    def fail():
+        raise ConnectionError("db down")
+
+    monkeypatch.setattr(db, "get_conn", fail)
+    assert client.get('/products/stats').status_code == 500
+
+    calls = _patch_db(fake_db)
+    assert client.get('/products/stats').status_code == 200
+    assert len(calls) == 1
+
+
+def test_invalidate_by_table(client, fake_db):
+    """invalidate(tables=...) only drops dependent entries."""
+    from app.cache import invalidate
+    calls = _patch_db(fake_db)
+
+    client.get('/products/stats')
+    client.get('/customers/top-cities')
+    assert invalidate(tables=["customers"]) == 1
+
+    client.get('/products/stats')
+    client.get('/customers/top-cities')
+    assert len(calls) == 3
+
+
+def test_invalidate_endpoint_from_localhost(client, fake_db):
+    """POST /cache/invalidate clears entries for the given tables."""
+    calls = _patch_db(fake_db)
+    client.get('/products/stats')
+
+    response = client.post('/cache/invalidate', json={"tables": ["products"]})
+
+    assert response.status_code == 200
+    assert response.get_json()['removed'] == 1
+    client.get('/products/stats')
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("tables", ["products", 5, ["products", ""], ["products", 1]])
+def test_invalidate_endpoint_rejects_non_list_tables(client, tables, fake_db):
+    """A bare string is not a list of names: 400, nothing dropped."""
+    calls = _patch_db(fake_db)
+    client.get('/products/stats')
+
+    response = client.post('/cache/invalidate', json={"tables": tables})
+
+    assert response.status_code == 400
+    client.get('/products/stats')
+    assert len(calls) == 1
+
+
+def test_concurrent_misses_are_coalesced(app, fake_db):
+    """Concurrent identical misses run the query only once."""
+    calls = _patch_db(fake_db, delay=0.2)
+    statuses = []
+
+    def hit():
+        with app.test_client() as c:
+            statuses.append(c.get('/products/stats').status_code)
+
+    threads = [threading.Thread(target=hit) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert statuses == [200] * 4
+    assert len(calls) == 1
+    assert response_cache.snapshot()['endpoints']['products.get_product_stats']['coalesced'] == 3
@@ -0,0 +1,192 @@
+"""
+Tests for the response cache backends (memory, sqlite, Redis protocol)
+Temporary SQLite files and a fake Redis client, no servers needed
+"""
+
+import fnmatch
+import time
+
+import pytest
+from app.app import create_app
+from app.cache import response_cache
+from app.cache_backends import (Entry, MemoryBackend, RedisBackend, SqliteBackend, decode_entry,
+                                encode_entry, make_backend)
+from app.config import HTTP_CACHE_CFG, RESPONSE_CACHE_CFG
+
+
+def _entry(body=b'{"ok":true}', tables=("orders",), endpoint="orders.stats", ttl=60):
+    return Entry(body, 200, "application/json", time.time() + ttl, frozenset(tables), endpoint)
+
+
+class FakeRedis:
+    """The handful of Redis commands RedisBackend uses, in memory."""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+
+    def _live(self, key):
+        if key in self.expires and self.expires[key] <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def get(self, key):
+        return self.data[key] if self._live(key) else None
+
+    def set(self, key, value, px=None, nx=False):
+        if nx and self._live(key):
+            return None
+        self.data[key] = value
+        if px:
+            self.expires[key] = time.time() + px / 1000
+        return True
+
+    def sadd(self, key, member):
+        self.data.setdefault(key, set()).add(member)
+
+    def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    def delete(self, *keys):
+        return sum(1 for k in keys if self._live(k) and self.data.pop(k, None) is not None)
+
+    def scan_iter(self, match, count=None):
+        return [k for k in list(self.data) if self._live(k) and fnmatch.fnmatchcase(k, match)]
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client, self.calls = client, []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend(max_entries=3)
+    if request.param == "sqlite":
+        return SqliteBackend(str(tmp_path / "cache.sqlite3"), max_entries=3)
+    return RedisBackend("redis://unused", client=FakeRedis())
+
+
+def test_encode_decode_roundtrip_compresses_large_bodies():
+    small, large = _entry(b"x" * 10), _entry(b'{"rows": [' + b"1," * 2000 + b"1]}")
+
+    assert decode_entry(encode_entry(small)).body == small.body
+    packed = encode_entry(large, compress_min=1024)
+    assert len(packed) < len(large.body) / 10
+    restored = decode_entry(packed)
+    assert (restored.body, restored.status, restored.content_type) == (large.body, 200, "application/json")
+
+
+def test_get_set_and_expiry(backend):
+    backend.set("a", _entry())
+    backend.set("old", _entry(ttl=-1))
+
+    assert backend.get("a").body == b'{"ok":true}'
+    assert backend.get("old") is None
+    assert backend.get("missing") is None
+
+
+def test_invalidate_by_table_endpoint_and_all(backend):
+    backend.set("o", _entry(tables=("orders", "order_items")))
+    backend.set("p", _entry(tables=("products",), endpoint="products.stats"))
+    backend.set("c", _entry(tables=("customers",), endpoint="customers.top"))
+
+    assert backend.invalidate(tables=["order_items"]) == 1
+    assert backend.get("o") is None and backend.get("p") is not None
+    assert backend.invalidate(endpoint="products.stats") == 1
+    assert backend.invalidate() == 1
+    assert backend.size() == 0
+
+
+def test_acquire_is_exclusive_on_shared_backends(backend):
+    if not backend.shared:
+        pytest.skip("memory backend coalesces in-process only")
+    assert backend.acquire("k", 5) is True
+    assert backend.acquire("k", 5) is False
+    backend.release("k")
+    assert backend.acquire("k", 5) is True
+
+
+def test_sqlite_is_shared_between_workers_and_bounded(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    worker_a, worker_b = SqliteBackend(path, max_entries=2), SqliteBackend(path, max_entries=2)
+
+    worker_a.set("k1", _entry(ttl=10))
+    assert worker_b.get("k1").body == b'{"ok":true}'
+
+    worker_b.set("k2", _entry(ttl=20))
+    assert worker_a.set("k3", _entry(ttl=30)) == ["orders.stats"]  # k1 expires first: evicted
+    assert worker_b.get("k1") is None
+    assert worker_a.invalidate(tables=["orders"]) == 2
+
+
+def test_make_backend_rejects_unknown_name():
+    with pytest.raises(ValueError, match="RESPONSE_CACHE_BACKEND"):
+        make_backend(dict(RESPONSE_CACHE_CFG, backend="memcached"))
+
+
+@pytest.fixture
+def shared_client(monkeypatch, tmp_path, fake_db):
+    """App whose response cache is a shared SQLite file; returns (client, path, db calls)."""
+    path = str(tmp_path / "cache.sqlite3")
+    monkeypatch.setitem(HTTP_CACHE_CFG, "enabled", False)
+    monkeypatch.setitem(RESPONSE_CACHE_CFG, "enabled", True)
+    monkeypatch.setattr(response_cache, "backend", SqliteBackend(path))
+    conn = fake_db(default=[(32951, 71)])
+    app = create_app()
+    app.config['TESTING'] = True
+    return app.test_client(), path, conn.log
+
+
+def test_response_computed_once_is_served_to_other_workers(shared_client, monkeypatch):
+    client, path, calls = shared_client
+
+    first = client.get('/products/stats')
+    # Another worker process: same file, its own backend object and no local state.
+    monkeypatch.setattr(response_cache, "backend", SqliteBackend(path))
+    second = client.get('/products/stats')
+
+    assert second.get_json() == first.get_json()
+    assert len(calls) == 1
+
+
+def test_other_worker_computing_the_key_is_awaited(shared_client, monkeypatch):
+    client, path, calls = shared_client
+    monkeypatch.setitem(RESPONSE_CACHE_CFG, "coalesce_timeout", 0.2)
+    other_worker = SqliteBackend(path)
+    assert other_worker.acquire("products.get_product_stats:?", 5)
+
+    # Lock held elsewhere and never filled: wait, then compute anyway.
+    response = client.get('/products/stats')
+
+    assert response.status_code == 200
+    assert len(calls) == 1
+
+
+def test_backend_failure_is_a_miss(shared_client, monkeypatch):
+    client, _, calls = shared_client
+
+    class Down:
+        shared = False
+
+        def __getattr__(self, name):
+            def fail(*args, **kwargs):
+                raise ConnectionError("redis down")
+            return fail
+
+    monkeypatch.setattr(response_cache, "backend", Down())
+
+    assert client.get('/products/stats').status_code == 200
+    assert client.get('/products/stats').status_code == 200
+    assert len(calls) == 2
@@ -0,0 +1,111 @@
+"""
+Tests for the customer geo projection
+Fake cursors and monkeypatched database, no real DB needed
+"""
+
+import pytest
+from app.app import create_app
+from app.config import DB_CFG
+from app import customer_geo
+from tests.conftest import FakeConnection
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config['TESTING'] = True
+    return app.test_client()
+
+
+def _cursor(location=None, projected=1):
+    """Cursor whose projection INSERT affects ``projected`` rows and whose lookups return ``location``."""
+    return FakeConnection({"INSERT INTO customer_geo (": [()] * projected},
+                          default=[location] if location else []).cursor()
+
+
+def _executed(cur):
+    return [(" ".join(sql.split()), params) for sql, params in cur.conn.log]
+
+
+def test_add_customer_projects_and_increments_counts(monkeypatch):
+    """Postgres: the row is projected, then its state count is upserted."""
+    monkeypatch.setitem(DB_CFG, "vendor", "postgres")
+    cur = _cursor(location=("SP",))
+
+    customer_geo.add_customer(cur, "c1")
+
+    executed = _executed(cur)
+    assert executed[0][0].startswith("INSERT INTO customer_geo (customer_id, zip_code_prefix, lat, lng, city, state) SELECT")
+    assert executed[2] == (
+        "INSERT INTO customer_geo_state_counts (state, customer_count) VALUES (%s, 1) "
+        "ON CONFLICT (state) DO UPDATE SET customer_count = customer_geo_state_counts.customer_count + 1",
+        ("SP",),
+    )
+    assert len(executed) == 3
+
+
+def test_add_customer_with_unknown_zip_touches_no_counts(monkeypatch):
+    monkeypatch.setitem(DB_CFG, "vendor", "mysql")
+    cur = _cursor(projected=0)
+
+    customer_geo.begin(cur)
+    customer_geo.add_customer(cur, "c1")
+
+    assert [sql for sql, _ in _executed(cur)][0] == "START TRANSACTION"
+    assert len(cur.conn.log) == 2
+
+
+def test_remove_customer_decrements_and_prunes(monkeypatch):
+    """MySQL: the old state loses one customer; empty count rows are deleted."""
+    monkeypatch.setitem(DB_CFG, "vendor", "mysql")
+    cur = _cursor(location=("RJ",))
+
+    customer_geo.remove_customer(cur, "c1")
+
+    statements = cur.conn.statements
+    assert statements[1] == "DELETE FROM customer_geo WHERE customer_id = %s"
+    assert "UPDATE customer_geo_state_counts SET customer_count = customer_count - 1 WHERE state = %s" in statements
+    assert "DELETE FROM customer_geo_state_counts WHERE state = %s AND customer_count <= 0" in statements
+
+
+def test_top_states_reads_projection_then_falls_back(client, monkeypatch):
+    """The 27-row count table serves top-states; a missing table uses the live join."""
+    import app.routes.customers as customers
+    calls = []
+
+    def fake_query_all(sql, params):
+        calls.append(sql)
+        if "customer_geo_state_counts" in sql:
+            raise RuntimeError("relation does not exist")
+        return [{"state": "SP", "customer_count": 41746}]
+
+    monkeypatch.setattr(customers, "_query_all", fake_query_all)
+
+    response = client.get('/geo/top-states?limit=5')
+
+    assert response.status_code == 200
+    assert response.get_json() == {"items": [{"state": "SP", "customer_count": 41746}], "source": "live"}
+    assert "FROM customer_geo_state_counts" in calls[0]
+    assert "JOIN geo_zip" in calls[1]
+
+
+@pytest.mark.parametrize("built", [True, False])
+def test_by_city_empty_result_uses_live_join_only_when_unbuilt(client, monkeypatch, built):
+    """No customers in a city is an answer; only an empty count table means 'not built'."""
+    import app.routes.customers as customers
+    calls = []
+
+    def fake_query_all(sql, params):
+        calls.append(sql)
+        if "FROM customer_geo_state_counts" in sql:
+            return [{"built": 1}] if built else []
+        return []
+
+    monkeypatch.setattr(customers, "_query_all", fake_query_all)
+
+    response = client.get('/customers/by-city?state=SP&city=nowhere')
+
+    assert response.status_code == 200
+    assert response.get_json() == []
+    assert "FROM customer_geo\n" in calls[0]
+    assert any("JOIN geo_zip" in sql for sql in calls) is not built
@@ -0,0 +1,65 @@
+"""
+Tests for the combined dashboard summary
+Monkeypatched database, no real DB needed
+"""
+
+from decimal import Decimal
+
+import pytest
+from app.app import create_app
+from app.config import DB_CFG, FANOUT_CFG, HTTP_CACHE_CFG, RESPONSE_CACHE_CFG
+from tests.conftest import FakeConnection
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config['TESTING'] = True
+    return app.test_client()
+
+
+# Rows for each dashboard query, by the table it reads
+RESULTS = {
+    "FROM orders": [(99441, 98666, Decimal("1.14"))],
+    "FROM products": [(32951, 73)],
+    "FROM order_payments": [
+        ("boleto", 0, 19784, Decimal("2869361.27"), Decimal("145.03")),
+        ("credit_card", 0, 76795, Decimal("12542084.19"), Decimal("163.32")),
+        (None, 1, 96579, Decimal("15411445.46"), Decimal("159.57")),
+    ],
+    "FROM order_reviews": [
+        (5, 0, 57328, Decimal("5")),
+        (1, 0, 11424, Decimal("1")),
+        (None, 0, 3, None),
+        (None, 1, 68755, Decimal("4.09")),
+    ],
+}
+
+
+@pytest.mark.parametrize("vendor, rollup", [
+    ("postgres", "GROUP BY ROLLUP (payment_type)"),
+    ("mysql", "GROUP BY payment_type WITH ROLLUP"),
+])
+@pytest.mark.parametrize("fanout, expected_connections", [(True, 4), (False, 1)])
+def test_dashboard_summary_one_query_per_table(client, monkeypatch, vendor, rollup, fanout, expected_connections):
+    from app.db import db
+    monkeypatch.setitem(DB_CFG, "vendor", vendor)
+    monkeypatch.setitem(RESPONSE_CACHE_CFG, "enabled", False)
+    monkeypatch.setitem(HTTP_CACHE_CFG, "enabled", False)
+    monkeypatch.setitem(FANOUT_CFG, "enabled", fanout)
+    connections, log = [], []
+    monkeypatch.setattr(db, "get_conn", lambda: connections.append(1) or FakeConnection(RESULTS, log=log))
+
+    response = client.get('/dashboard/summary')
+
+    assert response.status_code == 200
+    assert len(connections) == expected_connections
+    assert len(log) == 4
+    assert any(rollup in sql for sql, _ in log)
+    data = response.get_json()
+    assert data["orders"] == {"total_orders": 99441, "total_items": 98666, "avg_items_per_order": 1.14}
+    assert data["products"] == {"total_products": 32951, "total_categories": 73}
+    assert data["payments"]["total_payments"] == 96579
+    assert [t["type"] for t in data["payments"]["payment_types"]] == ["credit_card", "boleto"]
+    assert data["reviews"]["total_reviews"] == 68755
+    assert data["reviews"]["score_distribution"] == [{"score": 1, "count": 11424}, {"score": 5, "count": 57328}]
@@ -0,0 +1,144 @@
+"""
+Tests for data_version-driven conditional caching (ETag / Last-Modified / 304)
+Monkeypatched database, no real DB needed
+"""
+
+import pytest
+from app.app import create_app
+from app.config import DB_CFG, FANOUT_CFG, HTTP_CACHE_CFG, RESPONSE_CACHE_CFG
+from app import data_version
+
+# 2024-01-02 03:04:05 UTC
+UPDATED_AT = 1704164645.0
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setitem(RESPONSE_CACHE_CFG, "enabled", False)
+    monkeypatch.setitem(FANOUT_CFG, "enabled", False)
+    monkeypatch.setitem(HTTP_CACHE_CFG, "enabled", True)
+    monkeypatch.setattr(data_version, "_snapshot", None)
+    data_version.mark_stale()
+    app = create_app()
+    app.config['TESTING'] = True
+    yield app.test_client()
+    data_version.mark_stale()
+
+
+def _patch_db(fake_db, versions, stats=None):
+    """data_version rows plus canned /reviews/stats results, both read at query time."""
+    stats = stats if stats is not None else {"overall": (10, 5.0)}
+
+    def version_rows(sql, params):
+        if isinstance(versions, Exception):
+            raise versions
+        return [(t, v, ts) for t, (v, ts) in versions.items()]
+
+    return fake_db({"FROM data_version": version_rows, "BETWEEN": [(5, 10)]},
+                   default=lambda sql, params: [stats["overall"]])
+
+
+def test_response_carries_validators(client, fake_db):
+    _patch_db(fake_db, {"order_reviews": (3, UPDATED_AT)})
+
+    response = client.get('/reviews/stats')
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    assert response.headers["Last-Modified"] == "Tue, 02 Jan 2024 03:04:05 GMT"
+    assert response.headers["Cache-Control"] == "public, no-cache"
+
+
+def test_matching_etag_gets_304_without_running_the_view(client, fake_db):
+    conn = _patch_db(fake_db, {"order_reviews": (3, UPDATED_AT)})
+    etag = client.get('/reviews/stats').headers["ETag"]
+    conn.log.clear()
+
+    response = client.get('/reviews/stats', headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+    assert conn.log == []  # snapshot still fresh: no query at all
+
+
+def test_version_bump_changes_etag(client, fake_db):
+    versions = {"order_reviews": (3, UPDATED_AT)}
+    _patch_db(fake_db, versions)
+    etag = client.get('/reviews/stats').headers["ETag"]
+
+    versions["order_reviews"] = (4, UPDATED_AT + 60)
+    data_version.mark_stale()
+    response = client.get('/reviews/stats', headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_unrelated_table_keeps_etag(client, fake_db):
+    versions = {"order_reviews": (3, UPDATED_AT), "customers": (1, UPDATED_AT)}
+    _patch_db(fake_db, versions)
+    etag = client.get('/reviews/stats').headers["ETag"]
+
+    versions["customers"] = (2, UPDATED_AT + 60)
+    data_version.mark_stale()
+
+    assert client.get('/reviews/stats', headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_version_bump_bypasses_cached_body(client, monkeypatch, fake_db):
+    from app.cache import response_cache
+    from app.cache_backends import MemoryBackend
+    monkeypatch.setitem(RESPONSE_CACHE_CFG, "enabled", True)
+    monkeypatch.setattr(response_cache, "backend", MemoryBackend())
+    versions, stats = {"order_reviews": (3, UPDATED_AT)}, {"overall": (10, 5.0)}
+    _patch_db(fake_db, versions, stats)
+    first = client.get('/reviews/stats')
+    assert client.get('/reviews/stats').get_json() == first.get_json()  # cached
+
+    # New data loaded without POST /cache/invalidate reaching this worker.
+    stats["overall"] = (10, 1.0)
+    versions["order_reviews"] = (4, UPDATED_AT + 60)
+    data_version.mark_stale()
+    second = client.get('/reviews/stats')
+
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert second.get_json()["avg_score"] == 1.0
+    again = client.get('/reviews/stats', headers={"If-None-Match": second.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_if_modified_since(client, fake_db):
+    _patch_db(fake_db, {"order_reviews": (3, UPDATED_AT)})
+
+    fresh = client.get('/reviews/stats', headers={"If-Modified-Since": "Tue, 02 Jan 2024 03:04:05 GMT"})
+    old = client.get('/reviews/stats', headers={"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+    assert fresh.status_code == 304
+    assert old.status_code == 200
+
+
+def test_missing_table_serves_without_validators(client, fake_db):
+    _patch_db(fake_db, RuntimeError('relation "data_version" does not exist'))
+
+    response = client.get('/reviews/stats', headers={"If-None-Match": 'W/"anything"'})
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+@pytest.mark.parametrize("vendor, upsert", [
+    ("postgres", "ON CONFLICT (table_name) DO UPDATE SET version = data_version.version + 1"),
+    ("mysql", "ON DUPLICATE KEY UPDATE version = version + 1"),
+])
+def test_customer_delete_bumps_versions_in_transaction(client, monkeypatch, vendor, upsert, fake_db):
+    monkeypatch.setitem(DB_CFG, "vendor", vendor)
+    conn = _patch_db(fake_db, {})
+
+    client.post('/customers/c1/delete')
+
+    log = conn.statements
+    bumps = [sql for sql in log if sql.startswith("INSERT INTO data_version")]
+    assert len(bumps) == 3  # customers + the two customer_geo tables
+    assert all(upsert in sql for sql in bumps)
+    assert log.index(bumps[0]) > log.index("DELETE FROM customers WHERE customer_id = %s")
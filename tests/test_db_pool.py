@@ -0,0 +1,157 @@
+"""
+Tests for the per-process connection pool
+Uses fake driver connections, no real DB needed
+"""
+
+import time
+
+import pytest
+from app.db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        if self.conn.dead:
+            raise ConnectionError("server closed the connection")
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    autocommit = False
+
+    def __init__(self):
+        self.closed = False
+        self.dead = False
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def factory():
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    opts = {"min_size": 0, "max_size": 2, "wait_timeout": 0.05}
+    opts.update(kwargs)
+    return ConnectionPool(factory, **opts), created
+
+
+def test_pool_reuses_connection_after_with_block():
+    """Leaving a with block commits and returns the connection to the pool."""
+    pool, created = make_pool()
+
+    with pool.getconn() as conn:
+        conn.cursor().execute("SELECT 1")
+    with pool.getconn() as conn2:
+        pass
+
+    assert len(created) == 1
+    assert created[0].commits == 2
+    assert not created[0].closed
+    assert pool.status()["reused"] == 1
+
+
+def test_pool_close_returns_connection_and_rolls_back():
+    """conn.close() hands the connection back instead of disconnecting."""
+    pool, created = make_pool()
+
+    conn = pool.getconn()
+    conn.close()
+    conn.close()  # idempotent
+
+    assert created[0].rollbacks == 1
+    assert not created[0].closed
+    assert pool.status()["idle"] == 1
+
+
+def test_pool_wait_timeout_raises_pool_timeout():
+    """Exhausted pool raises PoolTimeout (a ConnectionError) after wait_timeout."""
+    pool, _ = make_pool(max_size=1)
+
+    held = pool.getconn()
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+    assert isinstance(PoolTimeout("x"), ConnectionError)
+
+    held.close()
+    pool.getconn().close()
+    assert pool.status()["timeouts"] == 1
+
+
+def test_pool_discards_connection_failing_health_check():
+    """A dead idle connection is replaced on checkout."""
+    pool, created = make_pool(check_interval=0)
+
+    conn = pool.getconn()
+    conn.close()
+    created[0].dead = True
+
+    with pool.getconn() as fresh:
+        pass
+
+    assert len(created) == 2
+    assert created[0].closed
+    assert fresh.raw is None
+    assert pool.status()["size"] == 1
+
+
+def test_pool_reaps_idle_connections_above_min_size():
+    """Connections idle past idle_timeout are closed, keeping min_size."""
+    pool, created = make_pool(min_size=1, max_size=3, idle_timeout=0.01)
+
+    a, b = pool.getconn(), pool.getconn()
+    a.close()
+    time.sleep(0.02)
+    b.close()
+
+    assert pool.status()["size"] == 1
+    assert sum(c.closed for c in created) == 1
+
+
+def test_db_wrapper_uses_pool(monkeypatch):
+    """db.get_conn() hands out pooled connections when pooling is enabled."""
+    import importlib
+    from app.db import db
+    db_module = importlib.import_module("app.db.db")
+
+    monkeypatch.setitem(db_module.POOL_CFG, "enabled", True)
+    monkeypatch.setitem(db_module.POOL_CFG, "min_size", 0)
+    monkeypatch.setattr(db_module, "_pool", None)
+    opened = []
+
+    def fake_get_conn():
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    monkeypatch.setattr(db_module, "get_conn", fake_get_conn)
+
+    for _ in range(3):
+        with db.get_conn():
+            pass
+
+    assert len(opened) == 1
+    assert db.pool_status()["reused"] == 2
+    db_module.close_pool()
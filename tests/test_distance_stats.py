@@ -0,0 +1,35 @@
+"""
+Tests for the distance-vs-delivery precompute
+Plain NumPy arrays, no real DB needed
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from db.etl.refresh_distance_stats import compute_buckets
+
+
+def test_compute_buckets_averages_per_distance_bucket():
+    """Distances are bucketed in one pass; empty buckets still get a row."""
+    sp = (-23.5505, -46.6333)
+    rio = (-22.9068, -43.1729)        # ~361 km from São Paulo
+    seller_lat = np.array([sp[0], sp[0], sp[0]])
+    seller_lng = np.array([sp[1], sp[1], sp[1]])
+    customer_lat = np.array([sp[0], -23.56, rio[0]])
+    customer_lng = np.array([sp[1], -46.64, rio[1]])
+    purchased = [datetime(2018, 1, 1)] * 3
+    delivered = [datetime(2018, 1, 3), datetime(2018, 1, 5), datetime(2018, 1, 11, 12)]
+    freight = np.array([10.0, np.nan, 30.0])
+
+    buckets = compute_buckets(seller_lat, seller_lng, customer_lat, customer_lng,
+                              purchased, delivered, freight, edges=[0, 50, 200, 400])
+
+    assert [b[:4] for b in buckets] == [(0, 0, 50, 2), (1, 50, 200, 0), (2, 200, 400, 1), (3, 400, None, 0)]
+    near, empty, far, _ = buckets
+    assert near[5] == 3.0              # (2 + 4) / 2 days
+    assert near[6] == 10.0             # NaN freight ignored
+    assert empty[4:] == (None, None, None)
+    assert far[4] == pytest.approx(361, abs=2)
+    assert far[5] == 10.5
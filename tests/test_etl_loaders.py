@@ -0,0 +1,134 @@
+"""
+Tests for ETL loaders
+Fake connection and bulk_load, no real DB needed
+"""
+
+import db.etl.load_products as load_products
+from app.config import DB_CFG
+from tests.conftest import FakeConnection
+
+
+def test_load_products_maps_categories_in_memory(monkeypatch, tmp_path, capsys):
+    """Categories are read once and joined per typed chunk; unmatched names are reported."""
+    import db.etl.etl_utils as etl_utils
+    csv_path = tmp_path / "products.csv"
+    csv_path.write_text(
+        "product_id,product_category_name,product_weight_g,product_length_cm,"
+        "product_height_cm,product_width_cm,product_photos_qty\n"
+        " p1 ,perfumaria,100,10,,5,1\n"
+        "p2,,200.0,1,1,1,\n"
+        ",perfumaria,1,1,1,1,1\n"
+        "p3,unknown_cat,3,3,3,3,3\n"
+        "p4,NA,4,4,4,4,4\n",
+        encoding="utf-8",
+    )
+    conn = FakeConnection(default=[("perfumaria", 7), ("NA", 9)])
+    loaded = {}
+
+    def fake_bulk_load(cur, table, columns, rows):
+        loaded["rows"] = list(rows)
+        return len(loaded["rows"])
+
+    monkeypatch.setitem(DB_CFG, "vendor", "mysql")
+    monkeypatch.setattr(load_products, "get_conn", lambda: conn)
+    monkeypatch.setattr(etl_utils, "bulk_load", fake_bulk_load)
+    monkeypatch.setattr(load_products, "invalidate_api_cache", lambda tables: None)
+
+    load_products.load_products(str(csv_path))
+
+    # Autocommit MySQL connection: the load runs in an explicit transaction.
+    assert conn.statements == ["SELECT category_name, category_id FROM categories", "START TRANSACTION", "COMMIT"]
+    assert loaded["rows"] == [
+        ("p1", 100, 10, None, 5, 1, "perfumaria", 7),
+        ("p2", 200, 1, 1, 1, None, None, None),
+        ("p3", 3, 3, 3, 3, 3, "unknown_cat", None),
+        ("p4", 4, 4, 4, 4, 4, "NA", 9),  # read as text, not pandas' NA marker
+    ]
+    out = capsys.readouterr().out
+    assert "1 unmatched category names: unknown_cat (1)" in out
+
+
+def _reviews_conn(orders, is_nullable, null_count=0):
+    """Answers the orders lookup and the information_schema nullability query."""
+    return FakeConnection({
+        "information_schema": [(is_nullable, "text")],
+        "SELECT COUNT(*)": [(null_count,)],
+    }, default=orders)
+
+
+def _load_reviews(monkeypatch, tmp_path, conn):
+    import db.etl.etl_utils as etl_utils
+    import db.etl.load_reviews as load_reviews
+
+    csv_path = tmp_path / "reviews.csv"
+    csv_path.write_text(
+        "review_id,order_id,review_score,review_comment_message,review_creation_date\n"
+        "r1,o1,5,,2018-01-01 00:00:00\n"
+        "r2,o_missing,1,ruim,2018-01-02 00:00:00\n",
+        encoding="utf-8",
+    )
+    loaded = {}
+
+    def fake_bulk_load(cur, table, columns, rows):
+        loaded["columns"] = columns
+        loaded["rows"] = list(rows)
+        return len(loaded["rows"])
+
+    monkeypatch.setitem(DB_CFG, "vendor", "postgres")
+    monkeypatch.setattr(load_reviews, "get_conn", lambda: conn)
+    monkeypatch.setattr(etl_utils, "bulk_load", fake_bulk_load)
+    monkeypatch.setattr(load_reviews, "invalidate_api_cache", lambda tables: None)
+    load_reviews.load_reviews(str(csv_path))
+    return loaded
+
+
+def test_load_reviews_resolves_customer_id_while_loading(monkeypatch, tmp_path):
+    """customer_id comes from an in-memory orders map; no UPDATE ... JOIN pass."""
+    conn = _reviews_conn([("o1", "c1")], is_nullable="YES", null_count=1)
+
+    loaded = _load_reviews(monkeypatch, tmp_path, conn)
+
+    assert loaded["columns"][-1] == "customer_id"
+    assert loaded["rows"] == [
+        ("r1", "o1", 5, None, "2018-01-01 00:00:00", "c1"),
+        ("r2", "o_missing", 1, "ruim", "2018-01-02 00:00:00", None),
+    ]
+    assert not any(sql.lstrip().startswith("UPDATE") for sql in conn.statements)
+    assert not any(sql.startswith("ALTER") for sql in conn.statements)
+
+
+def test_load_reviews_skips_alter_when_already_not_null(monkeypatch, tmp_path):
+    """A NOT NULL column is left alone and unresolved reviews are not sent."""
+    conn = _reviews_conn([("o1", "c1")], is_nullable="NO")
+
+    loaded = _load_reviews(monkeypatch, tmp_path, conn)
+
+    assert [row[0] for row in loaded["rows"]] == ["r1"]
+    assert not any(sql.startswith(("ALTER", "SELECT COUNT(*)")) for sql in conn.statements)
+
+
+def test_load_customers_upper_cases_state(monkeypatch, tmp_path):
+    """State codes are normalized on load so /customers/by-state can use its index."""
+    import db.etl.etl_utils as etl_utils
+    import db.etl.load_customers as load_customers
+    csv_path = tmp_path / "customers.csv"
+    csv_path.write_text(
+        "customer_id,customer_unique_id,customer_zip_code_prefix,customer_city,customer_state\n"
+        "c1,u1,1151,sao paulo,sp\n"
+        "c2,u2,,rio de janeiro, Rj \n"
+        "c3,u3,1,x,\n",
+        encoding="utf-8",
+    )
+    loaded = {}
+
+    def fake_bulk_load(cur, table, columns, rows):
+        loaded["rows"] = list(rows)
+        return len(loaded["rows"])
+
+    monkeypatch.setattr(load_customers, "get_conn", lambda: FakeConnection())
+    monkeypatch.setattr(etl_utils, "bulk_load", fake_bulk_load)
+    monkeypatch.setattr(load_customers, "invalidate_api_cache", lambda tables: None)
+
+    load_customers.load_customers(str(csv_path))
+
+    assert [row[4] for row in loaded["rows"]] == ["SP", "RJ", None]
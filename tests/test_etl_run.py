@@ -0,0 +1,64 @@
+"""
+Tests for the parallel ETL orchestrator
+Loaders are replaced with fakes, no real DB needed
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import db.etl.run as etl_run
+
+
+def test_plan_stages_follows_fk_dependencies():
+    """Independent tables share a stage; dependents come after their parents."""
+    stages = etl_run.plan_stages(etl_run.STEPS)
+
+    assert stages[0] == ["categories", "geo_zip"]
+    assert stages[1] == ["customers", "products", "sellers"]
+    assert stages[2] == ["customer_geo", "orders"]
+    assert stages[3] == ["order_items", "order_payments", "order_reviews"]
+    assert stages[4] == ["distance_stats", "rollups"]
+
+
+def test_plan_stages_rejects_cycles():
+    steps = {"a": ("m", "f", None, ("b",)), "b": ("m", "f", None, ("a",))}
+
+    with pytest.raises(ValueError, match="cycle"):
+        etl_run.plan_stages(steps)
+
+
+def test_run_pipeline_runs_dependents_after_parents(monkeypatch):
+    """Every step starts only after all of its dependencies finished."""
+    finished = []
+    lock = threading.Lock()
+
+    def fake_step(name, module, func, csv_path):
+        deps = etl_run.STEPS[name][3]
+        with lock:
+            assert set(deps) <= set(finished), f"{name} started before {deps}"
+            finished.append(name)
+        return 0.01
+
+    monkeypatch.setattr(etl_run, "_run_step", fake_step)
+
+    results = etl_run.run_pipeline(etl_run.STEPS, "data/raw", 4, executor_cls=ThreadPoolExecutor)
+
+    assert sorted(finished) == sorted(etl_run.STEPS)
+    assert all(status == "ok" for status, _ in results.values())
+
+
+def test_run_pipeline_stops_scheduling_after_failure(monkeypatch):
+    """Steps depending on a failed step are reported as skipped."""
+    def fake_step(name, module, func, csv_path):
+        if name == "customers":
+            raise RuntimeError("boom")
+        return 0.01
+
+    monkeypatch.setattr(etl_run, "_run_step", fake_step)
+
+    results = etl_run.run_pipeline(etl_run.STEPS, "data/raw", 2, executor_cls=ThreadPoolExecutor)
+
+    assert results["customers"][0].startswith("failed: RuntimeError")
+    assert results["orders"] == ("skipped", None)
+    assert results["order_reviews"] == ("skipped", None)
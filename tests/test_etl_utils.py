@@ -0,0 +1,285 @@
+"""
+Tests for ETL bulk-load helpers
+Fake cursors, no real DB needed
+"""
+
+import tempfile
+
+from app.config import DB_CFG
+from db.etl.etl_utils import bulk_load, csv_rows, iter_csv_chunks
+
+
+class FakeCopy:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write_row(self, row):
+        self.rows.append(row)
+
+
+class FakeCursor:
+    def __init__(self, server_vars=None, orphans=0):
+        self.sql = []
+        self.params = []
+        self.copied = []
+        self.batches = []
+        self.loaded = None
+        self.rowcount = 0
+        self.server_vars = server_vars or {}
+        self.result = None
+        self.orphans = orphans
+
+    def execute(self, sql, params=None):
+        self.sql.append(sql)
+        self.params.append(params)
+        if sql.startswith("SELECT @@"):
+            self.result = (self.server_vars.get(sql[len("SELECT @@"):]),)
+        elif sql.startswith("LOAD DATA"):
+            path = sql.split("'")[1]
+            with open(path, encoding="utf-8") as f:
+                self.loaded = f.read()
+        elif sql.startswith("DELETE FROM _stage_"):
+            self.rowcount = self.orphans
+        elif sql.startswith("INSERT"):
+            self.rowcount = len(self.copied) or (len(params) // 3 if params else 0)
+
+    def fetchone(self):
+        return self.result
+
+    def executemany(self, sql, batch):
+        self.sql.append(sql)
+        self.batches.append(list(batch))
+
+    def copy(self, sql):
+        self.sql.append(sql)
+        return FakeCopy(self.copied)
+
+
+ROWS = [("o1", "c1", "delivered"), ("o2", "c2", "shipped"), ("o3", "c3", None)]
+COLUMNS = ["order_id", "customer_id", "order_status"]
+
+
+def test_bulk_load_postgres_copies_into_staging_and_merges(monkeypatch):
+    """Postgres path: COPY into a temp table, one idempotent INSERT ... SELECT."""
+    monkeypatch.setitem(DB_CFG, "vendor", "postgres")
+    cur = FakeCursor()
+
+    total = bulk_load(cur, "orders", COLUMNS, iter(ROWS))
+
+    assert total == 3
+    assert cur.copied == ROWS
+    assert "CREATE TEMP TABLE _stage_orders AS SELECT order_id, customer_id, order_status FROM orders WITH NO DATA" in cur.sql
+    assert "COPY _stage_orders (order_id, customer_id, order_status) FROM STDIN" in cur.sql
+    merge = [s for s in cur.sql if s.startswith("INSERT")]
+    assert merge == ["INSERT INTO orders (order_id, customer_id, order_status) "
+                     "SELECT order_id, customer_id, order_status FROM _stage_orders ON CONFLICT DO NOTHING"]
+    assert not cur.batches
+
+
+def test_bulk_load_postgres_drops_rows_without_parent(monkeypatch, capsys):
+    """FK violations are filtered out of the staging table before the merge."""
+    monkeypatch.setitem(DB_CFG, "vendor", "postgres")
+    cur = FakeCursor(orphans=2)
+
+    total = bulk_load(cur, "customers", ["customer_id", "customer_zip_code_prefix"], iter([("c1", 1), ("c2", 99999)]))
+
+    assert total == 2
+    deletes = [s for s in cur.sql if s.startswith("DELETE")]
+    assert deletes == [
+        "DELETE FROM _stage_customers s WHERE s.customer_zip_code_prefix IS NOT NULL AND NOT EXISTS "
+        "(SELECT 1 FROM geo_zip p WHERE p.geolocation_zip_code_prefix = s.customer_zip_code_prefix)"
+    ]
+    assert cur.sql.index(deletes[0]) < next(i for i, s in enumerate(cur.sql) if s.startswith("INSERT"))
+    assert "2 without parent" in capsys.readouterr().out
+
+
+def test_bulk_load_mysql_multirow_insert_sized_by_packet(monkeypatch):
+    """MySQL fallback: multi-row INSERT IGNORE statements cut by max_allowed_packet."""
+    monkeypatch.setitem(DB_CFG, "vendor", "mysql")
+    monkeypatch.setitem(DB_CFG, "local_infile", False)
+    rows = [(f"o{i}", "c" * 20000, "delivered") for i in range(10)]
+    cur = FakeCursor({"max_allowed_packet": 256 * 1024})
+
+    total = bulk_load(cur, "orders", COLUMNS, iter(rows))
+
+    assert total == 10
+    inserts = [(sql, p) for sql, p in zip(cur.sql, cur.params) if sql.startswith("INSERT")]
+    # ~40 KB per row against a 128 KB budget: 3 rows per statement
+    assert [len(p) // 3 for _, p in inserts] == [3, 3, 3, 1]
+    assert inserts[0][0].startswith("INSERT IGNORE INTO orders (order_id, customer_id, order_status) VALUES (%s, %s, %s), (")
+    assert not cur.batches
+
+
+def test_bulk_load_mysql_load_data_local_infile(monkeypatch, tmp_path):
+    """MySQL fast path: escaped TSV file loaded into a staging table, then merged."""
+    monkeypatch.setitem(DB_CFG, "vendor", "mysql")
+    monkeypatch.setitem(DB_CFG, "local_infile", True)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    cur = FakeCursor({"local_infile": 1})
+    rows = [("o1", "tab\there", None), ("o2", "line\nbreak", "back\\slash")]
+
+    total = bulk_load(cur, "orders", COLUMNS, iter(rows))
+
+    assert total == 2
+    assert cur.loaded == "o1\ttab\\there\t\\N\no2\tline\\nbreak\tback\\\\slash\n"
+    assert "CREATE TEMPORARY TABLE _stage_orders SELECT order_id, customer_id, order_status FROM orders LIMIT 0" in cur.sql
+    assert "INSERT IGNORE INTO orders (order_id, customer_id, order_status) SELECT order_id, customer_id, order_status FROM _stage_orders" in cur.sql
+    assert list(tmp_path.iterdir()) == []
+
+
+PAYMENTS_SCHEMA = {
+    "order_id": "str",
+    "payment_sequential": "int",
+    "payment_type": "str",
+    "payment_installments": "int",
+    "payment_value": "float",
+    "missing_column": "str",
+}
+
+
+def test_csv_rows_coerces_declared_types(tmp_path):
+    """Strings are stripped, '' and bad numbers become None, required NULLs drop the row."""
+    path = tmp_path / "payments.csv"
+    path.write_text(
+        "\ufefforder_id,payment_sequential,payment_type,payment_installments,payment_value,extra\n"
+        " o1 ,1,credit_card,3,99.90,x\n"
+        "o2,2, ,1.5,abc,x\n"
+        ",1,boleto,1,10,x\n"
+        "o3,,voucher,1,10,x\n"
+        "NA,1,NA,1,5,x\n",
+        encoding="utf-8",
+    )
+
+    rows = list(csv_rows(str(path), PAYMENTS_SCHEMA, required=("order_id", "payment_sequential")))
+
+    assert rows == [
+        ("o1", 1, "credit_card", 3, 99.9, None),
+        ("o2", 2, None, None, None, None),
+        ("NA", 1, "NA", 1, 5.0, None),
+    ]
+    assert [type(v) for v in rows[0][:5]] == [str, int, str, int, float]
+
+
+def test_iter_csv_chunks_reads_in_chunks(tmp_path):
+    path = tmp_path / "orders.csv"
+    path.write_text("order_id\n" + "".join(f"o{i}\n" for i in range(5)), encoding="utf-8")
+
+    chunks = list(iter_csv_chunks(str(path), {"order_id": "str"}, chunksize=2))
+
+    assert [len(c) for c in chunks] == [2, 2, 1]
+
+
+class EtlRunsCursor:
+    """In-memory etl_runs table behind the three statements load_csv issues."""
+
+    def __init__(self):
+        self.runs = {}
+        self.result = None
+
+    def execute(self, sql, params=None):
+        if sql.startswith("SELECT file_sha256"):
+            self.result = self.runs.get(params[0])
+        elif sql.startswith("DELETE FROM etl_runs"):
+            self.runs.pop(params[0], None)
+        elif sql.startswith("INSERT INTO etl_runs"):
+            source, _, sha, size, rows, watermark = params
+            self.runs[source] = (sha, size, rows, watermark)
+
+    def fetchone(self):
+        return self.result
+
+
+ORDERS_SCHEMA = {"order_id": "str", "order_purchase_timestamp": "str"}
+
+
+def test_load_csv_incremental_skips_appends_and_watermarks(monkeypatch, tmp_path):
+    """Unchanged files are skipped, appends send the tail, rewrites filter by watermark."""
+    import db.etl.etl_utils as etl_utils
+    monkeypatch.setenv("ETL_INCREMENTAL", "1")
+    sent = []
+    monkeypatch.setattr(etl_utils, "bulk_load", lambda cur, table, columns, rows: sent.append(list(rows)) or len(sent[-1]))
+    cur = EtlRunsCursor()
+    path = tmp_path / "orders.csv"
+
+    def load():
+        return etl_utils.load_csv(cur, "orders", str(path), ORDERS_SCHEMA, required=("order_id",),
+                                  watermark_column="order_purchase_timestamp")
+
+    path.write_text("order_id,order_purchase_timestamp\no1,2018-01-01 10:00:00\no2,2018-01-02 10:00:00\n")
+    assert load() == 2
+    assert cur.runs["orders"][1:] == (path.stat().st_size, 2, "2018-01-02 10:00:00")
+
+    assert load() == 0
+    assert len(sent) == 1
+
+    with open(path, "a") as f:
+        f.write("o3,2018-01-03 10:00:00\n")
+    assert load() == 1
+    assert sent[-1] == [("o3", "2018-01-03 10:00:00")]
+    assert cur.runs["orders"][2:] == (3, "2018-01-03 10:00:00")
+
+    path.write_text("order_id,order_purchase_timestamp\no4,2018-01-04 10:00:00\n"
+                    "o1,2018-01-01 10:00:00\no5,\n")
+    assert load() == 2
+    assert sent[-1] == [("o4", "2018-01-04 10:00:00"), ("o5", None)]
+    assert cur.runs["orders"][3] == "2018-01-04 10:00:00"
+
+
+def test_load_csv_mysql_commits_rows_and_etl_run_together(monkeypatch, tmp_path):
+    """MySQL connections are autocommit: the load and its etl_runs row share one transaction."""
+    import pytest
+    import db.etl.etl_utils as etl_utils
+    monkeypatch.setenv("ETL_INCREMENTAL", "1")
+    monkeypatch.setitem(DB_CFG, "vendor", "mysql")
+    log = []
+
+    class LoggingCursor(EtlRunsCursor):
+        def execute(self, sql, params=None):
+            log.append(sql.split(" (")[0])
+            super().execute(sql, params)
+
+    def bulk_load(cur, table, columns, rows):
+        log.append("bulk_load")
+        return len(list(rows))
+
+    monkeypatch.setattr(etl_utils, "bulk_load", bulk_load)
+    path = tmp_path / "orders.csv"
+    path.write_text("order_id,order_purchase_timestamp\no1,2018-01-01 10:00:00\n")
+    cur = LoggingCursor()
+
+    assert etl_utils.load_csv(cur, "orders", str(path), ORDERS_SCHEMA) == 1
+    assert log[log.index("START TRANSACTION"):] == [
+        "START TRANSACTION", "bulk_load", "DELETE FROM etl_runs WHERE source_name = %s",
+        "INSERT INTO etl_runs", "COMMIT",
+    ]
+
+    def failing_bulk_load(cur, table, columns, rows):
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(etl_utils, "bulk_load", failing_bulk_load)
+    path.write_text("order_id,order_purchase_timestamp\no2,2018-01-02 10:00:00\n")
+    log.clear()
+    with pytest.raises(RuntimeError):
+        etl_utils.load_csv(cur, "orders", str(path), ORDERS_SCHEMA)
+    assert log[-1] == "ROLLBACK"
+    assert "INSERT INTO etl_runs" not in log
+
+
+def test_plan_incremental_after_empty_file_reads_from_start(tmp_path):
+    """A previous run on an empty file (byte_offset 0) plans an append from 0."""
+    from db.etl.etl_utils import _file_fingerprint, plan_incremental
+    path = tmp_path / "orders.csv"
+    path.write_bytes(b"")
+    cur = EtlRunsCursor()
+    cur.runs["orders"] = (_file_fingerprint(str(path))[0], 0, 0, None)
+
+    path.write_text("order_id\no1\n")
+    plan = plan_incremental(cur, "orders", str(path))
+
+    assert (plan["mode"], plan["offset"]) == ("append", 0)
@@ -0,0 +1,85 @@
+"""
+Tests for the EXPLAIN capture / index advisor tool
+Canned plans and a fake connection, no real DB needed
+"""
+
+import pytest
+from app.app import create_app
+from app.config import HTTP_CACHE_CFG
+from tools.explain import capture_statements, find_full_scans, suggest_index
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """Create Flask app for testing (HTTP validators off, as in tools.explain main)."""
+    monkeypatch.setitem(HTTP_CACHE_CFG, "enabled", False)
+    app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+
+PG_PLAN = [{
+    "Plan": {
+        "Node Type": "Hash Join",
+        "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "orders", "Alias": "o", "Actual Rows": 96478,
+             "Filter": "((order_status)::text = 'delivered'::text)"},
+            {"Node Type": "Index Scan", "Relation Name": "order_items", "Index Name": "idx_oi__order_id"},
+        ],
+    }
+}]
+
+MYSQL_PLAN = {
+    "query_block": {
+        "nested_loop": [
+            {"table": {"table_name": "o", "access_type": "ALL", "rows_examined_per_scan": 99441,
+                       "attached_condition": "(`olist`.`o`.`order_status` = 'delivered')"}},
+            {"table": {"table_name": "oi", "access_type": "ref", "key": "idx_oi__order_id"}},
+        ]
+    }
+}
+
+SQL = """
+SELECT o.order_id FROM order_items oi
+JOIN orders o ON o.order_id = oi.order_id
+WHERE o.order_status = 'delivered'
+"""
+
+
+def test_find_full_scans_postgres():
+    """Seq Scan nodes are reported with the columns of their filter."""
+    scans = find_full_scans(PG_PLAN, "postgres", SQL)
+
+    assert scans == [{"table": "orders", "rows": 96478, "columns": ["order_status"]}]
+
+
+def test_find_full_scans_mysql_resolves_aliases():
+    """access_type ALL is a full scan; the alias is mapped back to the table."""
+    scans = find_full_scans(MYSQL_PLAN, "mysql", SQL)
+
+    assert scans == [{"table": "orders", "rows": 99441, "columns": ["order_status"]}]
+
+
+def test_suggest_index_per_vendor_and_skips_indexed_columns():
+    scan = {"table": "orders", "rows": 99441, "columns": ["order_status"]}
+
+    assert suggest_index(scan, "postgres", {}) == \
+        "CREATE INDEX IF NOT EXISTS idx_orders__order_status ON orders(order_status);"
+    assert suggest_index(scan, "mysql", {}) == \
+        "CREATE INDEX idx_orders__order_status ON orders(order_status);"
+    assert suggest_index(scan, "postgres", {"orders": {"order_status"}}) is None
+    assert suggest_index({"table": "orders", "rows": 1, "columns": []}, "postgres", {}) is None
+
+
+def test_capture_statements_records_route_sql(app, fake_db):
+    """Routes run through the test client; their SQL is captured with params."""
+    from app.db import db
+    fake_db(default=[("delivered", 10, 8.1, 0.4)],
+            description=[("order_status",), ("order_count",), ("avg_delivery_days",), ("avg_approval_days",)])
+
+    captured = capture_statements(app, db, ["/analytics/order-funnel"])
+
+    url, status, statements = captured[0]
+    assert (url, status) == ("/analytics/order-funnel", 200)
+    assert len(statements) == 1
+    assert "GROUP BY order_status" in statements[0][0]
@@ -0,0 +1,89 @@
+"""
+Tests for streaming export endpoints
+Monkeypatched database, no real DB needed
+"""
+
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from app.app import create_app
+from app.config import DB_CFG
+
+
+@pytest.fixture
+def app():
+    """Create Flask app for testing."""
+    app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """Create test client."""
+    return app.test_client()
+
+
+def _patch_db(monkeypatch, fake_db, rows, batch_size=2):
+    import app.routes.export as export
+    monkeypatch.setattr(export, "BATCH_SIZE", batch_size)
+    return fake_db(default=rows)
+
+
+def test_export_streams_ndjson_in_batches(client, monkeypatch, fake_db):
+    """NDJSON export converts Decimal/datetime and fetches in batches."""
+    rows = [
+        ("o1", 1, "credit_card", 3, Decimal("99.90")),
+        ("o2", 1, "boleto", 1, Decimal("10.00")),
+        ("o3", 2, "voucher", 1, None),
+    ]
+    conn = _patch_db(monkeypatch, fake_db, rows)
+    monkeypatch.setitem(DB_CFG, "vendor", "postgres")
+
+    response = client.get('/export/order_payments')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(l) for l in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 3
+    assert lines[0]['payment_value'] == 99.9
+    assert lines[2]['payment_value'] is None
+    assert conn.fetch_sizes == [2, 2, 2]
+    assert conn.cursor_kwargs == {"name": "export_order_payments"}
+    assert conn.closed
+
+
+def test_export_streams_csv_with_header(client, monkeypatch, fake_db):
+    """CSV export writes a header row then one line per row."""
+    rows = [("o1", "c1", "delivered", datetime(2018, 1, 2, 3, 4, 5), None)]
+    _patch_db(monkeypatch, fake_db, rows)
+
+    response = client.get('/export/orders?format=csv')
+
+    assert response.status_code == 200
+    assert 'attachment; filename="orders.csv"' == response.headers['Content-Disposition']
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0].startswith('order_id,customer_id,order_status')
+    assert lines[1] == 'o1,c1,delivered,2018-01-02 03:04:05,'
+
+
+def test_export_rejects_unknown_table_and_format(client, monkeypatch, fake_db):
+    """Only whitelisted tables and formats are accepted."""
+    _patch_db(monkeypatch, fake_db, [])
+
+    assert client.get('/export/customers').status_code == 404
+    assert client.get('/export/orders?format=xml').status_code == 422
+
+
+def test_export_db_unavailable_returns_503(client, monkeypatch):
+    """Connection failures happen before streaming starts."""
+    from app.db import db
+
+    def fail():
+        raise ConnectionError("db down")
+
+    monkeypatch.setattr(db, "get_conn", fail)
+
+    assert client.get('/export/orders').status_code == 503
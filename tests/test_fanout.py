@@ -0,0 +1,109 @@
+"""
+Tests for the query fan-out helper and the routes that use it
+Monkeypatched database, no real DB needed
+"""
+
+import threading
+
+import pytest
+from app.app import create_app
+from app.config import FANOUT_CFG, RESPONSE_CACHE_CFG
+from app.db import db, fanout
+from tests.conftest import FakeConnection
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setitem(RESPONSE_CACHE_CFG, "enabled", False)
+    app = create_app()
+    app.config['TESTING'] = True
+    return app.test_client()
+
+
+def _answer(rows, barrier=None, threads=None):
+    """Result callable: records the executing thread, optionally waits on a barrier."""
+    def answer(sql, params):
+        if threads is not None:
+            threads.append(threading.current_thread().name)
+        if barrier is not None:
+            barrier.wait()
+        return rows
+    return answer
+
+
+def test_queries_run_concurrently_on_separate_connections(monkeypatch):
+    # Each query blocks until all three are in execute(): only passes if they overlap.
+    barrier = threading.Barrier(3, timeout=5)
+    connections = []
+
+    def get_conn():
+        conn = FakeConnection({marker: _answer(rows, barrier)
+                               for marker, rows in {"a": [(1,)], "b": [(2,)], "c": [(3,)]}.items()})
+        connections.append(conn)
+        return conn
+
+    monkeypatch.setattr(db, "get_conn", get_conn)
+    monkeypatch.setitem(FANOUT_CFG, "max_workers", 3)
+    fanout.shutdown()
+
+    rows = fanout.fetch_all({"x": ("select a", None), "y": ("select b", (1,)), "z": ("select c", None)})
+
+    assert rows == {"x": [(1,)], "y": [(2,)], "z": [(3,)]}
+    assert len(connections) == 3
+    assert all(conn.exits == 1 for conn in connections)
+    fanout.shutdown()
+
+
+def test_failure_is_raised_after_all_queries_finish(monkeypatch):
+    connections = []
+
+    def get_conn():
+        conn = FakeConnection({"bad": RuntimeError("boom"), "good": [(1,)]})
+        connections.append(conn)
+        return conn
+
+    monkeypatch.setattr(db, "get_conn", get_conn)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        fanout.fetch_all({"a": ("select good", None), "b": ("select bad", None)})
+    assert len(connections) == 2
+    assert all(conn.exits == 1 for conn in connections)
+
+
+def test_disabled_runs_serially_on_one_connection(monkeypatch):
+    threads, connections = [], []
+    monkeypatch.setitem(FANOUT_CFG, "enabled", False)
+    monkeypatch.setattr(db, "get_conn", lambda: connections.append(1) or FakeConnection(
+        {"a": _answer([(1,)], threads=threads), "b": _answer([(2,)], threads=threads)}))
+
+    rows = fanout.fetch_all({"x": ("select a", None), "y": ("select b", None)})
+
+    assert rows == {"x": [(1,)], "y": [(2,)]}
+    assert len(connections) == 1
+    assert set(threads) == {threading.current_thread().name}
+
+
+def test_reviews_stats_merges_fanned_out_queries(client, fake_db):
+    conn = fake_db({
+        "BETWEEN": [(4, 19142), (5, 57328)],
+        "FROM order_reviews": [(99224, 4.0864)],
+    })
+
+    response = client.get('/reviews/stats?min_score=4&max_score=5')
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "total_reviews": 99224,
+        "avg_score": 4.0864,
+        "score_distribution": [{"score": 4, "count": 19142}, {"score": 5, "count": 57328}],
+    }
+    assert (4, 5) in [params for _, params in conn.log]
+
+
+def test_payment_stats_error_returns_500(client, fake_db):
+    fake_db({"GROUP BY payment_type": RuntimeError("down"), "FROM order_payments": [(1, 2, 3)]})
+
+    response = client.get('/payments/stats')
+
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "Failed to fetch payment statistics"}
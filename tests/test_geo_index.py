@@ -0,0 +1,83 @@
+"""
+Tests for the in-memory geo index and /geo/nearby
+Random points and a monkeypatched database, no real DB needed
+"""
+
+import numpy as np
+import pytest
+from app.app import create_app
+from app import geo_index
+from app.geo_index import GridIndex, haversine_km
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config['TESTING'] = True
+    return app.test_client()
+
+
+def _random_points(n=2000, seed=7):
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(-33.0, -3.0, n)   # roughly Brazil
+    lng = rng.uniform(-73.0, -35.0, n)
+    return [f"p{i}" for i in range(n)], list(range(n)), lat, lng
+
+
+def test_haversine_known_distance():
+    # São Paulo -> Rio de Janeiro, ~361 km
+    assert haversine_km(-23.5505, -46.6333, -22.9068, -43.1729) == pytest.approx(361, abs=2)
+
+
+def test_radius_and_knn_match_brute_force():
+    """Grid pruning never drops a point the full scan would return."""
+    ids, zips, lat, lng = _random_points()
+    grid = GridIndex(ids, zips, lat, lng, cell_deg=0.5)
+    center = (-23.55, -46.63)
+    brute = haversine_km(center[0], center[1], grid.lat, grid.lng)
+
+    idx, dist = grid.within(*center, 300)
+    assert sorted(idx.tolist()) == sorted(np.flatnonzero(brute <= 300).tolist())
+    assert list(dist) == sorted(dist)
+
+    idx, dist = grid.nearest(*center, 15)
+    assert dist.tolist() == pytest.approx(np.sort(brute)[:15].tolist())
+
+
+def test_nearest_excludes_the_center_point():
+    ids, zips, lat, lng = _random_points(200)
+    grid = GridIndex(ids, zips, lat, lng)
+
+    idx, _ = grid.nearest(*grid.locate("p5"), 3, exclude="p5")
+
+    assert len(idx) == 3
+    assert "p5" not in [grid.ids[i] for i in idx]
+
+
+def test_geo_nearby_knn_sellers_for_customer(client, fake_db):
+    """The index is built once from the DB; the customer's own zip is the center."""
+    fake_db(
+        {"FROM sellers": [("s_far", 20000, -22.90, -43.17), ("s_near", 1001, -23.56, -46.64)]},
+        default=[("c1", 1000, -23.55, -46.63)],
+    )
+    geo_index.mark_stale()
+
+    response = client.get('/geo/nearby?customer_id=c1&kind=sellers&k=1')
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["center"] == {"lat": -23.55, "lng": -46.63}
+    assert [item["id"] for item in data["items"]] == ["s_near"]
+    assert data["items"][0]["distance_km"] < 2
+
+    response = client.get('/geo/nearby?lat=-23.55&lng=-46.63&radius_km=50')
+    assert response.get_json()["count"] == 1
+    assert client.get('/geo/nearby?customer_id=nope').status_code == 404
+    assert client.get('/geo/nearby?kind=sellers').status_code == 400
+
+
+def test_geo_nearby_rejects_both_customer_and_seller_center(client):
+    response = client.get('/geo/nearby?customer_id=c1&seller_id=s1')
+
+    assert response.status_code == 400
+    assert "not both" in response.get_json()["error"]
@@ -56,3 +56,68 @@ def test_health_endpoint_db_failure(client, monkeypatch):
     assert data['db_connected'] == False
     assert 'errors' in data
     assert len(data['errors']) > 0
+
+
+def _patch_conn(fake_db, rows, errors=None):
+    """Catalog estimate rows; SELECT 1 and every COUNT(*) answer 1 unless ``errors`` matches first."""
+    import app.db.table_stats
+    conn = fake_db({**(errors or {}), "COUNT(*)": [(1,)], "SELECT 1": [(1,)]}, default=rows)
+    app.db.table_stats.clear_cache()
+    return conn
+
+
+def test_health_liveness_runs_only_select_1(client, fake_db):
+    """Test /health does a single SELECT 1 and no table scans."""
+    conn = _patch_conn(fake_db, [])
+
+    response = client.get('/health')
+
+    assert response.status_code == 200
+    assert response.get_json()['db_connected'] is True
+    assert conn.statements == ["SELECT 1"]
+
+
+def test_health_ready_uses_cached_catalog_estimates(client, fake_db):
+    """Test /health/ready reads catalog estimates once and caches them."""
+    from app.db.table_stats import TABLES
+    conn = _patch_conn(fake_db, [(t, 100) for t in TABLES])
+
+    first = client.get('/health/ready')
+    second = client.get('/health/ready')
+
+    assert first.status_code == 200
+    data = second.get_json()
+    assert data['ready'] is True
+    assert data['count_mode'] == 'estimated'
+    assert data['table_counts']['order_payments'] == 100
+    assert len(conn.log) == 1
+    assert 'COUNT(*)' not in conn.log[0][0]
+
+
+def test_health_ready_reports_missing_tables(client, fake_db):
+    """Test /health/ready returns 503 when a table does not exist."""
+    _patch_conn(fake_db, [("customers", 10)])
+
+    response = client.get('/health/ready')
+
+    assert response.status_code == 503
+    data = response.get_json()
+    assert data['ready'] is False
+    assert 'order_reviews' in data['errors'][0]
+
+
+def test_health_ready_exact_reports_missing_tables(client, fake_db):
+    """Test /health/ready?exact=1 treats a table COUNT(*) cannot read as missing."""
+    missing = RuntimeError('relation "order_reviews" does not exist')
+    conn = _patch_conn(fake_db, [], errors={"FROM order_reviews": missing})
+
+    response = client.get('/health/ready?exact=1')
+
+    assert response.status_code == 503
+    data = response.get_json()
+    assert data['ready'] is False
+    assert data['count_mode'] == 'exact'
+    assert 'order_reviews' not in data['table_counts']
+    assert data['table_counts']['customers'] == 1
+    assert data['errors'] == ["Missing tables: order_reviews"]
+    assert sum('COUNT(*)' in sql for sql, _ in conn.log) == 9
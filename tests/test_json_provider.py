@@ -0,0 +1,89 @@
+"""
+Tests for the JSON provider (orjson / stdlib) and row serialization helpers
+Monkeypatched database, no real DB needed
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from app import json_provider
+from app.app import create_app
+from app.config import HTTP_CACHE_CFG, RESPONSE_CACHE_CFG
+from app.json_provider import OrjsonProvider, StdlibJSONProvider, dumps_line, jsonify_rows, row_dicts
+
+ROW = ("p1", Decimal("129.90"), datetime(2018, 10, 17, 17, 30, 18), date(2018, 10, 20), None, 3)
+COLUMNS = ("id", "price", "purchased_at", "delivery_date", "comment", "qty")
+EXPECTED = {
+    "id": "p1", "price": 129.9, "purchased_at": "2018-10-17T17:30:18",
+    "delivery_date": "2018-10-20", "comment": None, "qty": 3,
+}
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def provider_name(request, monkeypatch):
+    if request.param == "orjson" and json_provider.orjson is None:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(json_provider, "JSON_PROVIDER", request.param)
+    return request.param
+
+
+def test_make_provider_selects_configured_provider(app, provider_name):
+    provider = json_provider.make_provider(app)
+
+    expected = OrjsonProvider if provider_name == "orjson" else StdlibJSONProvider
+    assert type(provider) is expected
+
+
+def test_make_provider_rejects_unknown_name(app, monkeypatch):
+    monkeypatch.setattr(json_provider, "JSON_PROVIDER", "ujson")
+
+    with pytest.raises(ValueError, match="JSON_PROVIDER"):
+        json_provider.make_provider(app)
+
+
+def test_providers_write_the_same_document(app, provider_name):
+    app.json = json_provider.make_provider(app)
+
+    with app.app_context():
+        response = jsonify_rows(COLUMNS, [ROW, ROW])
+
+    assert response.mimetype == "application/json"
+    assert json.loads(response.get_data()) == [EXPECTED, EXPECTED]
+    # Keys sorted, as with Flask's default provider.
+    assert response.get_data(as_text=True).index('"comment"') < response.get_data(as_text=True).index('"id"')
+
+
+def test_row_dicts_maps_columns_positionally():
+    assert row_dicts(("a", "b"), [(1, 2), (3, 4)]) == [{"a": 1, "b": 2}, {"a": 3, "b": 4}]
+    assert row_dicts(("a",), []) == []
+
+
+def test_dumps_line_is_one_compact_document():
+    line = dumps_line(dict(zip(COLUMNS, ROW)))
+
+    assert line.endswith(b"\n") and line.count(b"\n") == 1
+    assert json.loads(line) == EXPECTED
+
+
+def test_products_route_serializes_rows(app, monkeypatch, fake_db):
+    monkeypatch.setitem(RESPONSE_CACHE_CFG, "enabled", False)
+    monkeypatch.setitem(HTTP_CACHE_CFG, "enabled", False)
+    fake_db(default=[("p1", "perfumaria", 2, Decimal("225.00"), 16, 10, 14, 0, 0)])
+
+    response = app.test_client().get('/products?limit=5')
+
+    assert response.status_code == 200
+    assert response.get_json() == [{
+        "product_id": "p1", "product_category_name": "perfumaria", "product_photos_qty": 2,
+        "product_weight_g": 225.0, "product_length_cm": 16, "product_height_cm": 10,
+        "product_width_cm": 14, "product_name_length": 0, "product_description_length": 0,
+    }]
@@ -0,0 +1,110 @@
+"""
+Tests for keyset (cursor) pagination
+Monkeypatched database, no real DB needed
+"""
+
+from datetime import datetime
+
+import pytest
+from app.app import create_app
+from app.pagination import encode_cursor, decode_cursor
+
+
+@pytest.fixture
+def app():
+    """Create Flask app for testing."""
+    app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """Create test client."""
+    return app.test_client()
+
+
+def _patch_db(fake_db, rows):
+    return fake_db(default=rows).log
+
+
+def test_cursor_round_trip():
+    """Cursor tokens encode datetimes and decode to the same key values."""
+    token = encode_cursor((datetime(2018, 10, 17, 17, 30, 18), "abc"))
+    assert decode_cursor(token, 2) == ["2018-10-17 17:30:18", "abc"]
+
+
+@pytest.mark.parametrize("token", ["not-a-cursor", encode_cursor(("a",)), encode_cursor(([1], "b"))])
+def test_cursor_rejects_malformed_tokens(token):
+    """Garbage, wrong arity and non-scalar values are rejected."""
+    with pytest.raises(ValueError):
+        decode_cursor(token, 2)
+
+
+def test_recent_orders_returns_next_cursor(client, fake_db):
+    """A full page carries X-Next-Cursor built from its last row."""
+    ts = datetime(2018, 10, 17, 17, 30, 18)
+    rows = [("o2", "c2", "delivered", ts, None), ("o1", "c1", "delivered", ts, None)]
+    log = _patch_db(fake_db, rows)
+
+    response = client.get('/orders/recent?limit=2')
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 2
+    assert decode_cursor(response.headers['X-Next-Cursor'], 2) == ["2018-10-17 17:30:18", "o1"]
+    assert 'rel="next"' in response.headers['Link']
+    assert '< (%s, %s)' not in log[0][0]
+
+
+def test_recent_orders_applies_cursor_predicate(client, fake_db):
+    """A cursor becomes a keyset predicate; a short page has no next cursor."""
+    log = _patch_db(fake_db, [])
+    token = encode_cursor(("2018-10-17 17:30:18", "o1"))
+
+    response = client.get(f'/orders/recent?limit=2&cursor={token}')
+
+    assert response.status_code == 200
+    assert 'X-Next-Cursor' not in response.headers
+    sql, params = log[0]
+    assert '(order_purchase_timestamp, order_id) < (%s, %s)' in sql
+    assert list(params) == ["2018-10-17 17:30:18", "o1", 2]
+
+
+def test_products_invalid_cursor_returns_422(client, fake_db):
+    """Malformed cursors are validation errors."""
+    _patch_db(fake_db, [])
+
+    response = client.get('/products?cursor=%%%')
+
+    assert response.status_code == 422
+
+
+def test_customers_by_state_compares_normalized_state(client, fake_db):
+    """The state is upper-cased in Python so the index on customer_state applies."""
+    log = _patch_db(fake_db, [])
+    token = encode_cursor(("campinas", "c9"))
+
+    response = client.get(f'/customers/by-state/sp?limit=5&cursor={token}')
+
+    assert response.status_code == 200
+    sql, params = log[0]
+    assert 'WHERE customer_state = %s' in sql
+    assert 'UPPER(' not in sql
+    assert list(params) == ["SP", "campinas", "c9", 5]
+
+
+def test_customers_by_state_pages_past_null_cities(client, fake_db):
+    """A NULL city is keyed as '' in the cursor, ORDER BY and predicate alike."""
+    rows = [("c1", None, "SP", ""), ("c2", None, "SP", "")]
+    log = _patch_db(fake_db, rows)
+
+    response = client.get('/customers/by-state/SP?limit=2')
+
+    assert response.get_json()[0] == {"customer_id": "c1", "customer_city": None, "customer_state": "SP"}
+    token = response.headers['X-Next-Cursor']
+    assert decode_cursor(token, 2) == ["", "c2"]
+    client.get(f'/customers/by-state/SP?limit=2&cursor={token}')
+    sql, params = log[1]
+    assert "(COALESCE(customer_city, ''), customer_id) > (%s, %s)" in sql
+    assert "ORDER BY COALESCE(customer_city, ''), customer_id" in sql
+    assert list(params) == ["SP", "", "c2", 2]
@@ -0,0 +1,380 @@
+"""
+EXPLAIN Capture and Index Advisor
+
+Runs every read-only API endpoint once against the configured database,
+records each SQL statement the routes execute, and captures its plan:
+- PostgreSQL: EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+- MySQL:      EXPLAIN FORMAT=JSON
+
+Plans are saved as JSON baselines (one file per statement) so they can be
+diffed after schema or query changes. Full table scans on large tables are
+flagged, and an index is suggested for the filtered columns when no
+existing index starts with them.
+
+Usage (from project root, DB configured in .env):
+    python -m tools.explain
+    python -m tools.explain --endpoint /analytics --min-rows 5000
+    python -m tools.explain --out docs/sprint_c/explain
+
+Exit codes:
+    0 - No unindexed full scans found
+    1 - At least one full scan on a large table has an index suggestion
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+# Add project root to path so we can import app modules
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+# Endpoints to exercise; {placeholders} are filled from SAMPLE_SQL
+ENDPOINTS = [
+    "/analytics/revenue-by-category?limit=10",
+    "/analytics/top-sellers?limit=10",
+    "/analytics/review-vs-delivery?min_reviews=50",
+    "/analytics/order-funnel",
+    "/orders/recent?limit=20",
+    "/orders/stats",
+    "/orders/sample-customer",
+    "/orders/by-customer/{customer_id}?limit=10",
+    "/customers/by-state/{state}?limit=10",
+    "/customers/by-city?state={state}&city={city}&limit=10",
+    "/customers/top-cities?limit=10",
+    "/geo/top-states?limit=10",
+    "/payments/by-type?payment_type=credit_card&limit=20",
+    "/payments/stats",
+    "/products?limit=50",
+    "/products/by-category?category_id={category_id}&limit=10",
+    "/products/sample?n=5",
+    "/products/stats",
+    "/products/top-categories?limit=10",
+    "/reviews/recent?limit=20",
+    "/reviews/stats",
+]
+
+SAMPLE_SQL = {
+    "customer_id": "SELECT customer_id FROM orders WHERE customer_id IS NOT NULL LIMIT 1",
+    "state": "SELECT customer_state, customer_city FROM customers WHERE customer_state IS NOT NULL LIMIT 1",
+    "category_id": "SELECT category_id FROM products WHERE category_id IS NOT NULL LIMIT 1",
+}
+
+DEFAULT_OUT = os.path.join("docs", "sprint_c", "explain")
+
+_PG_FILTER_COLUMN = re.compile(
+    r"([a-z_][a-z0-9_]*)\)*(?:::[a-z ]+)?\)*\s*(?:=|<>|<=|>=|<|>|~~|IS\b|ANY\b)", re.IGNORECASE
+)
+_MYSQL_CONDITION_COLUMN = re.compile(
+    r"`([A-Za-z0-9_]+)`\)*\s*(?:=|<>|<=|>=|<|>|like\b|is\b|in\b|between\b)", re.IGNORECASE
+)
+_TABLE_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+([a-z_][a-z0-9_]*)(?:\s+(?:AS\s+)?([a-z_][a-z0-9_]*))?", re.IGNORECASE)
+_SQL_KEYWORDS = {"on", "where", "join", "left", "right", "inner", "group", "order", "limit", "using", "and"}
+
+
+class _RecordingCursor:
+    """Cursor proxy that logs every (sql, params) it executes."""
+
+    def __init__(self, cur, log):
+        self._cur = cur
+        self._log = log
+
+    def execute(self, sql, params=None):
+        self._log.append((sql, params))
+        if params is None:
+            return self._cur.execute(sql)
+        return self._cur.execute(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cur.close()
+        return False
+
+
+class _RecordingConnection:
+    """Connection proxy whose cursors are _RecordingCursor instances."""
+
+    def __init__(self, conn, log):
+        self._conn = conn
+        self._log = log
+
+    def cursor(self, *args, **kwargs):
+        return _RecordingCursor(self._conn.cursor(*args, **kwargs), self._log)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+
+def capture_statements(app, db, urls):
+    """
+    Call each URL through the Flask test client and record the SQL it runs.
+
+    Returns:
+        list: (url, status_code, [(sql, params), ...]) per URL
+    """
+    original = db.get_conn
+    captured = []
+    log = []
+    db.get_conn = lambda: _RecordingConnection(original(), log)
+    try:
+        client = app.test_client()
+        for url in urls:
+            log.clear()
+            response = client.get(url)
+            captured.append((url, response.status_code, list(log)))
+    finally:
+        db.get_conn = original
+    return captured
+
+
+def explain(conn, vendor, sql, params):
+    """Return the JSON plan of one statement."""
+    if vendor == "postgres":
+        from psycopg import ClientCursor
+        # Client-side binding: EXPLAIN sees literal values, like the route's query.
+        with ClientCursor(conn) as cur:
+            cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql, params)
+            plan = cur.fetchone()[0]
+        conn.rollback()
+        return plan
+    with conn.cursor() as cur:
+        cur.execute("EXPLAIN FORMAT=JSON " + sql, params)
+        return json.loads(cur.fetchone()[0])
+
+
+def _table_aliases(sql):
+    aliases = {}
+    for table, alias in _TABLE_ALIAS.findall(sql):
+        aliases[table.lower()] = table.lower()
+        if alias and alias.lower() not in _SQL_KEYWORDS:
+            aliases[alias.lower()] = table.lower()
+    return aliases
+
+
+def _walk(node):
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _walk(item)
+
+
+def _filter_columns(pattern, condition):
+    columns = []
+    for column in pattern.findall(condition or ""):
+        column = column.lower()
+        if column not in columns and column not in ("null", "true", "false"):
+            columns.append(column)
+    return columns
+
+
+def find_full_scans(plan, vendor, sql):
+    """
+    List full table scans in a plan.
+
+    Returns:
+        list: dicts with table, rows (planner/actual estimate) and the
+        columns referenced by the scan's filter condition
+    """
+    scans = []
+    if vendor == "postgres":
+        for node in _walk(plan):
+            if node.get("Node Type") == "Seq Scan":
+                scans.append({
+                    "table": node.get("Relation Name"),
+                    "rows": node.get("Actual Rows", node.get("Plan Rows")),
+                    "columns": _filter_columns(_PG_FILTER_COLUMN, node.get("Filter")),
+                })
+        return scans
+    aliases = _table_aliases(sql)
+    for node in _walk(plan):
+        if node.get("access_type") == "ALL" and "table_name" in node:
+            alias = node["table_name"].lower()
+            scans.append({
+                "table": aliases.get(alias, alias),
+                "rows": node.get("rows_examined_per_scan"),
+                "columns": _filter_columns(_MYSQL_CONDITION_COLUMN, node.get("attached_condition")),
+            })
+    return scans
+
+
+def existing_index_prefixes(conn, vendor):
+    """Return {table: set(leading column of each index)}."""
+    with conn.cursor() as cur:
+        if vendor == "postgres":
+            cur.execute("SELECT tablename, indexdef FROM pg_indexes WHERE schemaname = current_schema()")
+            rows = []
+            for table, indexdef in cur.fetchall():
+                match = re.search(r"\(\s*\(?\s*([a-z_][a-z0-9_]*)", indexdef)
+                if match:
+                    rows.append((table, match.group(1)))
+        else:
+            cur.execute(
+                "SELECT table_name, column_name FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND seq_in_index = 1"
+            )
+            rows = cur.fetchall()
+    if vendor == "postgres":
+        conn.rollback()
+    prefixes = {}
+    for table, column in rows:
+        prefixes.setdefault(table.lower(), set()).add(column.lower())
+    return prefixes
+
+
+def suggest_index(scan, vendor, prefixes):
+    """CREATE INDEX statement for a flagged scan, or None if nothing useful to add."""
+    table, columns = scan["table"], scan["columns"]
+    if not table or not columns or columns[0] in prefixes.get(table, set()):
+        return None
+    name = f"idx_{table}__{'_'.join(columns)}"
+    if vendor == "postgres":
+        return f"CREATE INDEX IF NOT EXISTS {name} ON {table}({', '.join(columns)});"
+    return f"CREATE INDEX {name} ON {table}({', '.join(columns)});"
+
+
+def _slug(url, index):
+    path = url.split("?")[0].strip("/")
+    path = re.sub(r"\{[^}]+\}|[^a-z0-9]+", "_", path.lower()).strip("_")
+    return f"{path}__{index}"
+
+
+def _fill_samples(conn, vendor):
+    values = {}
+    with conn.cursor() as cur:
+        for key, sql in SAMPLE_SQL.items():
+            try:
+                cur.execute(sql)
+                row = cur.fetchone()
+            except Exception as e:
+                print(f"  ! sample {key} unavailable: {e}")
+                if vendor == "postgres":
+                    conn.rollback()
+                continue
+            if row:
+                values[key] = row[0]
+                if key == "state" and len(row) > 1:
+                    values["city"] = row[1]
+    if vendor == "postgres":
+        conn.rollback()
+    return values
+
+
+def run(out_dir, min_rows, endpoint_prefix=""):
+    """
+    Capture, save and analyze plans for every endpoint.
+
+    Returns:
+        int: number of index suggestions
+    """
+    from app.app import create_app
+    from app.config import DB_CFG, HTTP_CACHE_CFG, RESPONSE_CACHE_CFG
+    from app.db import db
+    from app.db.db import get_conn
+    from app.db.table_stats import estimated_row_counts
+
+    vendor = DB_CFG.get("vendor", "postgres")
+    RESPONSE_CACHE_CFG["enabled"] = False  # every request must reach the database
+    HTTP_CACHE_CFG["enabled"] = False      # and only run the route's own SQL
+    app = create_app()
+
+    conn = get_conn()
+    try:
+        samples = _fill_samples(conn, vendor)
+        sizes = estimated_row_counts(conn)
+        if vendor == "postgres":
+            conn.rollback()
+        prefixes = existing_index_prefixes(conn, vendor)
+
+        urls = []
+        for url in ENDPOINTS:
+            if not url.startswith(endpoint_prefix):
+                continue
+            try:
+                urls.append(url.format(**samples))
+            except KeyError as e:
+                print(f"  ! skipping {url}: no sample value for {e}")
+
+        vendor_dir = os.path.join(out_dir, vendor)
+        os.makedirs(vendor_dir, exist_ok=True)
+        suggestions = []
+        print("=" * 70)
+        print(f"EXPLAIN CAPTURE ({vendor}) -> {vendor_dir}")
+        print("=" * 70)
+
+        for url, status, statements in capture_statements(app, db, urls):
+            print(f"\n{url}  [{status}]")
+            for i, (sql, params) in enumerate(statements, 1):
+                if not sql.lstrip().upper().startswith("SELECT"):
+                    continue
+                try:
+                    plan = explain(conn, vendor, sql, params)
+                except Exception as e:
+                    print(f"  ! EXPLAIN failed: {e}")
+                    if vendor == "postgres":
+                        conn.rollback()
+                    continue
+                path = os.path.join(vendor_dir, _slug(url, i) + ".json")
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump({"endpoint": url, "sql": " ".join(sql.split()),
+                               "params": list(params or []), "plan": plan},
+                              f, indent=2, default=str)
+                    f.write("\n")
+
+                for scan in find_full_scans(plan, vendor, sql):
+                    table_rows = sizes.get(scan["table"]) or 0
+                    if table_rows < min_rows:
+                        continue
+                    suggestion = suggest_index(scan, vendor, prefixes)
+                    filtered = f" filter on {', '.join(scan['columns'])}" if scan["columns"] else " (no filter)"
+                    print(f"  ✗ full scan of {scan['table']} (~{table_rows} rows){filtered}")
+                    if suggestion and suggestion not in suggestions:
+                        suggestions.append(suggestion)
+                        print(f"    → {suggestion}")
+            if not statements:
+                print("  (no SQL executed)")
+
+        if suggestions:
+            path = os.path.join(vendor_dir, "suggested_indexes.sql")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"-- Generated by python -m tools.explain ({vendor})\n")
+                f.write("\n".join(suggestions) + "\n")
+            print(f"\n{len(suggestions)} index suggestion(s) written to {path}")
+        else:
+            print("\nNo missing indexes found for the flagged scans.")
+        return len(suggestions)
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Capture EXPLAIN plans for the API queries and suggest indexes.")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="baseline directory (a <vendor>/ subfolder is used)")
+    parser.add_argument("--min-rows", type=int, default=10000,
+                        help="only flag full scans of tables with at least this many rows")
+    parser.add_argument("--endpoint", default="", help="only endpoints starting with this path, e.g. /analytics")
+    args = parser.parse_args(argv)
+    return 1 if run(args.out, args.min_rows, args.endpoint) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
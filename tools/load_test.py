@@ -0,0 +1,181 @@
+"""
+HTTP Load Test
+
+Keeps N concurrent clients issuing GET requests against a running server
+for a fixed duration, then prints throughput, latency percentiles and
+errors per endpoint. Run it once against each serving mode to compare,
+with RESPONSE_CACHE_ENABLED=0 and HTTP_CACHE_ENABLED=0 for both servers so
+the database work is measured rather than cache hits:
+
+    # sync: Flask dev server (one thread per request)
+    flask --app app.app run --port 5000 --with-threads
+    python -m tools.load_test --base http://127.0.0.1:5000 --concurrency 64
+
+    # async: uvicorn + AsyncConnectionPool (app/asgi.py)
+    uvicorn app.asgi:app --port 5001
+    python -m tools.load_test --base http://127.0.0.1:5001 --concurrency 64
+
+Only the standard library is used (asyncio streams, HTTP/1.1 keep-alive),
+so the client itself does not need a thread per connection.
+
+Exit codes:
+    0 - All requests succeeded (2xx/3xx)
+    1 - At least one request failed or returned an error status
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+# Add project root to path so we can import app modules
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+# Routes served natively by app/asgi.py, plus one that goes through Flask
+DEFAULT_PATHS = [
+    "/dashboard/summary",
+    "/analytics/revenue-by-category?limit=10",
+    "/analytics/top-sellers?limit=10",
+    "/analytics/order-funnel",
+]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list; None when empty."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+async def _request(reader, writer, host, path):
+    """One keep-alive GET; returns the status code (body is read and discarded)."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed by server")
+    status = int(status_line.split()[1])
+    length, chunked, close = None, False, False
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "transfer-encoding" and "chunked" in value:
+            chunked = True
+        elif name == "connection" and value == "close":
+            close = True
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length is not None:
+        await reader.readexactly(length)
+    else:
+        await reader.read()
+        close = True
+    return status, close
+
+
+async def _client(base, paths, offset, deadline, results):
+    url = urlsplit(base)
+    host, port = url.hostname, url.port or 80
+    conn = None
+    i = offset
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            if conn is None:
+                conn = await asyncio.open_connection(host, port)
+            status, close = await _request(*conn, f"{host}:{port}", path)
+            results[path].append((time.perf_counter() - started, status))
+            if close:
+                conn[1].close()
+                conn = None
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            results[path].append((time.perf_counter() - started, type(e).__name__))
+            if conn is not None:
+                conn[1].close()
+                conn = None
+    if conn is not None:
+        conn[1].close()
+
+
+async def run(base, paths, concurrency, duration):
+    """Returns {path: [(seconds, status_or_error_name), ...]} and the wall time."""
+    results = defaultdict(list)
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(_client(base, paths, n, deadline, results) for n in range(concurrency)))
+    return results, time.perf_counter() - started
+
+
+def summarize(results, elapsed):
+    """One row per path plus a total: requests, req/s, p50/p95/p99 ms, errors."""
+    rows = []
+    everything = []
+    for path, samples in results.items():
+        everything.extend(samples)
+        rows.append(_row(path, samples, elapsed))
+    rows.append(_row("TOTAL", everything, elapsed))
+    return rows
+
+
+def _row(label, samples, elapsed):
+    latencies = sorted(s for s, _ in samples)
+    errors = sum(1 for _, status in samples if not (isinstance(status, int) and status < 400))
+
+    def ms(pct):
+        value = percentile(latencies, pct)
+        return None if value is None else round(value * 1000, 1)
+
+    return {
+        "path": label,
+        "requests": len(samples),
+        "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": ms(50),
+        "p95_ms": ms(95),
+        "p99_ms": ms(99),
+        "errors": errors,
+    }
+
+
+def print_table(rows):
+    print(f"{'path':<45} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    print("-" * 98)
+    for r in rows:
+        print(f"{r['path']:<45} {r['requests']:>9} {r['rps']:>8} {str(r['p50_ms']):>8} "
+              f"{str(r['p95_ms']):>8} {str(r['p99_ms']):>8} {r['errors']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent HTTP load test for the API")
+    parser.add_argument("--base", default="http://127.0.0.1:5000", help="Server base URL")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent keep-alive clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    parser.add_argument("--path", action="append", dest="paths",
+                        help="Path to request (repeatable; default: dashboard + analytics routes)")
+    args = parser.parse_args()
+
+    paths = args.paths or DEFAULT_PATHS
+    print(f"Load test: {args.base}, {args.concurrency} clients, {args.duration:.0f}s, {len(paths)} paths\n")
+    results, elapsed = asyncio.run(run(args.base, paths, args.concurrency, args.duration))
+    rows = summarize(results, elapsed)
+    print_table(rows)
+    return 1 if rows[-1]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())